@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: embedding throughput of concurrent embed() calls with and
+without the micro-batching dispatcher.
+
+By default a fake model with a fixed cost per call plus a small cost per text
+is used, which is how a CPU forward pass or an HTTP request behaves. Pass
+--hf to use the configured sentence-transformers model instead.
+
+    python benchmarks/bench_embed_batching.py [--threads 32] [--calls 2000] [--hf]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import List
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(current_script_dir), 'src'))
+
+from vectorwave.vectorizer.base import BaseVectorizer
+from vectorwave.vectorizer.batching import MicroBatchingVectorizer
+
+
+class FakeModel(BaseVectorizer):
+    def __init__(self, call_cost_sec: float, text_cost_sec: float):
+        self.call_cost_sec = call_cost_sec
+        self.text_cost_sec = text_cost_sec
+        # One model instance runs one forward pass at a time
+        self._device = threading.Lock()
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        with self._device:
+            time.sleep(self.call_cost_sec + self.text_cost_sec * len(texts))
+        return [[0.0] * 384 for _ in texts]
+
+
+def run(vectorizer: BaseVectorizer, threads: int, calls: int) -> float:
+    per_thread = calls // threads
+
+    def worker(n):
+        for i in range(per_thread):
+            vectorizer.embed(f"query {n} {i}")
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=0.0)
+    parser.add_argument("--hf", action="store_true", help="use the sentence-transformers model")
+    args = parser.parse_args()
+
+    if args.hf:
+        from vectorwave.models.db_config import get_weaviate_settings
+        from vectorwave.vectorizer.huggingface_vectorizer import HuggingFaceVectorizer
+        model = HuggingFaceVectorizer(get_weaviate_settings().HF_MODEL_NAME)
+    else:
+        model = FakeModel(call_cost_sec=0.005, text_cost_sec=0.0001)
+
+    direct = run(model, args.threads, args.calls)
+    batched_vectorizer = MicroBatchingVectorizer(model, args.batch_size, args.wait_ms)
+    batched = run(batched_vectorizer, args.threads, args.calls)
+
+    print(f"direct : {direct:10.1f} embeddings/s")
+    print(f"batched: {batched:10.1f} embeddings/s ({batched_vectorizer.batches} model calls)")
+    print(f"speedup: {batched / direct:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
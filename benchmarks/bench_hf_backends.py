@@ -0,0 +1,78 @@
+"""
+Benchmark: CPU throughput and embedding agreement of the HuggingFace backends.
+
+Loads the model once per backend (HF_BACKEND values: torch, torch_int8,
+onnx), encodes the same texts with each and reports texts/s plus the mean
+and minimum cosine similarity to the first backend listed (fp32 torch by
+default). The onnx backend needs 'pip install sentence-transformers[onnx]'.
+
+    python benchmarks/bench_hf_backends.py [--model NAME] [--texts 2000]
+        [--batch-size 64] [--onnx-file onnx/model_qint8_avx2.onnx]
+"""
+import argparse
+import os
+import sys
+import time
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(current_script_dir), 'src'))
+
+import numpy as np
+
+from vectorwave.models.db_config import get_weaviate_settings
+from vectorwave.vectorizer.huggingface_vectorizer import HuggingFaceVectorizer
+
+
+def sample_texts(count: int):
+    subjects = ["user", "invoice", "payment", "order", "report", "session", "shipment", "profile"]
+    actions = ["loads", "validates", "cleans", "aggregates", "exports", "retries", "archives", "scores"]
+    details = ["from the primary database", "for the nightly batch", "with exponential backoff",
+               "before sending the email", "grouped by region", "and caches the result"]
+    return [
+        f"Function that {actions[i % len(actions)]} the {subjects[(i // 3) % len(subjects)]} "
+        f"{details[(i // 7) % len(details)]} (variant {i})"
+        for i in range(count)
+    ]
+
+
+def encode(vectorizer: HuggingFaceVectorizer, texts, batch_size: int):
+    start = time.perf_counter()
+    vectors = np.vstack([
+        vectorizer.model.encode(texts[i:i + batch_size], convert_to_numpy=True)
+        for i in range(0, len(texts), batch_size)
+    ])
+    return vectors, len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=get_weaviate_settings().HF_MODEL_NAME)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--onnx-file", default=None, help="ONNX file for the onnx backend (e.g. a qint8 export)")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch_int8", "onnx"])
+    args = parser.parse_args()
+
+    texts = sample_texts(args.texts)
+    baseline = None
+    print(f"{'backend':<12}{'load s':>9}{'texts/s':>11}{'speedup':>9}{'mean cos':>10}{'min cos':>9}")
+    for backend in args.backends:
+        try:
+            vectorizer = HuggingFaceVectorizer(args.model, backend=backend, onnx_file_name=args.onnx_file)
+        except Exception as e:
+            print(f"{backend:<12} unavailable: {e}")
+            continue
+
+        vectors, rate = encode(vectorizer, texts, args.batch_size)
+        if baseline is None:
+            baseline = (vectors, rate)
+        ref_vectors, ref_rate = baseline
+        cosine = np.sum(vectors * ref_vectors, axis=1) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(ref_vectors, axis=1)
+        )
+        print(f"{backend:<12}{vectorizer.load_time:>9.2f}{rate:>11.1f}{rate / ref_rate:>8.2f}x"
+              f"{cosine.mean():>10.4f}{cosine.min():>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: wall-clock time of 'import vectorwave' in a fresh interpreter.
+
+The package resolves its API lazily, so the import should load neither
+Weaviate nor a vectorizer library. Each run starts a new Python process;
+the best and median of --repeat runs are printed, together with any heavy
+module that was imported.
+
+    python benchmarks/bench_import_time.py [--repeat 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(current_script_dir), 'src')
+
+HEAVY_MODULES = ["weaviate", "sentence_transformers", "torch", "transformers", "openai", "numpy"]
+
+CODE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import vectorwave\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+)
+
+
+def run_once() -> dict:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR, "VECTORIZER": "weaviate_module"}
+    result = subprocess.run([sys.executable, "-c", CODE], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    reports = [run_once() for _ in range(max(1, args.repeat))]
+    timings = [report["elapsed"] * 1e3 for report in reports]
+    heavy = sorted(set(HEAVY_MODULES) & set(reports[-1]["modules"]))
+
+    print(f"{'best':>8}: {min(timings):8.2f} ms")
+    print(f"{'median':>8}: {statistics.median(timings):8.2f} ms")
+    print(f"{'heavy':>8}: {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: per-call overhead of @vectorize.
+
+Compares the fused single-layer wrapper used by @vectorize with the previous
+layout (outer wrapper -> trace_root -> trace_span -> inner wrapper, with the
+tags injected as kwargs and popped again). Span records go to a no-op batch
+manager, so only the Python overhead is measured; no Weaviate is needed.
+
+    python benchmarks/bench_vectorize_overhead.py [--calls 200000]
+"""
+import argparse
+import os
+import sys
+import timeit
+from functools import wraps
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(current_script_dir), 'src'))
+
+os.environ.setdefault("VECTORIZER", "none")
+# No deferred registration: it would try to connect to Weaviate
+os.environ["REGISTRATION_MODE"] = "skip"
+
+from vectorwave.core import decorator as decorator_module
+from vectorwave.models.db_config import get_weaviate_settings
+from vectorwave.monitoring import tracer as tracer_module
+from vectorwave.monitoring.tracer import trace_root, trace_span
+
+
+class NullBatchManager:
+    def add_object(self, collection, properties, uuid=None, vector=None):
+        pass
+
+
+def legacy_vectorize(func, tags, func_uuid):
+    """The pre-fusion wrapper stack, kept here as the baseline."""
+
+    @trace_root()
+    @trace_span(attributes_to_capture=['function_uuid', 'team', 'priority', 'run_id'])
+    @wraps(func)
+    def inner_wrapper(*args, **kwargs):
+        original_kwargs = kwargs.copy()
+        keys_to_remove = list(tags.keys())
+        keys_to_remove.append('function_uuid')
+        for key in keys_to_remove:
+            original_kwargs.pop(key, None)
+        return func(*args, **original_kwargs)
+
+    @wraps(func)
+    def outer_wrapper(*args, **kwargs):
+        full_kwargs = kwargs.copy()
+        full_kwargs.update(tags)
+        full_kwargs['function_uuid'] = func_uuid
+        return inner_wrapper(*args, **full_kwargs)
+
+    return outer_wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = get_weaviate_settings()
+    settings.custom_properties = {"team": {"data_type": "TEXT"}, "priority": {"data_type": "INT"}}
+    null_batch = NullBatchManager()
+    tracer_module.get_batch_manager = lambda: null_batch
+
+    def work(x, y=1):
+        return x + y
+
+    fused = decorator_module.vectorize(
+        search_description="bench", sequence_narrative="bench", team="bench", priority=1
+    )(work)
+    legacy = legacy_vectorize(work, {"team": "bench", "priority": 1}, "00000000-0000-0000-0000-000000000000")
+
+    results = {}
+    for name, fn in (("plain", work), ("legacy stack", legacy), ("fused", fused)):
+        best = min(timeit.repeat(lambda: fn(1, y=2), number=args.calls, repeat=args.repeat))
+        results[name] = best / args.calls * 1e6
+        print(f"{name:>14}: {results[name]:8.3f} us/call")
+
+    legacy_overhead = results["legacy stack"] - results["plain"]
+    fused_overhead = results["fused"] - results["plain"]
+    print(f"overhead reduced {legacy_overhead / fused_overhead:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
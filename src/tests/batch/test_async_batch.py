@@ -0,0 +1,231 @@
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+
+import pytest
+from vectorwave.batch.async_batch import get_async_batch_manager, aflush
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.monitoring.tracer import trace_root, trace_span
+
+ASYNC_BATCH_MODULE_PATH = "vectorwave.batch.async_batch"
+
+
+@pytest.fixture
+def mock_async_deps(monkeypatch):
+    """
+    Fixture to mock dependencies for async_batch.py (async client, settings)
+    """
+    mock_client = MagicMock()
+    mock_client.close = AsyncMock()
+    mock_collection = MagicMock()
+    mock_collection.data.insert_many = AsyncMock(return_value=None)
+    mock_client.collections.get = MagicMock(return_value=mock_collection)
+
+    mock_get_async_client = AsyncMock(return_value=mock_client)
+    monkeypatch.setattr(f"{ASYNC_BATCH_MODULE_PATH}.get_weaviate_async_client", mock_get_async_client)
+
+    mock_settings = WeaviateSettings(
+        EXECUTION_COLLECTION_NAME="TestExecutions",
+        BATCH_SIZE=100,
+        BATCH_FLUSH_INTERVAL_SEC=60,
+        ASYNC_EXPORTER=True
+    )
+    monkeypatch.setattr(f"{ASYNC_BATCH_MODULE_PATH}.get_weaviate_settings", MagicMock(return_value=mock_settings))
+
+    get_async_batch_manager.cache_clear()
+
+    return {
+        "client": mock_client,
+        "insert_many": mock_collection.data.insert_many,
+        "get_async_client": mock_get_async_client,
+        "settings": mock_settings
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_add_object_is_queued_until_flush(mock_async_deps):
+    """
+    Case 1: add_object() must only enqueue; flush() connects lazily and bulk-inserts
+    """
+    manager = get_async_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"i": 1})
+    manager.add_object(collection="TestExecutions", properties={"i": 2})
+
+    mock_async_deps["get_async_client"].assert_not_called()
+    mock_async_deps["insert_many"].assert_not_called()
+
+    await manager.flush()
+
+    mock_async_deps["get_async_client"].assert_awaited_once()
+    mock_async_deps["insert_many"].assert_awaited_once()
+    objects = mock_async_deps["insert_many"].call_args.args[0]
+    assert [o.properties["i"] for o in objects] == [1, 2]
+
+    await manager.aclose()
+    mock_async_deps["client"].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_batch_size_triggers_background_flush(mock_async_deps):
+    """
+    Case 2: Reaching BATCH_SIZE wakes the background task, which writes without an explicit flush
+    """
+    mock_async_deps["settings"].BATCH_SIZE = 2
+    manager = get_async_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"i": 1})
+    manager.add_object(collection="TestExecutions", properties={"i": 2})
+
+    for _ in range(100):
+        if mock_async_deps["insert_many"].await_count:
+            break
+        await asyncio.sleep(0.01)
+
+    mock_async_deps["insert_many"].assert_awaited_once()
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_trace_uses_async_exporter(mock_async_deps, monkeypatch):
+    """
+    Case 3: With ASYNC_EXPORTER on, spans of async traces go to the asyncio exporter
+    and aflush() writes them
+    """
+    monkeypatch.setattr("vectorwave.monitoring.tracer.get_weaviate_settings",
+                        MagicMock(return_value=mock_async_deps["settings"]))
+    mock_thread_batch = MagicMock()
+    monkeypatch.setattr("vectorwave.monitoring.tracer.get_batch_manager", MagicMock(return_value=mock_thread_batch))
+    monkeypatch.setattr(f"{ASYNC_BATCH_MODULE_PATH}.get_batch_manager", MagicMock(return_value=mock_thread_batch))
+
+    @trace_root()
+    @trace_span
+    async def my_async_root():
+        await asyncio.sleep(0)
+        return "done"
+
+    assert await my_async_root() == "done"
+    mock_thread_batch.add_object.assert_not_called()
+
+    await aflush()
+
+    mock_async_deps["insert_many"].assert_awaited_once()
+    props = mock_async_deps["insert_many"].call_args.args[0][0].properties
+    assert props["function_name"] == "my_async_root"
+    mock_thread_batch.flush.assert_called_once()
+
+    await get_async_batch_manager().aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_unreachable_client_keeps_objects_behind_breaker(mock_async_deps):
+    """
+    Case 4: While Weaviate is unreachable objects stay queued, and once the
+    circuit opens flush() stops reconnecting until the recovery timeout
+    """
+    mock_async_deps["settings"].CIRCUIT_FAILURE_THRESHOLD = 2
+    mock_async_deps["settings"].CIRCUIT_RECOVERY_TIMEOUT_SEC = 60
+    mock_async_deps["get_async_client"].side_effect = ConnectionError("Weaviate is down")
+    manager = get_async_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"i": 1})
+    for _ in range(4):
+        await manager.flush()
+
+    assert mock_async_deps["get_async_client"].await_count == 2
+    assert manager._queue.qsize() == 1
+
+    manager.breaker.record_success()  # Weaviate is back
+    mock_async_deps["get_async_client"].side_effect = None
+    await manager.flush()
+
+    objects = mock_async_deps["insert_many"].call_args.args[0]
+    assert [o.properties["i"] for o in objects] == [1]
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_failed_writes_go_to_the_spool(mock_async_deps, monkeypatch):
+    """
+    Case 5: A bulk insert that keeps failing hands its objects to the thread
+    manager's spool; permanent per-object errors are dead-lettered
+    """
+    mock_async_deps["settings"].SPOOL_DIR = "/unused"
+    mock_async_deps["settings"].WRITE_MAX_RETRIES = 1
+    mock_async_deps["settings"].WRITE_BACKOFF_BASE_SEC = 0.0
+    thread_manager = MagicMock()
+    monkeypatch.setattr(f"{ASYNC_BATCH_MODULE_PATH}.get_batch_manager", MagicMock(return_value=thread_manager))
+    mock_async_deps["insert_many"].side_effect = ConnectionError("Weaviate is down")
+    manager = get_async_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"i": 1})
+    await manager.flush()
+
+    assert mock_async_deps["insert_many"].await_count == 2
+    spooled = thread_manager.spool.append_many.call_args.args[0]
+    assert [(c, o.properties["i"]) for c, o in spooled] == [("TestExecutions", 1)]
+    assert manager._queue.empty()
+
+    mock_async_deps["insert_many"].side_effect = None
+    mock_async_deps["insert_many"].return_value = MagicMock(errors={0: MagicMock(message="invalid text property 'i'")})
+    manager.add_object(collection="TestExecutions", properties={"i": 2})
+    await manager.flush()
+
+    assert [letter.data_object.properties["i"] for letter in manager.dead_letters.entries()] == [2]
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_add_object_from_worker_thread_reaches_bound_loop(mock_async_deps, monkeypatch):
+    """
+    Case 6: A span recorded off the loop thread (e.g. a sync function run via
+    asyncio.to_thread) is handed to the bound loop instead of being dropped
+    """
+    thread_manager = MagicMock()
+    monkeypatch.setattr(f"{ASYNC_BATCH_MODULE_PATH}.get_batch_manager", MagicMock(return_value=thread_manager))
+    manager = get_async_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"i": 1})
+    await asyncio.to_thread(manager.add_object, collection="TestExecutions", properties={"i": 2})
+    await asyncio.sleep(0)
+    await manager.flush()
+
+    objects = mock_async_deps["insert_many"].call_args.args[0]
+    assert [o.properties["i"] for o in objects] == [1, 2]
+    thread_manager.add_object.assert_not_called()
+    await manager.aclose()
+
+
+def test_async_add_object_without_loop_falls_back_to_thread_manager(mock_async_deps, monkeypatch):
+    """
+    Case 7: With no event loop bound, add_object() hands the object to the thread-based batch manager
+    """
+    thread_manager = MagicMock()
+    monkeypatch.setattr(f"{ASYNC_BATCH_MODULE_PATH}.get_batch_manager", MagicMock(return_value=thread_manager))
+    manager = get_async_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"i": 1}, uuid="u-1")
+
+    thread_manager.add_object.assert_called_once_with("TestExecutions", {"i": 1}, uuid="u-1", vector=None)
+    assert manager._queue is None
+
+
+def test_async_loop_change_moves_queued_objects(mock_async_deps):
+    """
+    Case 8: Objects still queued when a new event loop shows up are written
+    from the new loop instead of being discarded
+    """
+    manager = get_async_batch_manager()
+
+    async def enqueue():
+        manager.add_object(collection="TestExecutions", properties={"i": 1})
+
+    async def enqueue_and_flush():
+        manager.add_object(collection="TestExecutions", properties={"i": 2})
+        await manager.aclose()
+
+    asyncio.run(enqueue())
+    asyncio.run(enqueue_and_flush())
+
+    objects = mock_async_deps["insert_many"].call_args.args[0]
+    assert [o.properties["i"] for o in objects] == [1, 2]
+    assert manager.dropped_count == 0
@@ -1,7 +1,13 @@
+import os
+import threading
+import time
 from unittest.mock import MagicMock
 
 import pytest
+from weaviate.collections.classes.batch import BatchObjectReturn, ErrorObject
+
 from vectorwave.batch.batch import get_batch_manager
+from vectorwave.batch.dead_letter import classify_error
 from vectorwave.exception.exceptions import WeaviateConnectionError
 from vectorwave.models.db_config import WeaviateSettings
 
@@ -47,6 +53,15 @@ def mock_deps(monkeypatch):
         "atexit": mock_atexit_register
     }
 
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
 def test_get_batch_manager_is_singleton(mock_deps):
     """
     Case 1: Test if get_batch_manager() always returns the same instance (singleton)
@@ -79,20 +94,408 @@ def test_batch_manager_init_failure(monkeypatch):
 
     # The _initialized flag should be False if initialization fails
     assert manager._initialized is False
+    # The worker still runs to reconnect later; stop it so it doesn't outlive the test
+    manager._stop_event.set()
+    manager._wake_event.set()
+    manager._worker.join()
+    get_batch_manager.cache_clear()
 
-def test_add_object_calls_client_batch(mock_deps):
+def test_add_object_buffers_until_flush(mock_deps):
     """
-    Case 4: Test if add_object() correctly calls client.batch.add_object
+    Case 4: Test if add_object() only buffers, and flush() writes the buffer with one bulk insert
     """
     manager = get_batch_manager()
     props = {"key": "value"}
 
     manager.add_object(collection="TestCollection", properties=props, uuid="test-uuid")
 
+    mock_data = mock_deps["client"].collections.get.return_value.data
+    mock_data.insert.assert_not_called()
+    mock_data.insert_many.assert_not_called()
+
+    manager.flush()
+
     mock_deps["client"].collections.get.assert_called_once_with("TestCollection")
+    mock_data.insert_many.assert_called_once()
+
+    objects = mock_data.insert_many.call_args.args[0]
+    assert len(objects) == 1
+    assert objects[0].properties == props
+    assert objects[0].uuid == "test-uuid"
+    assert objects[0].vector is None
+
+
+def test_add_object_flushes_when_batch_size_reached(mock_deps):
+    """
+    Case 5: Test if reaching BATCH_SIZE wakes the background worker, which writes off the caller's thread
+    """
+    mock_deps["settings"].BATCH_SIZE = 3
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    manager = get_batch_manager()
+    mock_data = mock_deps["client"].collections.get.return_value.data
+
+    writer_threads = []
+    mock_data.insert_many.side_effect = lambda objects: writer_threads.append(threading.current_thread())
+
+    for i in range(2):
+        manager.add_object(collection="TestCollection", properties={"i": i})
+    time.sleep(0.05)
+    mock_data.insert_many.assert_not_called()
+
+    manager.add_object(collection="TestCollection", properties={"i": 2})
+
+    assert _wait_for(lambda: mock_data.insert_many.call_count == 1)
+    assert [o.properties["i"] for o in mock_data.insert_many.call_args.args[0]] == [0, 1, 2]
+    assert writer_threads == [manager._worker]
+
+
+def test_add_object_drops_when_queue_full(mock_deps):
+    """
+    Case 6: Test if the 'drop' policy discards objects once the queue is full, without blocking
+    """
+    mock_deps["settings"].BATCH_MAX_QUEUE_SIZE = 2
+    mock_deps["settings"].BATCH_QUEUE_FULL_POLICY = "drop"
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    manager = get_batch_manager()
+
+    for i in range(5):
+        manager.add_object(collection="TestCollection", properties={"i": i})
+
+    assert manager.dropped_count == 3
+
+    manager.flush()
+    objects = mock_deps["client"].collections.get.return_value.data.insert_many.call_args.args[0]
+    assert [o.properties["i"] for o in objects] == [0, 1]
+
+
+def test_add_object_blocks_then_drops_when_queue_full(mock_deps):
+    """
+    Case 7: Test if the 'block' policy waits up to BATCH_QUEUE_BLOCK_TIMEOUT_SEC before dropping
+    """
+    mock_deps["settings"].BATCH_MAX_QUEUE_SIZE = 1
+    mock_deps["settings"].BATCH_QUEUE_FULL_POLICY = "block"
+    mock_deps["settings"].BATCH_QUEUE_BLOCK_TIMEOUT_SEC = 0.05
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    mock_deps["settings"].BATCH_SIZE = 10
+    manager = get_batch_manager()
+
+    manager.add_object(collection="TestCollection", properties={"i": 0})
+    started = time.monotonic()
+    manager.add_object(collection="TestCollection", properties={"i": 1})
+
+    assert time.monotonic() - started >= 0.05
+    assert manager.dropped_count == 1
+
+
+def test_flush_groups_objects_by_collection(mock_deps):
+    """
+    Case 8: Test if one flush() issues one bulk insert per collection
+    """
+    manager = get_batch_manager()
+
+    manager.add_object(collection="A", properties={"n": 1})
+    manager.add_object(collection="B", properties={"n": 2})
+    manager.add_object(collection="A", properties={"n": 3})
+    manager.flush()
+
+    requested = [c.args[0] for c in mock_deps["client"].collections.get.call_args_list]
+    assert sorted(requested) == ["A", "B"]
+    assert mock_deps["client"].collections.get.return_value.data.insert_many.call_count == 2
+
+
+def test_close_is_registered_with_atexit(mock_deps):
+    """
+    Case 9: Test if the remaining buffer is flushed on interpreter exit
+    """
+    manager = get_batch_manager()
+
+    mock_deps["atexit"].assert_called_once_with(manager.close)
+
+
+def test_init_failure_spools_and_replays_after_reconnect(monkeypatch, tmp_path):
+    """
+    Case 10: With SPOOL_DIR set, objects are spooled while Weaviate is down and
+    replayed with a bulk insert once the connection comes back
+    """
+    settings = WeaviateSettings(SPOOL_DIR=str(tmp_path), BATCH_FLUSH_INTERVAL_SEC=60, SPOOL_REPLAY_INTERVAL_SEC=0)
+    monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_settings", MagicMock(return_value=settings))
+    monkeypatch.setattr("atexit.register", MagicMock())
+
+    mock_client = MagicMock()
+    mock_get_client = MagicMock(side_effect=WeaviateConnectionError("down"))
+    monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_client", mock_get_client)
+
+    get_batch_manager.cache_clear()
+    manager = get_batch_manager()
+    assert manager._initialized is False
+
+    manager.add_object(collection="TestExecutions", properties={"n": 1})
+    manager.add_object(collection="TestExecutions", properties={"n": 2})
+    manager.flush()
+
+    assert manager.spool.has_pending()
+    mock_client.collections.get.assert_not_called()
+
+    # Weaviate comes back
+    mock_get_client.side_effect = None
+    mock_get_client.return_value = mock_client
+    manager.flush()
+
+    assert manager._initialized is True
+    insert_many = mock_client.collections.get.return_value.data.insert_many
+    insert_many.assert_called_once()
+    assert [o.properties["n"] for o in insert_many.call_args.args[0]] == [1, 2]
+    assert not manager.spool.has_pending()
+
+
+def test_open_circuit_skips_network_and_keeps_objects(mock_deps):
+    """
+    Case 11: Once failed writes open the circuit, flush() makes no network call
+    and unwritten objects stay queued until Weaviate recovers
+    """
+    settings = mock_deps["settings"]
+    settings.BATCH_FLUSH_INTERVAL_SEC = 60
+    settings.CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.CIRCUIT_RECOVERY_TIMEOUT_SEC = 60
+    settings.WRITE_MAX_RETRIES = 3
+    settings.WRITE_BACKOFF_BASE_SEC = 0
+    manager = get_batch_manager()
+
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    insert_many.side_effect = ConnectionError("Weaviate is down")
+
+    manager.add_object(collection="TestCollection", properties={"n": 1})
+    manager.flush()
+
+    # Retries stop as soon as the circuit opens
+    assert insert_many.call_count == 2
+    assert manager.breaker.state == "open"
+    assert manager._queue.qsize() == 1
+
+    manager.add_object(collection="TestCollection", properties={"n": 2})
+    manager.flush()
+
+    assert insert_many.call_count == 2
+    assert manager._queue.qsize() == 2
+
+    # Without a spool, what is still queued at exit is counted and logged, not silently lost
+    manager.close()
+    assert insert_many.call_count == 2
+    assert manager.dropped_count == 2
+    assert manager._queue.qsize() == 0
+
+
+def _batch_result(errors):
+    """Builds an insert_many result whose objects at the given indexes failed with the given messages."""
+    return BatchObjectReturn(
+        errors={i: ErrorObject(message=msg, object_=MagicMock()) for i, msg in errors.items()},
+        has_errors=bool(errors)
+    )
+
+
+def test_permanent_object_failures_are_dead_lettered(mock_deps):
+    """
+    Case 12: One bad object doesn't sink the batch; it is dead-lettered and counted by error type
+    """
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    manager = get_batch_manager()
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    insert_many.return_value = _batch_result({
+        1: "no such prop with name 'team' found in class 'TestExecutions' in the schema"
+    })
+
+    for i in range(3):
+        manager.add_object(collection="TestExecutions", properties={"n": i})
+    manager.flush()
+
+    insert_many.assert_called_once()
+    letters = manager.dead_letters.entries()
+    assert len(letters) == 1
+    assert letters[0].collection == "TestExecutions"
+    assert letters[0].data_object.properties == {"n": 1}
+    assert letters[0].error_type == "SCHEMA_MISMATCH"
+    assert manager.failure_stats() == {"SCHEMA_MISMATCH": 1}
+
+
+def test_transient_object_failures_are_retried(mock_deps):
+    """
+    Case 13: Only the transiently failed objects are sent again
+    """
+    settings = mock_deps["settings"]
+    settings.BATCH_FLUSH_INTERVAL_SEC = 60
+    settings.WRITE_BACKOFF_BASE_SEC = 0
+    manager = get_batch_manager()
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    insert_many.side_effect = [
+        _batch_result({0: "connection reset by peer", 2: "context deadline exceeded"}),
+        _batch_result({}),
+    ]
+
+    for i in range(3):
+        manager.add_object(collection="TestExecutions", properties={"n": i})
+    manager.flush()
+
+    assert insert_many.call_count == 2
+    retried = insert_many.call_args_list[1].args[0]
+    assert [o.properties["n"] for o in retried] == [0, 2]
+    assert len(manager.dead_letters) == 0
+    assert manager.failure_stats() == {"UNAVAILABLE": 1, "TIMEOUT": 1}
+
+
+def test_replay_dead_letters_requeues_objects(mock_deps):
+    """
+    Case 14: replay_dead_letters() empties the dead-letter store and writes the objects again
+    """
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    manager = get_batch_manager()
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    insert_many.return_value = _batch_result({0: "invalid text property 'team'"})
+
+    manager.add_object(collection="TestExecutions", properties={"team": 1})
+    manager.flush()
+    assert len(manager.dead_letters) == 1
+
+    insert_many.return_value = _batch_result({})
+    assert manager.replay_dead_letters() == 1
+    manager.flush()
+
+    assert len(manager.dead_letters) == 0
+    assert insert_many.call_args.args[0][0].properties == {"team": 1}
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("no such prop with name 'x' found in class 'C' in the schema", ("SCHEMA_MISMATCH", False)),
+    ("new node has a vector with length 3. Existing nodes have vectors with length 384", ("VECTOR_DIMENSION_MISMATCH", False)),
+    ("vector lengths don't match: 3 vs 384", ("VECTOR_DIMENSION_MISMATCH", False)),
+    ("rpc error: code = Unavailable desc = connection refused", ("UNAVAILABLE", True)),
+    ("429 Too Many Requests", ("RATE_LIMITED", True)),
+    ("something odd", ("UNKNOWN", False)),
+])
+def test_classify_error(message, expected):
+    """
+    Case 15: Per-object error messages map to an error type and a transient flag
+    """
+    assert classify_error(message) == expected
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_forked_child_rebuilds_manager_and_discards_inherited_queue(mock_deps):
+    """
+    Case 16: After fork() the child gets a new manager, the inherited one no longer
+    writes, and the parent still owns and flushes its own pending objects
+    """
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    parent_manager = get_batch_manager()
+    parent_manager.add_object(collection="TestCollection", properties={"owner": "parent"})
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        ok = False
+        try:
+            parent_manager.flush()
+            parent_manager.close()
+            child_manager = get_batch_manager()
+            ok = (
+                insert_many.call_count == 0
+                and child_manager is not parent_manager
+                and child_manager._queue.qsize() == 0
+            )
+        finally:
+            os.write(write_fd, b"1" if ok else b"0")
+            os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"1"
+    os.close(read_fd)
+
+    assert get_batch_manager() is parent_manager
+    parent_manager.flush()
+    assert insert_many.call_args.args[0][0].properties == {"owner": "parent"}
+
+
+def test_flush_splits_large_queues_into_batch_size_chunks(mock_deps):
+    """
+    Case 17: Test if a backlog larger than BATCH_SIZE is written in chunks of at most BATCH_SIZE
+    """
+    mock_deps["settings"].BATCH_SIZE = 4
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    manager = get_batch_manager()
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    # Stop the worker so only the explicit flush below writes
+    manager._stop_event.set()
+    manager._wake_event.set()
+    manager._worker.join()
+
+    for i in range(10):
+        manager.add_object(collection="A", properties={"i": i})
+    manager.flush()
+
+    chunks = [[o.properties["i"] for o in c.args[0]] for c in insert_many.call_args_list]
+    assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_queue_overflow_is_spooled_by_the_worker_not_the_caller(mock_deps, tmp_path):
+    """
+    Case 18: With SPOOL_DIR set, objects overflowing a full queue are not written
+    to disk on the caller's thread; the next flush spools and then replays them
+    """
+    mock_deps["settings"].SPOOL_DIR = str(tmp_path)
+    mock_deps["settings"].BATCH_MAX_QUEUE_SIZE = 1
+    mock_deps["settings"].BATCH_FLUSH_INTERVAL_SEC = 60
+    manager = get_batch_manager()
+    manager._stop_event.set()
+    manager._wake_event.set()
+    manager._worker.join()
+
+    spooled = []
+    append_many = manager.spool.append_many
+    manager.spool.append_many = lambda items: spooled.append(len(items)) or append_many(items)
+
+    for i in range(3):
+        manager.add_object(collection="A", properties={"i": i})
+
+    assert spooled == []
+    assert manager.dropped_count == 0
+
+    manager.flush()
+
+    assert spooled == [2]
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    written = sorted(o.properties["i"] for c in insert_many.call_args_list for o in c.args[0])
+    assert written == [0, 1, 2]
+
+
+def test_startup_outage_without_spool_holds_objects_and_reconnects(mock_deps):
+    """
+    Case 19: If Weaviate is down at startup and no spool is configured, the
+    worker still runs, objects wait in the queue, and the first half-open trial
+    after the recovery timeout reconnects and writes them
+    """
+    settings = mock_deps["settings"]
+    settings.BATCH_FLUSH_INTERVAL_SEC = 60
+    settings.CIRCUIT_FAILURE_THRESHOLD = 1
+    settings.CIRCUIT_RECOVERY_TIMEOUT_SEC = 0.05
+    mock_deps["get_client"].side_effect = [WeaviateConnectionError("Weaviate is down"), mock_deps["client"]]
+    manager = get_batch_manager()
+
+    assert manager.client is None
+    assert manager._worker is not None and manager._worker.is_alive()
+
+    manager.add_object(collection="TestCollection", properties={"n": 1})
+    manager.flush()
+
+    # Circuit open: no second connect attempt, and the object is held, not dropped
+    assert mock_deps["get_client"].call_count == 1
+    assert manager._queue.qsize() == 1
+    assert manager.dropped_count == 0
+
+    time.sleep(0.06)
+    manager.flush()
 
-    mock_deps["client"].collections.get.return_value.data.insert.assert_called_once_with(
-        properties=props,
-        uuid="test-uuid",
-        vector=None
-)
+    assert mock_deps["get_client"].call_count == 2
+    insert_many = mock_deps["client"].collections.get.return_value.data.insert_many
+    assert [o.properties["n"] for o in insert_many.call_args.args[0]] == [1]
@@ -0,0 +1,79 @@
+import pytest
+
+from vectorwave.batch.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_breaker_opens_after_threshold(clock):
+    """
+    Case 1: Consecutive failures up to the threshold open the circuit, which then refuses calls
+    """
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+
+def test_success_resets_failure_count(clock):
+    """
+    Case 2: Only consecutive failures count toward the threshold
+    """
+    breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_one_trial_then_closes(clock):
+    """
+    Case 3: After recovery_timeout a single trial call is allowed; its success closes the circuit
+    """
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_half_open_failure_reopens(clock):
+    """
+    Case 4: A failed trial call opens the circuit again for another recovery_timeout
+    """
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=10, clock=clock)
+    for _ in range(5):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 15
+    assert breaker.allow_request() is False
@@ -0,0 +1,122 @@
+import json
+import os
+
+import pytest
+from weaviate.classes.data import DataObject
+
+from vectorwave.batch.spool import SpanSpool
+
+
+def _segments(directory, suffix):
+    return sorted(name for name in os.listdir(directory) if name.endswith(suffix))
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return SpanSpool(str(tmp_path), segment_max_bytes=1024 * 1024, max_bytes=0, fsync_every=2)
+
+
+def test_append_and_replay_round_trip(spool, tmp_path):
+    """
+    Case 1: Spooled objects are replayed grouped by collection, and the segment is deleted afterwards
+    """
+    spool.append_many([
+        ("A", DataObject(properties={"n": 1})),
+        ("B", DataObject(properties={"n": 2}, uuid="0d6b2c0e-6c1f-4e0a-9d0b-0f0a3b8f5e11", vector=[0.1, 0.2])),
+        ("A", DataObject(properties={"n": 3})),
+    ])
+    assert spool.has_pending()
+
+    written = {}
+
+    def write_batch(collection, objects):
+        written[collection] = objects
+        return True
+
+    assert spool.replay(write_batch) == 3
+
+    assert [o.properties["n"] for o in written["A"]] == [1, 3]
+    assert written["B"][0].uuid == "0d6b2c0e-6c1f-4e0a-9d0b-0f0a3b8f5e11"
+    assert written["B"][0].vector == [0.1, 0.2]
+    # Objects without a UUID get one, so a repeated replay upserts instead of duplicating
+    assert all(o.uuid for o in written["A"])
+    assert os.listdir(tmp_path) == []
+    assert not spool.has_pending()
+
+
+def test_failed_replay_keeps_segment(spool, tmp_path):
+    """
+    Case 2: A segment whose write fails is kept and replayed again later
+    """
+    spool.append_many([("A", DataObject(properties={"n": 1}))])
+
+    assert spool.replay(lambda collection, objects: False) == 0
+    assert len(_segments(tmp_path, ".jsonl")) == 1
+
+    assert spool.replay(lambda collection, objects: True) == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_segments_rotate_by_size(tmp_path):
+    """
+    Case 3: The active segment is sealed and a new one opened past segment_max_bytes
+    """
+    spool = SpanSpool(str(tmp_path), segment_max_bytes=10, max_bytes=0)
+    for i in range(3):
+        spool.append_many([("A", DataObject(properties={"n": i}))])
+
+    assert len(_segments(tmp_path, ".jsonl")) == 2
+    assert len(_segments(tmp_path, ".jsonl.open")) == 1
+
+
+def test_max_bytes_drops_new_records(tmp_path):
+    """
+    Case 4: Records beyond max_bytes are dropped and counted
+    """
+    spool = SpanSpool(str(tmp_path), max_bytes=150)
+    written = spool.append_many([("A", DataObject(properties={"payload": "x" * 40})) for _ in range(5)])
+
+    assert written < 5
+    assert spool.dropped_count == 5 - written
+
+
+def test_replay_recovers_segments_of_dead_process(tmp_path):
+    """
+    Case 5: The active segment of a crashed process is replayed, and a torn last line is skipped
+    """
+    record = {"collection": "A", "properties": {"n": 1}, "uuid": "0d6b2c0e-6c1f-4e0a-9d0b-0f0a3b8f5e11", "vector": None}
+    leftover = tmp_path / "segment-1-999999999.jsonl.open"
+    leftover.write_text(json.dumps(record) + "\n" + '{"collection": "A", "prop', encoding="utf-8")
+
+    spool = SpanSpool(str(tmp_path))
+    written = []
+    replayed = spool.replay(lambda collection, objects: written.extend(objects) or True)
+
+    assert replayed == 1
+    assert written[0].properties == {"n": 1}
+    assert os.listdir(tmp_path) == []
+
+
+def test_numpy_vectors_are_spooled_as_lists(spool):
+    """
+    Case 6: A float32 numpy vector is written as a JSON list and replayed as one
+    """
+    np = pytest.importorskip("numpy")
+    spool.append_many([("A", DataObject(properties={"n": 1}, vector=np.array([0.5, -1.0], dtype=np.float32)))])
+
+    written = []
+    assert spool.replay(lambda collection, objects: written.extend(objects) or True) == 1
+    assert written[0].vector == [0.5, -1.0]
+
+
+def test_replay_splits_segment_into_batches(spool, tmp_path):
+    """
+    Case 7: A segment larger than batch_size is written in several inserts of at most batch_size objects
+    """
+    spool.append_many([("A", DataObject(properties={"n": n})) for n in range(5)])
+
+    inserts = []
+    assert spool.replay(lambda collection, objects: inserts.append(list(objects)) or True, batch_size=2) == 5
+
+    assert [[o.properties["n"] for o in objects] for objects in inserts] == [[0, 1], [2, 3], [4]]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,192 @@
+import socket
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.batch.batch import get_batch_manager
+from vectorwave.collector.server import CollectorServer
+from vectorwave.ipc.framing import send_frame, recv_frame
+from vectorwave.models.db_config import WeaviateSettings
+
+
+class FakeBackend:
+    """Stands in for the collector's WeaviateBatchManager."""
+
+    def __init__(self):
+        self.objects = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def add_object(self, collection, properties, uuid=None, vector=None):
+        with self._lock:
+            self.objects.append((collection, properties, uuid, vector))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def collector(tmp_path):
+    backend = FakeBackend()
+    server = CollectorServer(str(tmp_path / "collector.sock"), backend=backend).start()
+    yield server, backend
+    server.shutdown()
+
+
+@pytest.fixture
+def collector_mode(monkeypatch, collector):
+    """
+    Points the worker-side batch manager at the running collector
+    """
+    server, _ = collector
+    settings = WeaviateSettings(COLLECTOR_SOCKET_PATH=server.socket_path, BATCH_FLUSH_INTERVAL_SEC=60)
+    monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_settings", MagicMock(return_value=settings))
+    mock_get_client = MagicMock()
+    monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_client", mock_get_client)
+    monkeypatch.setattr("atexit.register", MagicMock())
+    get_batch_manager.cache_clear()
+    yield mock_get_client
+    get_batch_manager.cache_clear()
+
+
+def test_worker_batches_reach_collector_backend(collector, collector_mode):
+    """
+    Case 1: In collector mode, flushed objects are forwarded to the collector's backend
+    and no Weaviate connection is opened by the worker
+    """
+    _, backend = collector
+    manager = get_batch_manager()
+
+    manager.add_object(collection="TestExecutions", properties={"n": 1})
+    manager.add_object(collection="TestExecutions", properties={"n": 2}, uuid="0d6b2c0e-6c1f-4e0a-9d0b-0f0a3b8f5e11",
+                       vector=[0.5, 0.25])
+    manager.flush()
+
+    assert backend.objects == [
+        ("TestExecutions", {"n": 1}, None, None),
+        ("TestExecutions", {"n": 2}, "0d6b2c0e-6c1f-4e0a-9d0b-0f0a3b8f5e11", [0.5, 0.25]),
+    ]
+    collector_mode.assert_not_called()
+
+
+def test_many_workers_share_one_collector(collector):
+    """
+    Case 2: Concurrent connections (one per worker) are all accepted
+    """
+    from vectorwave.collector.client import CollectorClient
+    from weaviate.classes.data import DataObject
+
+    server, backend = collector
+
+    def worker(worker_id):
+        client = CollectorClient(server.socket_path).connect()
+        for i in range(10):
+            client.insert_many("TestExecutions", [DataObject(properties={"worker": worker_id, "i": i})])
+        client.close()
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(backend.objects) == 80
+
+
+def test_unreachable_collector_keeps_objects_queued(monkeypatch, tmp_path):
+    """
+    Case 3: Without a running collector the worker treats it like Weaviate being down
+    """
+    settings = WeaviateSettings(
+        COLLECTOR_SOCKET_PATH=str(tmp_path / "missing.sock"),
+        BATCH_FLUSH_INTERVAL_SEC=60,
+        SPOOL_DIR=str(tmp_path / "spool")
+    )
+    monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_settings", MagicMock(return_value=settings))
+    monkeypatch.setattr("atexit.register", MagicMock())
+    get_batch_manager.cache_clear()
+
+    manager = get_batch_manager()
+    assert manager._initialized is False
+
+    manager.add_object(collection="TestExecutions", properties={"n": 1})
+    manager.flush()
+
+    assert manager.spool.has_pending()
+    manager._stop_event.set()
+    manager._wake_event.set()
+    manager._worker.join()
+    get_batch_manager.cache_clear()
+
+
+def test_shutdown_closes_backend_and_removes_socket(tmp_path):
+    """
+    Case 4: Shutting the collector down flushes its backend and removes the socket file
+    """
+    backend = FakeBackend()
+    socket_path = tmp_path / "collector.sock"
+    server = CollectorServer(str(socket_path), backend=backend).start()
+    assert socket_path.exists()
+
+    server.shutdown()
+
+    assert backend.closed is True
+    assert not socket_path.exists()
+
+
+def test_ack_reports_only_objects_the_backend_queued(tmp_path):
+    """
+    Case 5: Objects the backend drops (full queue) are not acknowledged as accepted
+    """
+    class FullBackend(FakeBackend):
+        dropped_count = 0
+
+        def add_object(self, collection, properties, uuid=None, vector=None):
+            if len(self.objects) >= 2:
+                self.dropped_count += 1
+                return
+            super().add_object(collection, properties, uuid, vector)
+
+    backend = FullBackend()
+    server = CollectorServer(str(tmp_path / "collector.sock"), backend=backend).start()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(server.socket_path)
+        send_frame(sock, {"collection": "TestExecutions", "objects": [{"properties": {"n": i}} for i in range(5)]})
+        assert recv_frame(sock) == {"accepted": 2}
+    finally:
+        sock.close()
+        server.shutdown()
+
+
+def test_objects_rejected_by_collector_count_as_dropped(monkeypatch, tmp_path):
+    """
+    Case 6: Objects the collector does not accept are counted in the worker's
+    dropped_count and loss_count()
+    """
+    class FullBackend(FakeBackend):
+        dropped_count = 0
+
+        def add_object(self, collection, properties, uuid=None, vector=None):
+            if len(self.objects) >= 2:
+                self.dropped_count += 1
+                return
+            super().add_object(collection, properties, uuid, vector)
+
+    server = CollectorServer(str(tmp_path / "collector.sock"), backend=FullBackend()).start()
+    settings = WeaviateSettings(COLLECTOR_SOCKET_PATH=server.socket_path, BATCH_FLUSH_INTERVAL_SEC=60)
+    monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_settings", MagicMock(return_value=settings))
+    monkeypatch.setattr("atexit.register", MagicMock())
+    get_batch_manager.cache_clear()
+    try:
+        manager = get_batch_manager()
+        for n in range(5):
+            manager.add_object(collection="TestExecutions", properties={"n": n})
+        manager.flush()
+
+        assert manager.dropped_count == 3
+        assert manager.loss_count() == 3
+    finally:
+        get_batch_manager.cache_clear()
+        server.shutdown()
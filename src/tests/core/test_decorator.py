@@ -9,6 +9,7 @@ from vectorwave.models.db_config import WeaviateSettings
 from vectorwave.batch.batch import get_batch_manager as real_get_batch_manager
 from vectorwave.database.db import get_cached_client as real_get_cached_client
 from vectorwave.models.db_config import get_weaviate_settings as real_get_settings
+from vectorwave.core.registry import get_function_registry as real_get_function_registry
 
 
 @pytest.fixture
@@ -31,7 +32,8 @@ def mock_decorator_deps(monkeypatch):
         COLLECTION_NAME="TestFunctions",
         EXECUTION_COLLECTION_NAME="TestExecutions",
         custom_properties=mock_custom_props,
-        global_custom_values={"run_id": "test-run-abc"}
+        global_custom_values={"run_id": "test-run-abc"},
+        REGISTRATION_MODE="immediate"
     )
     mock_get_settings = MagicMock(return_value=mock_settings)
 
@@ -39,9 +41,11 @@ def mock_decorator_deps(monkeypatch):
     mock_get_client = MagicMock(return_value=mock_client)
 
 
-    # --- decorator.py ---
-    monkeypatch.setattr("vectorwave.core.decorator.get_batch_manager", mock_get_batch_manager)
+    # --- decorator.py / registry.py ---
     monkeypatch.setattr("vectorwave.core.decorator.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr("vectorwave.core.registry.get_batch_manager", mock_get_batch_manager)
+    monkeypatch.setattr("vectorwave.core.registry.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr("vectorwave.core.registry.fetch_function_hashes", MagicMock(return_value={}))
 
     # --- tracer.py ---
     monkeypatch.setattr("vectorwave.monitoring.tracer.get_batch_manager", mock_get_batch_manager)
@@ -56,6 +60,7 @@ def mock_decorator_deps(monkeypatch):
     real_get_batch_manager.cache_clear()
     real_get_cached_client.cache_clear()
     real_get_settings.cache_clear()
+    real_get_function_registry.cache_clear()
 
     return {
         "get_batch": mock_get_batch_manager,
@@ -80,15 +85,18 @@ def mock_decorator_deps_no_props(monkeypatch):
         COLLECTION_NAME="TestFunctions",
         EXECUTION_COLLECTION_NAME="TestExecutions",
         custom_properties=None,  # <-- No properties loaded
-        global_custom_values=None  # <-- No globals
+        global_custom_values=None,  # <-- No globals
+        REGISTRATION_MODE="immediate"
     )
     mock_get_settings = MagicMock(return_value=mock_settings)
 
     mock_client = MagicMock()
     mock_get_client = MagicMock(return_value=mock_client)
 
-    monkeypatch.setattr("vectorwave.core.decorator.get_batch_manager", mock_get_batch_manager)
     monkeypatch.setattr("vectorwave.core.decorator.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr("vectorwave.core.registry.get_batch_manager", mock_get_batch_manager)
+    monkeypatch.setattr("vectorwave.core.registry.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr("vectorwave.core.registry.fetch_function_hashes", MagicMock(return_value={}))
     monkeypatch.setattr("vectorwave.monitoring.tracer.get_batch_manager", mock_get_batch_manager)
     monkeypatch.setattr("vectorwave.monitoring.tracer.get_weaviate_settings", mock_get_settings)
     monkeypatch.setattr("vectorwave.batch.batch.get_weaviate_client", mock_get_client)
@@ -98,6 +106,7 @@ def mock_decorator_deps_no_props(monkeypatch):
     real_get_batch_manager.cache_clear()
     real_get_cached_client.cache_clear()
     real_get_settings.cache_clear()
+    real_get_function_registry.cache_clear()
 
     return {
         "get_batch": mock_get_batch_manager,
@@ -342,4 +351,106 @@ def test_vectorize_handles_tags_when_no_props_file(mock_decorator_deps_no_props)
     assert props["status"] == "SUCCESS"
 
     # 3b. The tag should NOT exist
-    assert "team" not in props
\ No newline at end of file
+    assert "team" not in props
+
+def test_vectorize_sample_rate_skips_unsampled_calls(mock_decorator_deps):
+    """
+    Case 8: @vectorize(sample_rate=0.0) still registers the function but logs no executions
+    """
+    mock_batch = mock_decorator_deps["batch"]
+
+    @vectorize(search_description="Sampled", sequence_narrative="Next", sample_rate=0.0, team="backend")
+    def my_unsampled_function(x):
+        return x + 1
+
+    assert my_unsampled_function(1) == 2
+    assert my_unsampled_function(x=2) == 3
+
+    # Only the static registration
+    mock_batch.add_object.assert_called_once()
+    assert mock_batch.add_object.call_args.kwargs["collection"] == mock_decorator_deps["settings"].COLLECTION_NAME
+
+
+def test_vectorize_passes_call_kwargs_through_unchanged(mock_decorator_deps):
+    """
+    Case 9: Tags and function_uuid go to the span record only; the function
+    receives exactly the arguments it was called with (minus trace_id)
+    """
+    mock_batch = mock_decorator_deps["batch"]
+    received = {}
+
+    @vectorize(search_description="Passthrough", sequence_narrative="Next", team="backend", priority=3)
+    def my_kwargs_function(*args, **kwargs):
+        received.update(kwargs)
+        return args
+
+    assert my_kwargs_function(1, 2, mode="fast", trace_id="trace-xyz") == (1, 2)
+    assert received == {"mode": "fast"}
+
+    props = mock_batch.add_object.call_args.kwargs["properties"]
+    assert props["trace_id"] == "trace-xyz"
+    assert props["team"] == "backend"
+    assert props["priority"] == 3
+    assert props["function_uuid"] is not None
+    assert "mode" not in props
+
+
+@pytest.mark.asyncio
+async def test_vectorize_async_records_single_span(mock_decorator_deps):
+    """
+    Case 10: An async @vectorize function is traced by one fused wrapper
+    """
+    mock_batch = mock_decorator_deps["batch"]
+
+    @vectorize(search_description="Async", sequence_narrative="Next", team="backend")
+    async def my_async_function(x):
+        return x * 2
+
+    assert await my_async_function(4) == 8
+
+    # Static registration + one execution span
+    assert mock_batch.add_object.call_count == 2
+    props = mock_batch.add_object.call_args.kwargs["properties"]
+    assert props["function_name"] == "my_async_function"
+    assert props["status"] == "SUCCESS"
+    assert props["team"] == "backend"
+
+
+def test_vectorize_captures_run_id_call_kwarg(mock_decorator_deps):
+    """
+    Case 11: A 'run_id', 'team' or 'priority' keyword passed at the call site is
+    recorded on the span and still reaches the function
+    """
+    mock_batch = mock_decorator_deps["batch"]
+    received = {}
+
+    @vectorize(search_description="Call-site run_id", sequence_narrative="Next")
+    def my_run_function(**kwargs):
+        received.update(kwargs)
+
+    my_run_function(run_id="call-run-1", mode="fast")
+
+    props = mock_batch.add_object.call_args.kwargs["properties"]
+    assert props["run_id"] == "call-run-1"
+    assert "mode" not in props
+    assert received == {"run_id": "call-run-1", "mode": "fast"}
+
+
+def test_vectorize_execution_tags_win_over_call_kwargs(mock_decorator_deps):
+    """
+    Case 12: Every valid execution tag is recorded on the span, and a tag takes
+    precedence over a call keyword of the same name
+    """
+    mock_batch = mock_decorator_deps["batch"]
+
+    @vectorize(search_description="Tags", sequence_narrative="Next", team="backend", run_id="tag-run")
+    def my_tag_function(**kwargs):
+        pass
+
+    my_tag_function(team="frontend", priority=5)
+
+    props = mock_batch.add_object.call_args.kwargs["properties"]
+    assert props["team"] == "backend"
+    assert props["run_id"] == "tag-run"
+    assert props["priority"] == 5
+    assert props["function_uuid"] is not None
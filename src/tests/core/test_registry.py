@@ -0,0 +1,453 @@
+import json
+import sys
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from vectorwave.core.decorator import vectorize
+from vectorwave.core.registry import get_function_registry, flush_registrations
+from vectorwave.models.db_config import WeaviateSettings
+
+REGISTRY_MODULE_PATH = "vectorwave.core.registry"
+
+
+@pytest.fixture
+def registry_deps(monkeypatch):
+    """
+    Mocks the batch manager, settings and vectorizer used by registry.py,
+    with the background timer disabled unless a test turns it on.
+    """
+    mock_batch = MagicMock()
+    mock_batch.loss_count.return_value = 0
+    mock_vectorizer = MagicMock()
+    mock_vectorizer.embed_batch.side_effect = lambda texts: [[float(i), 0.5] for i in range(len(texts))]
+
+    mock_settings = WeaviateSettings(
+        COLLECTION_NAME="TestFunctions",
+        REGISTRATION_MODE="deferred",
+        REGISTRATION_FLUSH_DELAY_SEC=0
+    )
+    mock_get_settings = MagicMock(return_value=mock_settings)
+
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.get_batch_manager", MagicMock(return_value=mock_batch))
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.get_vectorizer", MagicMock(return_value=mock_vectorizer))
+    # List path by default; the numpy path has its own case
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.numpy_available", lambda: False)
+    mock_fetch_hashes = MagicMock(return_value={})
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.fetch_function_hashes", mock_fetch_hashes)
+    mock_count_functions = MagicMock(return_value=3)
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.count_functions", mock_count_functions)
+    monkeypatch.setattr("vectorwave.core.decorator.get_weaviate_settings", mock_get_settings)
+
+    get_function_registry.cache_clear()
+    yield {
+        "batch": mock_batch,
+        "vectorizer": mock_vectorizer,
+        "settings": mock_settings,
+        "fetch_hashes": mock_fetch_hashes,
+        "count_functions": mock_count_functions
+    }
+    get_function_registry.cache_clear()
+
+
+def _define_functions():
+    @vectorize(search_description="Load users", sequence_narrative="Then clean")
+    def load_users():
+        pass
+
+    @vectorize(search_description="Clean users", sequence_narrative="Then save")
+    def clean_users():
+        pass
+
+    @vectorize(search_description="Save users", sequence_narrative="Done")
+    async def save_users():
+        pass
+
+
+def test_registration_is_deferred_until_flush(registry_deps):
+    """
+    Case 1: Decorating does no embedding and no write; flush registers all
+    pending functions with one embed_batch call
+    """
+    mock_batch = registry_deps["batch"]
+    mock_vectorizer = registry_deps["vectorizer"]
+
+    _define_functions()
+
+    mock_batch.add_object.assert_not_called()
+    mock_vectorizer.embed_batch.assert_not_called()
+    assert get_function_registry().pending_count() == 3
+
+    assert flush_registrations() == 3
+
+    mock_vectorizer.embed_batch.assert_called_once_with(["Load users", "Clean users", "Save users"])
+    mock_vectorizer.embed.assert_not_called()
+
+    calls = mock_batch.add_object.call_args_list
+    assert [c.kwargs["properties"]["function_name"] for c in calls] == ["load_users", "clean_users", "save_users"]
+    assert [c.kwargs["vector"] for c in calls] == [[0.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+    assert all(c.kwargs["collection"] == "TestFunctions" for c in calls)
+    assert "def clean_users" in calls[1].kwargs["properties"]["source_code"]
+    mock_batch.flush.assert_not_called()
+
+    # Nothing left to register
+    assert flush_registrations() == 0
+
+
+def test_flush_with_write_flushes_the_batch_manager(registry_deps):
+    """
+    Case 2: flush_registrations(write=True) also writes the batch queue
+    """
+    _define_functions()
+
+    flush_registrations(write=True)
+
+    assert registry_deps["batch"].add_object.call_count == 3
+    registry_deps["batch"].flush.assert_called_once()
+
+
+def test_background_timer_registers_pending_functions(registry_deps):
+    """
+    Case 3: With REGISTRATION_FLUSH_DELAY_SEC > 0 a background timer
+    registers everything decorated within the delay in one pass
+    """
+    registry_deps["settings"].REGISTRATION_FLUSH_DELAY_SEC = 0.05
+
+    _define_functions()
+    registry_deps["batch"].add_object.assert_not_called()
+
+    deadline = time.monotonic() + 5.0
+    while registry_deps["batch"].add_object.call_count < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert registry_deps["batch"].add_object.call_count == 3
+    registry_deps["vectorizer"].embed_batch.assert_called_once()
+
+
+def test_failed_embedding_still_registers_functions(registry_deps):
+    """
+    Case 4: If embed_batch fails, functions are registered without vectors
+    """
+    registry_deps["vectorizer"].embed_batch.side_effect = RuntimeError("model unavailable")
+
+    _define_functions()
+    flush_registrations()
+
+    calls = registry_deps["batch"].add_object.call_args_list
+    assert len(calls) == 3
+    assert all(c.kwargs["vector"] is None for c in calls)
+
+
+def test_initialize_database_flushes_registrations(registry_deps, monkeypatch):
+    """
+    Case 5: initialize_database() starts the vectorizer warm-up, creates the
+    schemas, then registers pending functions and writes them
+    """
+    from vectorwave.database import db
+
+    monkeypatch.setattr("vectorwave.database.db.get_cached_client", MagicMock(return_value=MagicMock()))
+    monkeypatch.setattr("vectorwave.database.db.create_vectorwave_schema", MagicMock())
+    monkeypatch.setattr("vectorwave.database.db.create_execution_schema", MagicMock())
+    warm_up = MagicMock()
+    monkeypatch.setattr("vectorwave.database.db.warm_up_vectorizer", warm_up)
+
+    _define_functions()
+    assert db.initialize_database() is not None
+    warm_up.assert_called_once_with()
+
+    assert registry_deps["batch"].add_object.call_count == 3
+    registry_deps["batch"].flush.assert_called_once()
+
+
+def _registered_hashes(mock_batch):
+    return {
+        c.kwargs["properties"]["function_name"]: c.kwargs["properties"]["content_hash"]
+        for c in mock_batch.add_object.call_args_list
+    }
+
+
+def test_content_hash_is_stable_and_tracks_changes(registry_deps):
+    """
+    Case 6: The same definition always hashes the same; a changed
+    description, tag or vectorizer changes the hash
+    """
+    from vectorwave.core.registry import compute_content_hash
+
+    settings = registry_deps["settings"]
+    properties = {"function_name": "f", "source_code": "def f(): pass", "search_description": "A", "team": "x"}
+
+    first = compute_content_hash(properties, settings)
+    assert first == compute_content_hash(dict(reversed(list(properties.items()))), settings)
+    assert first == compute_content_hash({**properties, "content_hash": "ignored"}, settings)
+    assert first != compute_content_hash({**properties, "search_description": "B"}, settings)
+    assert first != compute_content_hash({**properties, "team": "y"}, settings)
+
+    other_model = settings.model_copy(update={"VECTORIZER": "huggingface"})
+    assert first != compute_content_hash(properties, other_model)
+
+
+def test_unchanged_functions_are_skipped_after_bulk_fetch(registry_deps):
+    """
+    Case 7: Functions whose stored hash matches are neither embedded nor
+    written; stored hashes are fetched with one call
+    """
+    mock_batch = registry_deps["batch"]
+
+    _define_functions()
+    flush_registrations()
+    hashes = _registered_hashes(mock_batch)
+    uuids = {c.kwargs["properties"]["function_name"]: c.kwargs["uuid"] for c in mock_batch.add_object.call_args_list}
+
+    # "Restart": Weaviate already holds load_users and save_users unchanged,
+    # clean_users with an outdated hash
+    mock_batch.reset_mock()
+    registry_deps["vectorizer"].reset_mock()
+    registry_deps["fetch_hashes"].reset_mock()
+    registry_deps["fetch_hashes"].return_value = {
+        uuids["load_users"]: hashes["load_users"],
+        uuids["clean_users"]: "outdated",
+        uuids["save_users"]: hashes["save_users"],
+    }
+
+    _define_functions()
+    assert flush_registrations() == 1
+
+    registry_deps["fetch_hashes"].assert_called_once()
+    assert sorted(registry_deps["fetch_hashes"].call_args.args[0]) == sorted(uuids.values())
+    registry_deps["vectorizer"].embed_batch.assert_called_once_with(["Clean users"])
+    assert list(_registered_hashes(mock_batch)) == ["clean_users"]
+
+
+def test_local_hash_cache_avoids_the_remote_fetch(registry_deps, tmp_path):
+    """
+    Case 8: With REGISTRATION_HASH_CACHE_FILE, hashes confirmed written on the
+    first start let the next start skip unchanged functions without querying Weaviate
+    """
+    registry_deps["settings"].REGISTRATION_HASH_CACHE_FILE = str(tmp_path / "hashes.json")
+
+    _define_functions()
+    assert flush_registrations(write=True) == 3
+    assert (tmp_path / "hashes.json").exists()
+
+    registry_deps["batch"].reset_mock()
+    registry_deps["fetch_hashes"].reset_mock()
+
+    _define_functions()
+    assert flush_registrations() == 0
+
+    registry_deps["fetch_hashes"].assert_not_called()
+    registry_deps["batch"].add_object.assert_not_called()
+
+
+def test_skip_unchanged_can_be_disabled(registry_deps):
+    """
+    Case 9: REGISTRATION_SKIP_UNCHANGED=False registers every function
+    """
+    registry_deps["settings"].REGISTRATION_SKIP_UNCHANGED = False
+    registry_deps["fetch_hashes"].side_effect = AssertionError("must not be called")
+
+    _define_functions()
+
+    assert flush_registrations() == 3
+
+
+def test_skip_mode_does_not_register_at_runtime(registry_deps):
+    """
+    Case 10: REGISTRATION_MODE=skip leaves the static path out entirely
+    """
+    registry_deps["settings"].REGISTRATION_MODE = "skip"
+
+    _define_functions()
+
+    assert get_function_registry().pending_count() == 0
+    assert flush_registrations() == 0
+    registry_deps["vectorizer"].embed_batch.assert_not_called()
+
+
+def test_register_cli_imports_package_and_registers_in_batches(registry_deps, monkeypatch, tmp_path):
+    """
+    Case 11: 'vectorwave register' imports every module of a package and
+    registers the functions found with chunked embedding and one write
+    """
+    from vectorwave import cli
+
+    package = tmp_path / "vw_register_pkg"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "sub" / "__init__.py").write_text("")
+    decorated = (
+        "from vectorwave import vectorize\n\n"
+        "@vectorize(search_description='{name} desc', sequence_narrative='next')\n"
+        "def {name}():\n"
+        "    pass\n"
+    )
+    (package / "jobs.py").write_text(decorated.format(name="run_job"))
+    (package / "sub" / "tasks.py").write_text(decorated.format(name="run_task"))
+
+    mock_get_settings = MagicMock(return_value=registry_deps["settings"])
+    monkeypatch.setattr("vectorwave.models.db_config.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr("vectorwave.batch.batch.get_batch_manager", MagicMock(return_value=registry_deps["batch"]))
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+    try:
+        assert cli.main(["register", "vw_register_pkg", "--path", str(tmp_path), "--batch-size", "1"]) == 0
+    finally:
+        for name in [m for m in sys.modules if m.startswith("vw_register_pkg")]:
+            del sys.modules[name]
+
+    names = sorted(c.kwargs["properties"]["function_name"] for c in registry_deps["batch"].add_object.call_args_list)
+    assert names == ["run_job", "run_task"]
+    # One embedding call per chunk of --batch-size descriptions
+    assert registry_deps["vectorizer"].embed_batch.call_count == 2
+    registry_deps["batch"].flush.assert_called_once()
+    registry_deps["batch"].close.assert_called_once()
+
+
+def test_bulk_flush_uses_the_encode_pool(registry_deps, monkeypatch):
+    """
+    Case 12: flush() with several embed workers embeds through an encode
+    pool, which is closed afterwards, instead of the in-process vectorizer
+    """
+    pool = MagicMock()
+    pool.__enter__.return_value = pool
+    pool.embed_batch.side_effect = lambda texts: [[1.0, float(i)] for i in range(len(texts))]
+    mock_create_pool = MagicMock(return_value=pool)
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.create_encode_pool", mock_create_pool)
+
+    _define_functions()
+    assert get_function_registry().flush(embed_batch_size=1, embed_workers=2) == 3
+
+    mock_create_pool.assert_called_once_with(2, 1)
+    pool.__exit__.assert_called_once()
+    registry_deps["vectorizer"].embed_batch.assert_not_called()
+    vectors = [c.kwargs["vector"] for c in registry_deps["batch"].add_object.call_args_list]
+    assert vectors == [[1.0, 0.0], [1.0, 1.0], [1.0, 2.0]]
+
+
+def test_flush_passes_numpy_rows_to_the_batch_manager(registry_deps, monkeypatch):
+    """
+    Case 13: With numpy available, descriptions are embedded with
+    embed_batch_numpy() and each float32 row goes to add_object as it is
+    """
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(f"{REGISTRY_MODULE_PATH}.numpy_available", lambda: True)
+    registry_deps["vectorizer"].embed_batch_numpy.side_effect = lambda texts: np.array(
+        [[float(i), 0.5] for i in range(len(texts))], dtype=np.float32
+    )
+
+    _define_functions()
+    assert flush_registrations() == 3
+
+    registry_deps["vectorizer"].embed_batch.assert_not_called()
+    vectors = [c.kwargs["vector"] for c in registry_deps["batch"].add_object.call_args_list]
+    assert all(isinstance(v, np.ndarray) and v.dtype == np.float32 for v in vectors)
+    assert [v.tolist() for v in vectors] == [[0.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+
+
+def test_failed_embedding_is_written_without_its_hash(registry_deps, tmp_path):
+    """
+    Case 14: When the Python vectorizer fails, objects are written without a
+    content_hash (so the next start embeds them again) and no hash is cached
+    """
+    registry_deps["settings"].REGISTRATION_HASH_CACHE_FILE = str(tmp_path / "hashes.json")
+    registry_deps["vectorizer"].embed_batch.side_effect = RuntimeError("model crashed")
+
+    _define_functions()
+    assert flush_registrations(write=True) == 3
+
+    for c in registry_deps["batch"].add_object.call_args_list:
+        assert c.kwargs["vector"] is None
+        assert "content_hash" not in c.kwargs["properties"]
+    assert not (tmp_path / "hashes.json").exists()
+
+
+@pytest.mark.parametrize("outcome", ["spooled", "dead_lettered", "no_client", "not_written"])
+def test_hash_cache_requires_a_confirmed_write(registry_deps, tmp_path, outcome):
+    """
+    Case 15: Hashes are cached only after the batch manager wrote everything:
+    not when objects were spooled, lost, or never flushed (write=False)
+    """
+    registry_deps["settings"].REGISTRATION_HASH_CACHE_FILE = str(tmp_path / "hashes.json")
+    batch = registry_deps["batch"]
+    losses = iter([0, 1 if outcome == "dead_lettered" else 0])
+    batch.loss_count.side_effect = lambda: next(losses)
+    batch.flush.return_value = outcome != "spooled"
+    if outcome == "no_client":
+        batch.client = None
+
+    _define_functions()
+    assert flush_registrations(write=outcome != "not_written") == 3
+
+    assert not (tmp_path / "hashes.json").exists()
+
+
+def test_register_cli_fails_when_objects_do_not_reach_weaviate(registry_deps, monkeypatch):
+    """
+    Case 16: 'vectorwave register' exits nonzero when the batch manager has no
+    client or objects were dropped, dead-lettered or spooled during the write
+    """
+    from vectorwave import cli
+
+    monkeypatch.setattr("vectorwave.models.db_config.get_weaviate_settings",
+                        MagicMock(return_value=registry_deps["settings"]))
+    monkeypatch.setattr("vectorwave.batch.batch.get_batch_manager", MagicMock(return_value=registry_deps["batch"]))
+    monkeypatch.setattr("vectorwave.core.registry.import_modules", lambda names: names)
+    batch = registry_deps["batch"]
+
+    # The write dead-letters two objects
+    flushes = []
+    batch.flush.side_effect = lambda: flushes.append(1) or True
+    batch.loss_count.side_effect = lambda: 2 * len(flushes)
+    _define_functions()
+    assert cli.main(["register", "unused"]) == 1
+
+    batch.loss_count.side_effect = None
+    batch.client = None
+    _define_functions()
+    assert cli.main(["register", "unused"]) == 1
+
+
+def test_hash_cache_is_cleared_when_collection_is_empty(registry_deps, tmp_path):
+    """
+    Case 17: Cached hashes are not trusted once the function collection is
+    empty (e.g. recreated); every function is registered again
+    """
+    registry_deps["settings"].REGISTRATION_HASH_CACHE_FILE = str(tmp_path / "hashes.json")
+
+    _define_functions()
+    assert flush_registrations(write=True) == 3
+
+    registry_deps["count_functions"].return_value = 0
+    registry_deps["batch"].reset_mock()
+    registry_deps["fetch_hashes"].reset_mock()
+
+    _define_functions()
+    assert flush_registrations() == 3
+
+    registry_deps["fetch_hashes"].assert_called_once()
+    assert json.loads((tmp_path / "hashes.json").read_text()) == {"localhost:8080/TestFunctions": {}}
+
+
+def test_hash_cache_is_not_used_in_collector_mode(registry_deps, tmp_path):
+    """
+    Case 18: In collector mode the hash cache is neither written nor read
+    """
+    cache_file = tmp_path / "hashes.json"
+    registry_deps["settings"].REGISTRATION_HASH_CACHE_FILE = str(cache_file)
+    registry_deps["settings"].COLLECTOR_SOCKET_PATH = str(tmp_path / "collector.sock")
+
+    _define_functions()
+    assert flush_registrations(write=True) == 3
+    assert not cache_file.exists()
+
+    registry_deps["settings"].COLLECTOR_SOCKET_PATH = None
+    _define_functions()
+    assert flush_registrations(write=True) == 3
+    assert cache_file.exists()
+
+    registry_deps["settings"].COLLECTOR_SOCKET_PATH = str(tmp_path / "collector.sock")
+    _define_functions()
+    assert flush_registrations() == 3
+    registry_deps["count_functions"].assert_not_called()
@@ -160,4 +160,24 @@ def test_search_executions_filter_and_sort_duration(mock_search_exec_deps):
     assert call_args.kwargs['filters'] is not None
 
     sort_arg = call_args.kwargs['sort']
-    assert sort_arg is not None
\ No newline at end of file
+    assert sort_arg is not None
+def test_fetch_function_hashes_pages_large_uuid_lists(mock_search_deps, monkeypatch):
+    """ Large UUID lists are fetched in pages that stay under Weaviate's query limit """
+    import uuid
+    from vectorwave.database import db_search
+
+    monkeypatch.setattr("vectorwave.database.db_search.FETCH_HASHES_PAGE_SIZE", 2)
+    fetch_objects = mock_search_deps["collection"].query.fetch_objects
+
+    def fake_fetch(filters, return_properties, limit):
+        assert limit <= 2
+        return MagicMock(objects=[
+            MagicMock(uuid=f"u{fetch_objects.call_count}", properties={"content_hash": "h"}),
+        ])
+    fetch_objects.side_effect = fake_fetch
+
+    uuids = [str(uuid.UUID(int=i)) for i in range(5)]
+    hashes = db_search.fetch_function_hashes(uuids)
+
+    assert fetch_objects.call_count == 3
+    assert hashes == {"u1": "h", "u2": "h", "u3": "h"}
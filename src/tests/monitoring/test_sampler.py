@@ -0,0 +1,99 @@
+import pytest
+
+from vectorwave.monitoring.sampler import AdaptiveSampler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sampler(clock, rand=lambda: 0.0, **kwargs):
+    kwargs.setdefault("max_per_second", 10)
+    kwargs.setdefault("min_per_window", 2)
+    return AdaptiveSampler(clock=clock, rand=rand, **kwargs)
+
+
+def test_keeps_everything_below_the_cap():
+    """
+    Case 1: A function called less than max_per_second is sampled at rate 1.0
+    """
+    clock = FakeClock()
+    sampler = _sampler(clock)
+
+    for _ in range(3):
+        rates = [sampler.should_sample("cold_func") for _ in range(5)]
+        assert rates == [1.0] * 5
+        clock.now += 1.0
+
+
+def test_caps_kept_traces_per_window():
+    """
+    Case 2: Within one window no more than max_per_second traces are kept
+    """
+    clock = FakeClock()
+    sampler = _sampler(clock)
+
+    rates = [sampler.should_sample("hot_func") for _ in range(100)]
+
+    assert sum(r is not None for r in rates) == 10
+    assert rates[10:] == [None] * 90
+
+
+def test_rate_adapts_to_previous_window_traffic():
+    """
+    Case 3: After a busy window the keep probability is cap / calls seen,
+    and the kept volume stays flat while traffic keeps spiking
+    """
+    clock = FakeClock()
+    draws = iter([0.01, 0.5] * 1000)
+    sampler = _sampler(clock, rand=lambda: next(draws))
+
+    for _ in range(100):
+        sampler.should_sample("hot_func")
+    clock.now += 1.0
+
+    rates = [sampler.should_sample("hot_func") for _ in range(100)]
+    kept = [r for r in rates if r is not None]
+
+    assert sampler.rate("hot_func") == pytest.approx(0.1)
+    # The two guaranteed samples, then every second call (draw 0.01 < 0.1) until the cap
+    assert kept[:2] == [1.0, 1.0]
+    assert kept[2:] == [pytest.approx(0.1)] * 8
+
+
+def test_guarantees_minimum_samples_for_each_function():
+    """
+    Case 4: min_per_window calls are kept per function even at a tiny rate,
+    and functions are tracked independently
+    """
+    clock = FakeClock()
+    sampler = _sampler(clock, rand=lambda: 0.99)
+
+    for _ in range(1000):
+        sampler.should_sample("hot_func")
+    clock.now += 1.0
+
+    hot = [sampler.should_sample("hot_func") for _ in range(1000)]
+    assert hot.count(1.0) == 2
+    assert sum(r is not None for r in hot) == 2
+
+    assert sampler.should_sample("other_func") == 1.0
+
+
+def test_idle_gap_resets_the_rate():
+    """
+    Case 5: A window count older than one window is not used for the rate
+    """
+    clock = FakeClock()
+    sampler = _sampler(clock)
+
+    for _ in range(1000):
+        sampler.should_sample("bursty_func")
+    clock.now += 5.0
+
+    assert sampler.should_sample("bursty_func") == 1.0
+    assert sampler.rate("bursty_func") == 1.0
@@ -0,0 +1,110 @@
+import os
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.monitoring.switch import tracing_switch, set_tracing_enabled, is_tracing_enabled
+from vectorwave.monitoring.tracer import trace_root, trace_span, trace_root_span
+
+TRACER_MODULE_PATH = "vectorwave.monitoring.tracer"
+SWITCH_MODULE_PATH = "vectorwave.monitoring.switch"
+
+
+@pytest.fixture
+def switch_deps(monkeypatch):
+    """
+    Mocks the batch manager and settings used by the tracer and the switch,
+    and gives every test a fresh switch.
+    """
+    mock_batch = MagicMock()
+    mock_settings = WeaviateSettings(EXECUTION_COLLECTION_NAME="TestExecutions")
+    mock_get_settings = MagicMock(return_value=mock_settings)
+
+    monkeypatch.setattr(f"{TRACER_MODULE_PATH}.get_batch_manager", MagicMock(return_value=mock_batch))
+    monkeypatch.setattr(f"{TRACER_MODULE_PATH}.get_weaviate_settings", mock_get_settings)
+    monkeypatch.setattr(f"{SWITCH_MODULE_PATH}.get_weaviate_settings", mock_get_settings)
+
+    tracing_switch.reset()
+    yield {"batch": mock_batch, "settings": mock_settings}
+    tracing_switch.reset()
+
+
+def test_set_tracing_enabled_switches_tracing_at_runtime(switch_deps):
+    """
+    Case 1: set_tracing_enabled(False) turns already decorated functions into
+    pass-through calls; turning it back on resumes span recording
+    """
+    mock_batch = switch_deps["batch"]
+    received = {}
+
+    def work(x, **kwargs):
+        received.update(kwargs)
+        return x * 2
+
+    traced = trace_root_span(work, attributes={"team": "backend"})
+
+    @trace_root()
+    @trace_span
+    def stacked(x):
+        return x + 1
+
+    set_tracing_enabled(False)
+    assert is_tracing_enabled() is False
+    assert traced(2, trace_id="ignored") == 4
+    assert received == {}
+    assert stacked(1, trace_id="ignored") == 2
+    mock_batch.add_object.assert_not_called()
+
+    set_tracing_enabled(True)
+    assert traced(3) == 6
+    mock_batch.add_object.assert_called_once()
+
+
+def test_tracing_enabled_setting_is_initial_state(switch_deps):
+    """
+    Case 2: TRACING_ENABLED=False starts with tracing switched off
+    """
+    switch_deps["settings"].TRACING_ENABLED = False
+
+    traced = trace_root_span(lambda: "ok")
+
+    assert traced() == "ok"
+    assert is_tracing_enabled() is False
+    switch_deps["batch"].add_object.assert_not_called()
+
+
+def test_control_file_flips_tracing(switch_deps, tmp_path):
+    """
+    Case 3: Writing 'off'/'on' to TRACING_CONTROL_FILE flips the switch;
+    removing the file restores TRACING_ENABLED
+    """
+    control_file = tmp_path / "tracing"
+    switch_deps["settings"].TRACING_CONTROL_FILE = str(control_file)
+    switch_deps["settings"].TRACING_CONTROL_POLL_SEC = 0.05
+
+    assert is_tracing_enabled() is True
+
+    control_file.write_text("off\n")
+    _wait_for(lambda: not tracing_switch.enabled)
+
+    control_file.write_text("on\n")
+    os.utime(control_file, (time.time() + 5, time.time() + 5))
+    _wait_for(lambda: tracing_switch.enabled)
+
+    control_file.write_text("off\n")
+    os.utime(control_file, (time.time() + 10, time.time() + 10))
+    _wait_for(lambda: not tracing_switch.enabled)
+
+    control_file.unlink()
+    _wait_for(lambda: tracing_switch.enabled)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met in time")
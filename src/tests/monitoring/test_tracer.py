@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
+import contextvars
 import time
 
 from vectorwave.monitoring.tracer import trace_root, trace_span
@@ -9,7 +10,7 @@ from vectorwave.models.db_config import WeaviateSettings
 from vectorwave.batch.batch import get_batch_manager as real_get_batch_manager
 from vectorwave.database.db import get_cached_client as real_get_cached_client
 from vectorwave.models.db_config import get_weaviate_settings as real_get_settings
-from vectorwave.monitoring.tracer import TraceCollector, current_tracer_var
+from vectorwave.monitoring.tracer import TraceCollector, current_tracer_var, NOT_SAMPLED, is_trace_sampled
 
 # Module paths to mock (adjust to your project structure if needed)
 TRACER_MODULE_PATH = "vectorwave.monitoring.tracer"
@@ -254,3 +255,272 @@ def test_trace_span_error_code_priority_3_default_class_name(mock_tracer_deps):
     args, kwargs = mock_batch.add_object.call_args
     assert kwargs["properties"]["status"] == "ERROR"
     assert kwargs["properties"]["error_code"] == "KeyError"
+
+
+def test_trace_root_sample_rate_zero_records_nothing(mock_tracer_deps):
+    """Head sampling: an unsampled trace skips every nested span."""
+    mock_batch = mock_tracer_deps["batch"]
+    calls = []
+
+    @trace_span(attributes_to_capture=["x"])
+    def my_inner_span(x):
+        calls.append(x)
+        assert current_tracer_var.get() is NOT_SAMPLED
+        return x * 2
+
+    @trace_root(sample_rate=0.0)
+    @trace_span
+    def my_unsampled_root():
+        return my_inner_span(x=21)
+
+    assert my_unsampled_root() == 42
+    assert calls == [21]
+    mock_batch.add_object.assert_not_called()
+    assert current_tracer_var.get() is None
+
+
+def test_global_sample_rate_applies_without_override(mock_tracer_deps):
+    """Head sampling: TRACE_SAMPLE_RATE is used when the root has no sample_rate."""
+    mock_batch = mock_tracer_deps["batch"]
+    mock_tracer_deps["settings"].TRACE_SAMPLE_RATE = 0.0
+
+    @trace_root()
+    @trace_span
+    def my_root():
+        pass
+
+    @trace_root(sample_rate=1.0)
+    @trace_span
+    def my_always_sampled_root():
+        pass
+
+    my_root()
+    mock_batch.add_object.assert_not_called()
+
+    my_always_sampled_root()
+    mock_batch.add_object.assert_called_once()
+
+
+def test_sampling_decision_is_deterministic_per_trace_id(mock_tracer_deps):
+    """Head sampling: the decision depends only on trace_id and rate, and follows the rate."""
+    trace_ids = [f"trace-{i}" for i in range(2000)]
+
+    first = [is_trace_sampled(t, 0.25) for t in trace_ids]
+    second = [is_trace_sampled(t, 0.25) for t in trace_ids]
+
+    assert first == second
+    assert 0.2 < sum(first) / len(first) < 0.3
+
+    mock_batch = mock_tracer_deps["batch"]
+    sampled_id = next(t for t, keep in zip(trace_ids, first) if keep)
+    dropped_id = next(t for t, keep in zip(trace_ids, first) if not keep)
+
+    @trace_root(sample_rate=0.25)
+    @trace_span
+    def my_root():
+        pass
+
+    my_root(trace_id=dropped_id)
+    mock_batch.add_object.assert_not_called()
+
+    my_root(trace_id=sampled_id)
+    assert mock_batch.add_object.call_args.kwargs["properties"]["trace_id"] == sampled_id
+
+
+def _enable_tail_sampling(settings, **overrides):
+    settings.TAIL_SAMPLING_ENABLED = True
+    settings.TAIL_BASELINE_RATE = 0.0
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+
+def test_tail_sampling_drops_fast_successful_traces(mock_tracer_deps):
+    """Tail sampling: a fast, successful trace is buffered and then discarded."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"])
+
+    @trace_span
+    def my_inner_span():
+        assert current_tracer_var.get().pending_spans == []
+
+    @trace_root()
+    @trace_span
+    def my_root():
+        my_inner_span()
+        return "ok"
+
+    assert my_root() == "ok"
+    mock_batch.add_object.assert_not_called()
+
+
+def test_tail_sampling_keeps_whole_trace_with_error(mock_tracer_deps):
+    """Tail sampling: one failed span keeps every span of its trace."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"])
+
+    @trace_span
+    def my_ok_span():
+        pass
+
+    @trace_span
+    def my_failing_span():
+        raise ValueError("boom")
+
+    @trace_root()
+    @trace_span
+    def my_root():
+        my_ok_span()
+        try:
+            my_failing_span()
+        except ValueError:
+            pass
+
+    my_root(trace_id="tail-error-trace")
+
+    exported = [c.kwargs["properties"] for c in mock_batch.add_object.call_args_list]
+    assert [p["function_name"] for p in exported] == ["my_ok_span", "my_failing_span", "my_root"]
+    assert {p["trace_id"] for p in exported} == {"tail-error-trace"}
+    assert exported[1]["status"] == "ERROR"
+
+
+def test_tail_sampling_keeps_slow_traces_with_per_function_threshold(mock_tracer_deps):
+    """Tail sampling: slow_threshold_ms on trace_root overrides TAIL_SLOW_THRESHOLD_MS."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"], TAIL_SLOW_THRESHOLD_MS=60_000)
+
+    @trace_root()
+    @trace_span
+    def my_default_root():
+        time.sleep(0.02)
+
+    @trace_root(slow_threshold_ms=10)
+    @trace_span
+    def my_strict_root():
+        time.sleep(0.02)
+
+    my_default_root()
+    mock_batch.add_object.assert_not_called()
+
+    my_strict_root()
+    mock_batch.add_object.assert_called_once()
+    assert mock_batch.add_object.call_args.kwargs["properties"]["function_name"] == "my_strict_root"
+
+
+def test_tail_sampling_baseline_rate(mock_tracer_deps):
+    """Tail sampling: TAIL_BASELINE_RATE keeps a deterministic share of ordinary traces."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"], TAIL_BASELINE_RATE=0.5)
+
+    trace_ids = [f"trace-{i}" for i in range(20)]
+    expected = [t for t in trace_ids if is_trace_sampled(t, 0.5)]
+
+    @trace_root()
+    @trace_span
+    def my_root():
+        pass
+
+    for trace_id in trace_ids:
+        my_root(trace_id=trace_id)
+
+    exported = [c.kwargs["properties"]["trace_id"] for c in mock_batch.add_object.call_args_list]
+    assert exported == expected
+
+
+def test_tail_sampling_bounds_spans_per_trace(mock_tracer_deps):
+    """Tail sampling: spans past TAIL_MAX_SPANS_PER_TRACE are not buffered."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"], TAIL_MAX_SPANS_PER_TRACE=3)
+
+    @trace_span
+    def my_inner_span():
+        pass
+
+    @trace_root()
+    @trace_span
+    def my_root():
+        for _ in range(5):
+            my_inner_span()
+        tracer = current_tracer_var.get()
+        assert len(tracer.pending_spans) == 3
+        assert tracer.overflow_count == 2
+        raise RuntimeError("keep me")
+
+    with pytest.raises(RuntimeError):
+        my_root()
+
+    # The failing root span itself overflowed, but its error still kept the trace
+    assert mock_batch.add_object.call_count == 3
+
+
+def test_tail_sampling_falls_back_to_head_sampling_when_buffer_full(mock_tracer_deps, monkeypatch):
+    """Tail sampling: past TAIL_MAX_INFLIGHT_TRACES, new traces are decided up front at the baseline rate."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"], TAIL_MAX_INFLIGHT_TRACES=1)
+    monkeypatch.setattr(f"{TRACER_MODULE_PATH}._tail_inflight", 0)
+
+    seen = {}
+
+    @trace_root()
+    @trace_span
+    def my_nested_root(label):
+        seen[label] = current_tracer_var.get()
+
+    @trace_root()
+    @trace_span
+    def my_outer_root():
+        # Runs in a fresh context, like a concurrent request would
+        contextvars.Context().run(my_nested_root, "overflow")
+
+    my_outer_root()
+
+    assert seen["overflow"] is NOT_SAMPLED
+    mock_batch.add_object.assert_not_called()
+
+    # The slot is released once the outer trace finished
+    my_nested_root("after")
+    assert seen["after"].tail_sampling is True
+
+
+def test_spans_record_effective_sample_rate(mock_tracer_deps, monkeypatch):
+    """Adaptive sampling: each span stores head rate x adaptive rate as 'sample_rate'."""
+    from vectorwave.monitoring.sampler import AdaptiveSampler
+
+    mock_batch = mock_tracer_deps["batch"]
+    settings = mock_tracer_deps["settings"]
+    settings.ADAPTIVE_SAMPLING_ENABLED = True
+
+    sampler = MagicMock(spec=AdaptiveSampler)
+    sampler.should_sample.side_effect = [0.25, None]
+    monkeypatch.setattr(f"{TRACER_MODULE_PATH}.get_adaptive_sampler", lambda: sampler)
+
+    @trace_span
+    def my_inner_span():
+        pass
+
+    @trace_root(sample_rate=1.0)
+    @trace_span
+    def my_root():
+        my_inner_span()
+
+    my_root()
+    my_root()
+
+    assert [c.args for c in sampler.should_sample.call_args_list] == [("my_root",), ("my_root",)]
+    rates = [c.kwargs["properties"]["sample_rate"] for c in mock_batch.add_object.call_args_list]
+    assert rates == [0.25, 0.25]
+
+
+def test_tail_baseline_kept_traces_record_baseline_rate(mock_tracer_deps):
+    """Tail sampling: a trace kept only by the baseline carries the baseline in 'sample_rate'."""
+    mock_batch = mock_tracer_deps["batch"]
+    _enable_tail_sampling(mock_tracer_deps["settings"], TAIL_BASELINE_RATE=0.5)
+    trace_id = next(f"trace-{i}" for i in range(100) if is_trace_sampled(f"trace-{i}", 0.5))
+
+    @trace_root()
+    @trace_span
+    def my_root():
+        pass
+
+    my_root(trace_id=trace_id)
+
+    assert mock_batch.add_object.call_args.kwargs["properties"]["sample_rate"] == 0.5
@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import vectorwave
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(vectorwave.__file__)))
+
+HEAVY_MODULES = ["sentence_transformers", "torch", "transformers", "openai", "numpy"]
+
+
+def _run_isolated(code: str, **env) -> subprocess.CompletedProcess:
+    full_env = {**os.environ, "PYTHONPATH": SRC_DIR, "VECTORIZER": "weaviate_module", **env}
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=full_env, timeout=120
+    )
+
+
+def test_import_vectorwave_is_lazy():
+    """
+    Case 1: 'import vectorwave' loads neither Weaviate nor any vectorizer
+    library and prints nothing (see benchmarks/bench_import_time.py for timing)
+    """
+    code = (
+        "import json, sys\n"
+        "import vectorwave\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    result = _run_isolated(code)
+    assert result.returncode == 0, result.stderr
+
+    loaded = set(json.loads(result.stdout))
+    assert "weaviate" not in loaded
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_weaviate_module_backend_never_loads_vectorizer_libraries():
+    """
+    Case 2: Using the API with VECTORIZER=weaviate_module does not import
+    sentence-transformers, torch or openai, and prints no warnings
+    """
+    code = (
+        "import json, sys\n"
+        "from vectorwave import vectorize, search_functions\n"
+        "from vectorwave.vectorizer.factory import get_vectorizer\n"
+        "assert get_vectorizer() is None\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    result = _run_isolated(code, REGISTRATION_MODE="skip")
+    assert result.returncode == 0, result.stderr
+
+    loaded = set(json.loads(result.stdout))
+    assert "vectorwave.core.decorator" in loaded
+    assert not loaded & {"sentence_transformers", "torch", "transformers", "openai"}
+    assert "vectorwave.vectorizer.huggingface_vectorizer" not in loaded
+    assert "vectorwave.vectorizer.openai_vectorizer" not in loaded
+
+
+def test_lazy_attributes_resolve_to_the_real_objects():
+    """
+    Case 3: Attributes of the package resolve to the implementation objects
+    """
+    from vectorwave.core.decorator import vectorize
+    from vectorwave.monitoring.switch import set_tracing_enabled
+
+    assert vectorwave.vectorize is vectorize
+    assert vectorwave.set_tracing_enabled is set_tracing_enabled
+    assert set(vectorwave.__all__) <= set(dir(vectorwave))
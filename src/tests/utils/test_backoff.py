@@ -0,0 +1,11 @@
+from vectorwave.utils.backoff import backoff_delay
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    """
+    Case 1: The delay grows exponentially, is scaled by the jitter factor, and never exceeds the cap
+    """
+    assert backoff_delay(0, base=0.5, maximum=10, rand=lambda: 1.0) == 0.5
+    assert backoff_delay(3, base=0.5, maximum=10, rand=lambda: 1.0) == 4.0
+    assert backoff_delay(10, base=0.5, maximum=10, rand=lambda: 1.0) == 10
+    assert backoff_delay(3, base=0.5, maximum=10, rand=lambda: 0.25) == 1.0
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from vectorwave.vectorizer.base import BaseVectorizer
+from vectorwave.vectorizer.batching import MicroBatchingVectorizer
+
+
+class SlowVectorizer(BaseVectorizer):
+    """Fake model with a fixed cost per call, like a forward pass or HTTP request."""
+
+    def __init__(self, call_cost_sec: float = 0.02, fail: bool = False):
+        self.model_name = "slow-model"
+        self.call_cost_sec = call_cost_sec
+        self.fail = fail
+        self.calls: List[List[str]] = []
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        time.sleep(self.call_cost_sec)
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [[float(len(t))] for t in texts]
+
+
+def _call_concurrently(vectorizer: BaseVectorizer, texts: List[str]) -> List[List[float]]:
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+
+    def call(i):
+        barrier.wait()
+        results[i] = vectorizer.embed(texts[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(texts))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_calls_are_coalesced():
+    """
+    Case 1: Concurrent embed() calls share batched calls and each caller gets its own vector
+    """
+    inner = SlowVectorizer()
+    vectorizer = MicroBatchingVectorizer(inner, max_batch_size=64)
+    texts = ["x" * i for i in range(1, 33)]
+
+    results = _call_concurrently(vectorizer, texts)
+
+    assert results == [[float(i)] for i in range(1, 33)]
+    assert len(inner.calls) < 8
+    assert sorted(t for call in inner.calls for t in call) == sorted(texts)
+
+
+def test_batches_respect_max_size():
+    """
+    Case 2: No batched call exceeds max_batch_size texts
+    """
+    inner = SlowVectorizer(call_cost_sec=0.005)
+    vectorizer = MicroBatchingVectorizer(inner, max_batch_size=4, max_wait_ms=20)
+
+    results = _call_concurrently(vectorizer, [f"t{i}" for i in range(20)])
+
+    assert all(r == [2.0] or r == [3.0] for r in results)
+    assert max(len(call) for call in inner.calls) <= 4
+
+
+def test_max_wait_collects_sequential_calls():
+    """
+    Case 3: With max_wait_ms, calls arriving shortly after the first one join its batch
+    """
+    inner = SlowVectorizer(call_cost_sec=0.0)
+    vectorizer = MicroBatchingVectorizer(inner, max_batch_size=64, max_wait_ms=200)
+    results = {}
+
+    def call(text):
+        results[text] = vectorizer.embed(text)
+
+    first = threading.Thread(target=call, args=("a",))
+    first.start()
+    time.sleep(0.02)
+    second = threading.Thread(target=call, args=("bb",))
+    second.start()
+    first.join()
+    second.join()
+
+    assert results == {"a": [1.0], "bb": [2.0]}
+    assert inner.calls == [["a", "bb"]]
+
+
+def test_large_batches_bypass_the_queue():
+    """
+    Case 4: embed_batch() with max_batch_size texts or more goes straight to the model
+    """
+    inner = SlowVectorizer(call_cost_sec=0.0)
+    vectorizer = MicroBatchingVectorizer(inner, max_batch_size=2)
+
+    assert vectorizer.embed_batch(["a", "bb", "ccc"]) == [[1.0], [2.0], [3.0]]
+    assert vectorizer._worker is None
+    assert inner.calls == [["a", "bb", "ccc"]]
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    """
+    Case 5: A failing batched call raises in every caller that was part of it
+    """
+    vectorizer = MicroBatchingVectorizer(SlowVectorizer(call_cost_sec=0.0, fail=True), max_wait_ms=50)
+    errors = []
+
+    def call(text):
+        try:
+            vectorizer.embed(text)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call, args=(t,)) for t in ["a", "b", "c"]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == ["model crashed"] * 3
+
+
+@pytest.mark.asyncio
+async def test_async_front_end_coalesces_without_blocking_the_loop():
+    """
+    Case 6: aembed() calls gathered on one event loop are embedded together
+    """
+    inner = SlowVectorizer(call_cost_sec=0.0)
+    vectorizer = MicroBatchingVectorizer(inner, max_batch_size=64, max_wait_ms=50)
+
+    results = await asyncio.gather(*(vectorizer.aembed("x" * i) for i in range(1, 11)))
+
+    assert results == [[float(i)] for i in range(1, 11)]
+    assert len(inner.calls) == 1
+
+
+def test_list_and_numpy_callers_share_a_batch():
+    """
+    Case 7: Concurrent embed() and embed_numpy() callers are served by the
+    same batched call, each in the form it asked for
+    """
+    np = pytest.importorskip("numpy")
+    inner = SlowVectorizer()
+    vectorizer = MicroBatchingVectorizer(inner, max_batch_size=64, max_wait_ms=50)
+    results = {}
+    barrier = threading.Barrier(2)
+
+    def call(name, embed, text):
+        barrier.wait()
+        results[name] = embed(text)
+
+    threads = [
+        threading.Thread(target=call, args=("list", vectorizer.embed, "ab")),
+        threading.Thread(target=call, args=("numpy", vectorizer.embed_numpy, "abc")),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results["list"] == [2.0]
+    assert isinstance(results["numpy"], np.ndarray) and results["numpy"].tolist() == [3.0]
+    assert len(inner.calls) == 1
+
+
+def test_callers_fall_back_when_the_dispatcher_dies(monkeypatch):
+    """
+    Case 8: If the dispatcher thread dies, waiting callers embed their texts
+    themselves, and the next call starts a new dispatcher
+    """
+    monkeypatch.setattr("vectorwave.vectorizer.batching._LIVENESS_CHECK_SEC", 0.01)
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+    inner = SlowVectorizer(call_cost_sec=0.0)
+    vectorizer = MicroBatchingVectorizer(inner)
+
+    def crash(batch):
+        raise SystemExit("dispatcher crashed")
+
+    monkeypatch.setattr(vectorizer, "_dispatch", crash)
+    assert vectorizer.embed("abc") == [3.0]
+
+    monkeypatch.undo()
+    assert vectorizer.embed("abcd") == [4.0]
+    assert vectorizer._worker.is_alive()
+
+
+def test_callers_fall_back_when_a_batch_stalls(monkeypatch):
+    """
+    Case 9: A call whose batch does not finish within timeout_sec embeds its
+    texts directly instead of hanging
+    """
+    inner = SlowVectorizer(call_cost_sec=0.0)
+    vectorizer = MicroBatchingVectorizer(inner, timeout_sec=0.1)
+    stall = threading.Event()
+    monkeypatch.setattr(vectorizer, "_dispatch", lambda batch: stall.wait())
+
+    started = time.monotonic()
+    try:
+        assert vectorizer.embed("abc") == [3.0]
+    finally:
+        stall.set()
+    assert time.monotonic() - started < 2.0
+    assert inner.calls == [["abc"]]
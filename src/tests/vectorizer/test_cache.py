@@ -0,0 +1,137 @@
+import pytest
+from typing import List
+from unittest.mock import MagicMock
+
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.vectorizer.base import BaseVectorizer
+from vectorwave.vectorizer.batching import MicroBatchingVectorizer
+from vectorwave.vectorizer.cache import CachingVectorizer, SqliteEmbeddingStore, _text_key
+from vectorwave.vectorizer.factory import get_vectorizer
+
+
+class CountingVectorizer(BaseVectorizer):
+    """Deterministic fake model that records every text it embeds."""
+
+    def __init__(self, model_name: str = "fake-model"):
+        self.model_name = model_name
+        self.embedded: List[str] = []
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+
+def test_memory_cache_skips_repeated_texts():
+    """
+    Case 1: Repeated texts (single and batch) are only embedded once
+    """
+    inner = CountingVectorizer()
+    vectorizer = CachingVectorizer(inner, max_entries=10)
+
+    assert vectorizer.embed("hello") == [5.0, 0.5, -1.0]
+    assert vectorizer.embed("hello") == [5.0, 0.5, -1.0]
+    assert vectorizer.embed_batch(["hello", "hi", "hi"]) == [[5.0, 0.5, -1.0], [2.0, 0.5, -1.0], [2.0, 0.5, -1.0]]
+
+    assert inner.embedded == ["hello", "hi"]
+    assert vectorizer.hits == 3
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """
+    Case 2: Past max_entries the least recently used vector is dropped
+    """
+    inner = CountingVectorizer()
+    vectorizer = CachingVectorizer(inner, max_entries=2)
+
+    vectorizer.embed("a")
+    vectorizer.embed("b")
+    vectorizer.embed("a")   # "b" is now the oldest
+    vectorizer.embed("c")   # evicts "b"
+    vectorizer.embed("a")
+    vectorizer.embed("b")
+
+    assert inner.embedded == ["a", "b", "c", "b"]
+
+
+def test_sqlite_store_survives_restart_and_is_keyed_by_model(tmp_path):
+    """
+    Case 3: Vectors written to the SQLite store are found by a new process
+    (new CachingVectorizer) using the same model, never by another model
+    """
+    path = str(tmp_path / "embeddings.sqlite")
+
+    first = CountingVectorizer()
+    CachingVectorizer(first, store=SqliteEmbeddingStore(path)).embed_batch(["alpha", "beta"])
+
+    restarted = CountingVectorizer()
+    cached = CachingVectorizer(restarted, store=SqliteEmbeddingStore(path))
+    assert cached.embed_batch(["beta", "alpha", "gamma"]) == [
+        [4.0, 0.5, -1.0], [5.0, 0.5, -1.0], [5.0, 0.5, -1.0]
+    ]
+    assert restarted.embedded == ["gamma"]
+
+    other_model = CountingVectorizer(model_name="other-model")
+    CachingVectorizer(other_model, store=SqliteEmbeddingStore(path)).embed("alpha")
+    assert other_model.embedded == ["alpha"]
+
+
+def test_sqlite_store_evicts_past_max_entries(tmp_path):
+    """
+    Case 4: The on-disk store is trimmed to max_entries, oldest first
+    """
+    store = SqliteEmbeddingStore(str(tmp_path / "embeddings.sqlite"), max_entries=3)
+    vectorizer = CachingVectorizer(CountingVectorizer(), max_entries=1, store=store)
+
+    for text in ["one", "two", "three", "four", "five"]:
+        vectorizer.embed(text)
+
+    assert len(store) == 3
+    remaining = store.get_many("fake-model", [_text_key(t) for t in ["one", "two", "three", "four", "five"]])
+    assert set(remaining) == {_text_key(t) for t in ["three", "four", "five"]}
+
+
+def test_get_vectorizer_wraps_python_vectorizers(monkeypatch, tmp_path):
+    """
+    Case 5: get_vectorizer() wraps the configured vectorizer in the cache
+    (in front of the micro-batching dispatcher), and returns it unwrapped when
+    EMBEDDING_CACHE_SIZE is 0 and EMBED_BATCH_MAX_SIZE is 1
+    """
+    settings = WeaviateSettings(VECTORIZER="huggingface", EMBEDDING_CACHE_DB_PATH=str(tmp_path / "e.sqlite"))
+    monkeypatch.setattr("vectorwave.vectorizer.factory.get_weaviate_settings", MagicMock(return_value=settings))
+    monkeypatch.setattr("vectorwave.vectorizer.huggingface_vectorizer.HuggingFaceVectorizer", lambda model_name, **kwargs: CountingVectorizer(model_name))
+
+    get_vectorizer.cache_clear()
+    try:
+        vectorizer = get_vectorizer()
+        assert isinstance(vectorizer, CachingVectorizer)
+        assert vectorizer.model_name == settings.HF_MODEL_NAME
+        assert vectorizer.store is not None
+        assert isinstance(vectorizer.vectorizer, MicroBatchingVectorizer)
+
+        settings.EMBEDDING_CACHE_SIZE = 0
+        settings.EMBED_BATCH_MAX_SIZE = 1
+        get_vectorizer.cache_clear()
+        assert isinstance(get_vectorizer(), CountingVectorizer)
+    finally:
+        get_vectorizer.cache_clear()
+
+
+def test_numpy_path_mixes_cached_and_new_vectors():
+    """
+    Case 6: embed_batch_numpy() returns one float32 array built from cached
+    rows and freshly embedded ones, in input order
+    """
+    np = pytest.importorskip("numpy")
+    inner = CountingVectorizer()
+    vectorizer = CachingVectorizer(inner, max_entries=10)
+    vectorizer.embed("hello")
+
+    rows = vectorizer.embed_batch_numpy(["hi", "hello", "hi"])
+
+    assert rows.dtype == np.float32
+    assert rows.tolist() == [[2.0, 0.5, -1.0], [5.0, 0.5, -1.0], [2.0, 0.5, -1.0]]
+    assert inner.embedded == ["hello", "hi"]
+    assert vectorizer.embed_numpy("hi").tolist() == [2.0, 0.5, -1.0]
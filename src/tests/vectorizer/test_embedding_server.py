@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.vectorizer.base import BaseVectorizer
+from vectorwave.vectorizer.batching import MicroBatchingVectorizer
+from vectorwave.vectorizer.factory import get_vectorizer
+from vectorwave.vectorizer.remote_vectorizer import RemoteVectorizer, encode_vectors, decode_vectors
+from vectorwave.vectorizer.server import EmbeddingServer
+
+
+class FakeModel(BaseVectorizer):
+    """Serialized fake model; texts starting with '!' make the call fail."""
+
+    def __init__(self, call_cost_sec: float = 0.0):
+        self.model_name = "fake-model"
+        self.call_cost_sec = call_cost_sec
+        self.calls: List[List[str]] = []
+        self._device = threading.Lock()
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        with self._device:
+            self.calls.append(list(texts))
+            time.sleep(self.call_cost_sec)
+            if any(t.startswith("!") for t in texts):
+                raise RuntimeError("bad input")
+            return [[float(len(t)), 0.5, -2.0] for t in texts]
+
+
+@pytest.fixture
+def embedding_server(tmp_path):
+    model = FakeModel(call_cost_sec=0.01)
+    server = EmbeddingServer(str(tmp_path / "embed.sock"), MicroBatchingVectorizer(model)).start()
+    yield server, model
+    server.shutdown()
+
+
+def test_vector_encoding_round_trip():
+    """
+    Case 1: Vectors survive the float32 wire encoding
+    """
+    vectors = [[1.0, 0.5, -0.25], [3.0, 0.0, 8.0]]
+    assert decode_vectors(encode_vectors(vectors)) == vectors
+    assert decode_vectors(encode_vectors([])) == []
+
+
+def test_remote_vectorizer_round_trip(embedding_server):
+    """
+    Case 2: RemoteVectorizer returns the server model's vectors in order
+    """
+    server, model = embedding_server
+    client = RemoteVectorizer(server.socket_path)
+
+    assert client.embed("abc") == [3.0, 0.5, -2.0]
+    assert client.embed_batch(["a", "bb"]) == [[1.0, 0.5, -2.0], [2.0, 0.5, -2.0]]
+    assert model.calls == [["abc"], ["a", "bb"]]
+
+
+def test_concurrent_clients_share_batches(embedding_server):
+    """
+    Case 3: Requests from many client connections are batched by the server
+    """
+    server, model = embedding_server
+    client = RemoteVectorizer(server.socket_path)
+    results = {}
+
+    def call(i):
+        results[i] = client.embed("x" * i)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 25)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: [float(i), 0.5, -2.0] for i in range(1, 25)}
+    assert len(model.calls) < 24
+
+
+def test_server_errors_are_raised_and_connection_reused(embedding_server):
+    """
+    Case 4: A failed embedding raises RuntimeError on the client and the
+    connection keeps working
+    """
+    server, _ = embedding_server
+    client = RemoteVectorizer(server.socket_path)
+
+    with pytest.raises(RuntimeError, match="bad input"):
+        client.embed("!boom")
+    assert client.embed("ok") == [2.0, 0.5, -2.0]
+
+
+def test_client_reconnects_after_server_restart(tmp_path):
+    """
+    Case 5: After the server restarts, the next call reconnects; with no
+    server at all a ConnectionError is raised
+    """
+    path = str(tmp_path / "embed.sock")
+    client = RemoteVectorizer(path, timeout=2.0)
+
+    server = EmbeddingServer(path, FakeModel()).start()
+    assert client.embed("a") == [1.0, 0.5, -2.0]
+    server.shutdown()
+
+    with pytest.raises(ConnectionError):
+        client.embed("a")
+
+    server = EmbeddingServer(path, FakeModel()).start()
+    try:
+        assert client.embed("abcd") == [4.0, 0.5, -2.0]
+    finally:
+        server.shutdown()
+
+
+def test_get_vectorizer_selects_embedding_server(monkeypatch, tmp_path):
+    """
+    Case 6: VECTORIZER=embedding_server builds a RemoteVectorizer (behind the
+    cache and batching wrappers) keyed by HF_MODEL_NAME; without a socket
+    path the vectorizer is disabled
+    """
+    settings = WeaviateSettings(
+        VECTORIZER="embedding_server", EMBEDDING_SERVER_SOCKET_PATH=str(tmp_path / "embed.sock"),
+        HF_MODEL_NAME="fake-model"
+    )
+    monkeypatch.setattr("vectorwave.vectorizer.factory.get_weaviate_settings", MagicMock(return_value=settings))
+
+    get_vectorizer.cache_clear()
+    try:
+        vectorizer = get_vectorizer()
+        remote = vectorizer.vectorizer.vectorizer
+        assert isinstance(remote, RemoteVectorizer)
+        assert remote.socket_path == settings.EMBEDDING_SERVER_SOCKET_PATH
+        assert vectorizer.model_name == "fake-model"
+        assert vectorizer.fork_safe is False
+
+        settings.EMBEDDING_SERVER_SOCKET_PATH = None
+        get_vectorizer.cache_clear()
+        assert get_vectorizer() is None
+    finally:
+        get_vectorizer.cache_clear()
+
+
+def test_remote_vectorizer_numpy_round_trip(embedding_server):
+    """
+    Case 7: embed_batch_numpy() gets the wire buffer back as a float32 array
+    """
+    np = pytest.importorskip("numpy")
+    server, _ = embedding_server
+    client = RemoteVectorizer(server.socket_path)
+
+    rows = client.embed_batch_numpy(["a", "bb"])
+
+    assert rows.dtype == np.float32 and rows.shape == (2, 3)
+    assert rows.tolist() == [[1.0, 0.5, -2.0], [2.0, 0.5, -2.0]]
+    assert decode_vectors(encode_vectors(rows)) == rows.tolist()
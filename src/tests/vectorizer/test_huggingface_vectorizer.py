@@ -0,0 +1,164 @@
+import sys
+import threading
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.vectorizer.factory import get_vectorizer, warm_up_vectorizer
+from vectorwave.vectorizer.huggingface_vectorizer import HuggingFaceVectorizer
+
+
+class _Array(list):
+    """Minimal stand-in for the numpy arrays encode() returns."""
+
+    def tolist(self):
+        return [v.tolist() if isinstance(v, _Array) else v for v in self]
+
+
+class FakeSentenceTransformer:
+    """Stands in for sentence_transformers.SentenceTransformer; loading blocks on `release`."""
+
+    release = threading.Event()
+    fail = False
+    instances = []
+
+    def __init__(self, model_name, device=None, **kwargs):
+        self.release.wait(5)
+        if self.fail:
+            raise OSError("model files not found")
+        self.model_name = model_name
+        self.kwargs = kwargs
+        self.encoded = []
+        FakeSentenceTransformer.instances.append(self)
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.encoded.append(list(texts))
+        return _Array(_Array([float(len(t)), 1.0]) for t in texts)
+
+
+@pytest.fixture
+def fake_sentence_transformers(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+
+    FakeSentenceTransformer.release = threading.Event()
+    FakeSentenceTransformer.fail = False
+    FakeSentenceTransformer.instances = []
+    yield FakeSentenceTransformer
+    FakeSentenceTransformer.release.set()
+
+
+def test_background_load_does_not_block_the_constructor(fake_sentence_transformers):
+    """
+    Case 1: With background=True the constructor returns before the model is
+    loaded, and embed() waits for it; the warm-up encode runs first
+    """
+    vectorizer = HuggingFaceVectorizer("fake-model", background=True)
+    assert vectorizer.wait_until_ready(timeout=0.05) is False
+    assert vectorizer.load_time is None
+
+    fake_sentence_transformers.release.set()
+    assert vectorizer.embed("abc") == [3.0, 1.0]
+
+    model = fake_sentence_transformers.instances[0]
+    assert model.encoded == [["warm-up"], ["abc"]]
+    assert vectorizer.load_time is not None and vectorizer.load_time >= 0
+
+
+def test_foreground_load_is_synchronous(fake_sentence_transformers):
+    """
+    Case 2: Without background loading the model is ready when the constructor returns
+    """
+    fake_sentence_transformers.release.set()
+    vectorizer = HuggingFaceVectorizer("fake-model")
+
+    assert vectorizer.wait_until_ready(timeout=0) is True
+    assert vectorizer.embed_batch(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+
+
+def test_background_load_failure_is_raised_on_use(fake_sentence_transformers):
+    """
+    Case 3: A model that fails to load in the background raises when it is used
+    """
+    fake_sentence_transformers.fail = True
+    fake_sentence_transformers.release.set()
+    vectorizer = HuggingFaceVectorizer("missing-model", background=True)
+
+    assert vectorizer.wait_until_ready(timeout=5) is True
+    with pytest.raises(RuntimeError, match="failed to load"):
+        vectorizer.embed("abc")
+
+
+def test_missing_library_fails_fast(monkeypatch):
+    """
+    Case 4: Without sentence-transformers installed the constructor raises ImportError at once
+    """
+    monkeypatch.delitem(sys.modules, "sentence_transformers", raising=False)
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+
+    with pytest.raises(ImportError, match="sentence-transformers"):
+        HuggingFaceVectorizer("fake-model", background=True)
+
+
+def test_warm_up_vectorizer_waits_for_the_model(fake_sentence_transformers, monkeypatch):
+    """
+    Case 5: warm_up_vectorizer(wait=True) creates the configured vectorizer
+    and returns once the model is ready
+    """
+    settings = WeaviateSettings(VECTORIZER="huggingface", HF_MODEL_NAME="fake-model")
+    monkeypatch.setattr("vectorwave.vectorizer.factory.get_weaviate_settings", MagicMock(return_value=settings))
+    fake_sentence_transformers.release.set()
+
+    get_vectorizer.cache_clear()
+    try:
+        vectorizer = warm_up_vectorizer(wait=True, timeout=5)
+        assert vectorizer is get_vectorizer()
+        assert vectorizer.wait_until_ready(timeout=0) is True
+        assert fake_sentence_transformers.instances[0].encoded == [["warm-up"]]
+    finally:
+        get_vectorizer.cache_clear()
+
+
+def test_onnx_backend_loads_through_onnx_runtime(fake_sentence_transformers):
+    """
+    Case 6: HF_BACKEND=onnx asks sentence-transformers for its ONNX backend,
+    with the chosen (e.g. quantized) ONNX file
+    """
+    fake_sentence_transformers.release.set()
+    vectorizer = HuggingFaceVectorizer("fake-model", backend="onnx", onnx_file_name="onnx/model_qint8_avx2.onnx")
+
+    assert vectorizer.embed("ab") == [2.0, 1.0]
+    assert fake_sentence_transformers.instances[0].kwargs == {
+        "backend": "onnx", "model_kwargs": {"file_name": "onnx/model_qint8_avx2.onnx"}
+    }
+
+
+def test_torch_int8_backend_quantizes_linear_layers(fake_sentence_transformers, monkeypatch):
+    """
+    Case 7: HF_BACKEND=torch_int8 applies torch dynamic int8 quantization to the Linear layers
+    """
+    torch = types.ModuleType("torch")
+    torch.nn = types.SimpleNamespace(Linear=object())
+    torch.qint8 = "qint8"
+    quantize_dynamic = MagicMock(side_effect=lambda model, layers, dtype: model)
+    torch.quantization = types.SimpleNamespace(quantize_dynamic=quantize_dynamic)
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    fake_sentence_transformers.release.set()
+
+    vectorizer = HuggingFaceVectorizer("fake-model", backend="torch_int8")
+
+    assert vectorizer.embed("abc") == [3.0, 1.0]
+    model = fake_sentence_transformers.instances[0]
+    quantize_dynamic.assert_called_once_with(model, {torch.nn.Linear}, dtype="qint8")
+
+
+def test_unknown_backend_is_rejected(fake_sentence_transformers):
+    """
+    Case 8: An unknown backend raises ValueError before anything is loaded
+    """
+    with pytest.raises(ValueError, match="Unknown HuggingFace backend"):
+        HuggingFaceVectorizer("fake-model", backend="tensorrt", background=True)
+    assert fake_sentence_transformers.instances == []
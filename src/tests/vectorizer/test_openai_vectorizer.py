@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("openai")
+
+from vectorwave.vectorizer.openai_vectorizer import OpenAIVectorizer, chunk_texts, estimate_tokens
+
+
+class StubEmbeddingsAPI(ThreadingHTTPServer):
+    """
+    Local stand-in for POST /v1/embeddings. Each vector is [len(text), request number].
+    The first `fail_first` requests get `fail_status`; data is returned in
+    reverse order to check the client sorts by index.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0, fail_first: int = 0, fail_status: int = 429, retry_after: str = None):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.delay = delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(body["input"])
+            number = len(server.requests)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            if number <= server.fail_first:
+                self._reply(server.fail_status, {"error": {"message": "slow down", "type": "rate_limit"}})
+                return
+            data = [
+                {"object": "embedding", "index": i, "embedding": [float(len(text)), float(number)]}
+                for i, text in enumerate(body["input"])
+            ]
+            self._reply(200, {"object": "list", "data": list(reversed(data)), "model": body["model"],
+                              "usage": {"prompt_tokens": 1, "total_tokens": 1}})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, status, payload):
+        encoded = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        if status == 429 and self.server.retry_after:
+            self.send_header("Retry-After", self.server.retry_after)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+@pytest.fixture
+def stub_api(request):
+    server = StubEmbeddingsAPI(**getattr(request, "param", {}))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(stub_api, **kwargs):
+    return OpenAIVectorizer(api_key="test-key", base_url=stub_api.base_url, backoff_base=0.01, **kwargs)
+
+
+def test_chunking_by_count_and_token_budget():
+    """
+    Case 1: Texts are chunked in order by input count and estimated tokens;
+    an oversized text gets a chunk of its own
+    """
+    assert chunk_texts(["a", "b", "c", "d", "e"], max_inputs=2, max_tokens=1000) == [["a", "b"], ["c", "d"], ["e"]]
+
+    long_text = "x" * 300
+    budget = estimate_tokens("short") * 2
+    assert chunk_texts(["short", "short", "short", long_text, "short"], max_inputs=100, max_tokens=budget) == [
+        ["short", "short"], ["short"], [long_text], ["short"]
+    ]
+
+
+def test_large_inputs_are_split_and_keep_their_order(stub_api):
+    """
+    Case 2: A large input becomes several requests whose vectors come back in input order
+    """
+    client = _client(stub_api, max_batch_size=3)
+    texts = ["x" * i for i in range(1, 11)]
+
+    vectors = client.embed_batch(texts)
+
+    assert [v[0] for v in vectors] == [float(i) for i in range(1, 11)]
+    assert sorted(len(r) for r in stub_api.requests) == [1, 3, 3, 3]
+
+
+@pytest.mark.parametrize("stub_api", [{"delay": 0.1}], indirect=True)
+def test_requests_run_concurrently_up_to_the_limit(stub_api):
+    """
+    Case 3: Chunks are sent in parallel, never more than max_concurrency at once
+    """
+    client = _client(stub_api, max_batch_size=1, max_concurrency=3)
+
+    start = time.perf_counter()
+    vectors = client.embed_batch([f"t{i}" for i in range(6)])
+    elapsed = time.perf_counter() - start
+
+    assert len(vectors) == 6
+    assert stub_api.max_in_flight == 3
+    assert elapsed < 0.5
+
+
+@pytest.mark.parametrize("stub_api", [{"fail_first": 2, "retry_after": "0"}], indirect=True)
+def test_rate_limited_requests_are_retried(stub_api):
+    """
+    Case 4: 429 responses are retried with backoff until the request succeeds
+    """
+    client = _client(stub_api, max_retries=3)
+
+    assert client.embed("abc") == [3.0, 3.0]
+    assert len(stub_api.requests) == 3
+
+
+@pytest.mark.parametrize("stub_api", [{"fail_first": 10, "fail_status": 500}], indirect=True)
+def test_retries_are_bounded(stub_api):
+    """
+    Case 5: After max_retries failed retries the error is raised
+    """
+    import openai
+
+    client = _client(stub_api, max_retries=2)
+
+    with pytest.raises(openai.InternalServerError):
+        client.embed("abc")
+    assert len(stub_api.requests) == 3
+
+
+@pytest.mark.parametrize("stub_api", [{"fail_first": 1, "fail_status": 400}], indirect=True)
+def test_client_errors_are_not_retried(stub_api):
+    """
+    Case 6: A bad request (400) fails at once
+    """
+    import openai
+
+    client = _client(stub_api, max_retries=3)
+
+    with pytest.raises(openai.BadRequestError):
+        client.embed("abc")
+    assert len(stub_api.requests) == 1
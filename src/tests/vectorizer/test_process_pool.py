@@ -0,0 +1,81 @@
+import os
+from functools import partial
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from vectorwave.models.db_config import WeaviateSettings
+from vectorwave.vectorizer.base import BaseVectorizer
+from vectorwave.vectorizer.factory import create_encode_pool
+from vectorwave.vectorizer.process_pool import ProcessPoolVectorizer
+
+
+class PidVectorizer(BaseVectorizer):
+    """Built inside each pool process; tags vectors with the process and its thread limit."""
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        threads = float(os.environ.get("OMP_NUM_THREADS", "0"))
+        return [[len(t) * self.scale, float(os.getpid()), threads] for t in texts]
+
+
+def test_pool_splits_batches_and_preserves_order():
+    """
+    Case 1: A large batch is split into chunks over several processes and the
+    vectors come back in input order
+    """
+    texts = ["x" * i for i in range(1, 41)]
+    with ProcessPoolVectorizer(partial(PidVectorizer, 2.0), workers=2, chunk_size=5,
+                               threads_per_worker=3) as pool:
+        vectors = pool.embed_batch(texts)
+
+    assert [v[0] for v in vectors] == [2.0 * i for i in range(1, 41)]
+    assert os.getpid() not in {v[1] for v in vectors}
+    assert {v[2] for v in vectors} == {3.0}
+    assert pool._executor is None
+
+
+def test_pool_reports_worker_errors():
+    """
+    Case 2: A factory that fails in the workers surfaces as an error on the caller
+    """
+    with ProcessPoolVectorizer(partial(int, "not a number"), workers=2, chunk_size=1) as pool:
+        with pytest.raises(Exception):
+            pool.embed_batch(["a", "b"])
+
+
+def test_create_encode_pool_only_for_local_models(monkeypatch):
+    """
+    Case 3: create_encode_pool() builds a pool for the HuggingFace model and
+    returns None for a single worker or a remote vectorizer
+    """
+    settings = WeaviateSettings(VECTORIZER="huggingface", HF_MODEL_NAME="fake-model", HF_POOL_WORKERS=4)
+    monkeypatch.setattr("vectorwave.vectorizer.factory.get_weaviate_settings", MagicMock(return_value=settings))
+
+    pool = create_encode_pool()
+    assert isinstance(pool, ProcessPoolVectorizer)
+    assert (pool.workers, pool.chunk_size, pool.model_name) == (4, 256, "fake-model")
+    assert pool.vectorizer_factory.args == ("fake-model",)
+
+    assert create_encode_pool(workers=1) is None
+    settings.VECTORIZER = "openai_client"
+    assert create_encode_pool() is None
+
+
+def test_pool_numpy_path_stacks_worker_arrays():
+    """
+    Case 4: embed_batch_numpy() stacks the workers' float32 arrays in input order
+    """
+    np = pytest.importorskip("numpy")
+    texts = ["x" * i for i in range(1, 13)]
+    with ProcessPoolVectorizer(partial(PidVectorizer, 1.0), workers=2, chunk_size=5) as pool:
+        rows = pool.embed_batch_numpy(texts)
+
+    assert rows.dtype == np.float32 and rows.shape == (12, 3)
+    assert rows[:, 0].tolist() == [float(i) for i in range(1, 13)]
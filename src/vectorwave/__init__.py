@@ -1,13 +1,60 @@
-from .core.decorator import vectorize
+import importlib
+from typing import TYPE_CHECKING
 
-from .database.db import initialize_database
-from .database.db_search import search_functions, search_executions
-from .monitoring.tracer import trace_span
+# The public API is imported on first attribute access (PEP 562), so
+# 'import vectorwave' does not load the Weaviate client or any vectorizer
+# library until they are used.
+_LAZY_ATTRIBUTES = {
+    'vectorize': '.core.decorator',
+    'flush_registrations': '.core.registry',
+    'flush': '.batch.batch',
+    'aflush': '.batch.async_batch',
+    'initialize_database': '.database.db',
+    'search_functions': '.database.db_search',
+    'search_executions': '.database.db_search',
+    'trace_span': '.monitoring.tracer',
+    'warm_up_vectorizer': '.vectorizer.factory',
+    'set_tracing_enabled': '.monitoring.switch',
+    'is_tracing_enabled': '.monitoring.switch',
+}
+
+if TYPE_CHECKING:
+    from .core.decorator import vectorize
+    from .core.registry import flush_registrations
+
+    from .batch.batch import flush
+    from .batch.async_batch import aflush
+
+    from .database.db import initialize_database
+    from .database.db_search import search_functions, search_executions
+    from .monitoring.tracer import trace_span
+    from .vectorizer.factory import warm_up_vectorizer
+    from .monitoring.switch import set_tracing_enabled, is_tracing_enabled
 
 __all__ = [
     'vectorize',
     'initialize_database',
     'search_functions',
     'search_executions',
-    'trace_span'
-]
\ No newline at end of file
+    'trace_span',
+    'flush',
+    'aflush',
+    'set_tracing_enabled',
+    'is_tracing_enabled',
+    'flush_registrations',
+    'warm_up_vectorizer'
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache it so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
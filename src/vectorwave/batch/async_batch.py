@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import os
+import weaviate
+from collections import Counter
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple
+from weaviate.classes.data import DataObject
+from ..models.db_config import get_weaviate_settings, WeaviateSettings
+from ..database.db import get_weaviate_async_client
+from .batch import get_batch_manager
+from .circuit_breaker import CircuitBreaker
+from ..utils.backoff import backoff_delay
+from .dead_letter import DeadLetter, DeadLetterQueue, classify_error
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncWeaviateBatchManager:
+    """
+    asyncio-native counterpart of WeaviateBatchManager.
+
+    add_object() puts the object on an asyncio.Queue without awaiting anything.
+    A background task on the running event loop connects a WeaviateAsyncClient
+    lazily and bulk-inserts the queue when BATCH_SIZE objects are waiting or
+    every BATCH_FLUSH_INTERVAL_SEC seconds. Await flush() (or vectorwave.aflush())
+    on shutdown to write whatever is still queued.
+
+    Connects and writes go through a CircuitBreaker, failed bulk inserts are
+    retried with jittered exponential backoff, and permanently rejected
+    objects are dead-lettered, as in WeaviateBatchManager. Objects that cannot
+    be written go to the thread manager's spool when SPOOL_DIR is set, or
+    stay queued until Weaviate is reachable again.
+
+    The queue, task and client are bound to the loop that first used them; if a
+    different loop shows up (e.g. a new asyncio.run()), they are rebuilt for it
+    and the objects still queued are moved over. Calls from threads without a
+    running loop (e.g. a sync function run via asyncio.to_thread) are handed to
+    the bound loop, or to the thread-based batch manager when none is running.
+    """
+
+    def __init__(self):
+        self.settings: WeaviateSettings = get_weaviate_settings()
+        self.batch_size = max(1, self.settings.BATCH_SIZE)
+        self.flush_interval = self.settings.BATCH_FLUSH_INTERVAL_SEC
+        self.max_queue_size = max(0, self.settings.BATCH_MAX_QUEUE_SIZE)
+        self.max_retries = max(0, self.settings.WRITE_MAX_RETRIES)
+        self.backoff_base = self.settings.WRITE_BACKOFF_BASE_SEC
+        self.backoff_max = self.settings.WRITE_BACKOFF_MAX_SEC
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.settings.CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=self.settings.CIRCUIT_RECOVERY_TIMEOUT_SEC
+        )
+
+        self.client: Optional[weaviate.WeaviateAsyncClient] = None
+        self.dropped_count = 0
+        self.dead_letters = DeadLetterQueue(max_size=self.settings.DEAD_LETTER_MAX_SIZE)
+        self.failure_counts: Counter = Counter()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add_object(self, collection: str, properties: dict, uuid: str = None, vector: Optional[List[float]] = None):
+        """
+        Adds an object to the asyncio export queue; never awaits.
+        Safe to call from any thread (see the class docstring).
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            bound_loop = self._loop
+            if bound_loop is not None and bound_loop.is_running():
+                item = (collection, DataObject(properties=properties, uuid=uuid, vector=vector))
+                bound_loop.call_soon_threadsafe(self._enqueue, item)
+            else:
+                get_batch_manager().add_object(collection, properties, uuid=uuid, vector=vector)
+            return
+
+        self._bind_to_running_loop()
+        self._enqueue((collection, DataObject(properties=properties, uuid=uuid, vector=vector)))
+
+    async def flush(self):
+        """
+        Writes every queued object to Weaviate, in bulk inserts of at most
+        BATCH_SIZE objects per collection. Objects that cannot be written are
+        spooled or requeued (see _keep_unwritten).
+        """
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        async with self._write_lock:
+            pending = self._drain()
+            if not pending:
+                return
+
+            grouped: Dict[str, List[DataObject]] = {}
+            for collection, data_object in pending:
+                grouped.setdefault(collection, []).append(data_object)
+
+            client = await self._get_client()
+            for collection, objects in grouped.items():
+                for start in range(0, len(objects), self.batch_size):
+                    chunk = objects[start:start + self.batch_size]
+                    if client is None or not await self._write_batch(client, collection, chunk):
+                        await self._keep_unwritten(collection, chunk)
+
+    async def aclose(self):
+        """
+        Stops the background task, flushes the queue and closes the async client.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+        if self._queue is not None and self._loop is asyncio.get_running_loop() and not self._queue.empty():
+            discarded = len(self._drain())
+            self.dropped_count += discarded
+            logger.error("Weaviate unreachable at shutdown, discarded %d queued async objects", discarded)
+
+        if self.client is not None:
+            try:
+                await self.client.close()
+            except Exception as e:
+                logger.warning("Failed to close async Weaviate client: %s", e)
+            self.client = None
+
+    def _enqueue(self, item: Tuple[str, DataObject]):
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._record_drop(item[0])
+            return
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wake_event.set()
+
+    def _bind_to_running_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        pending = self._drain() if self._queue is not None else []
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._wake_event = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        # The previous client belongs to the old loop and cannot be reused
+        self.client = None
+        self._task = loop.create_task(self._run())
+
+        if pending:
+            logger.info("Event loop changed, moving %d queued objects to the new loop", len(pending))
+            for item in pending:
+                self._enqueue(item)
+
+    def _drain(self) -> List[Tuple[str, DataObject]]:
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return pending
+
+    def _record_drop(self, collection: str):
+        self.dropped_count += 1
+        if self.dropped_count == 1 or self.dropped_count % 1000 == 0:
+            logger.warning(
+                "Async batch queue is full (max %d), dropped object for '%s' (%d dropped so far)",
+                self.max_queue_size, collection, self.dropped_count
+            )
+
+    async def _get_client(self) -> Optional[weaviate.WeaviateAsyncClient]:
+        if self.client is None:
+            # No connect attempt while the circuit is open
+            if not self.breaker.allow_request():
+                return None
+            try:
+                self.client = await get_weaviate_async_client(self.settings)
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.warning("Failed to connect async Weaviate client: %s", e)
+                return None
+            self.breaker.record_success()
+        return self.client
+
+    async def _keep_unwritten(self, collection: str, objects: List[DataObject]):
+        """
+        Objects that were not written go to the thread manager's spool when
+        one is configured (its worker replays them), or back on this queue
+        (subject to its size limit) for the next flush.
+        """
+        if self.settings.SPOOL_DIR:
+            # Building the thread manager and writing the spool both block
+            manager = await asyncio.to_thread(get_batch_manager)
+            if manager.spool is not None:
+                await asyncio.to_thread(manager.spool.append_many, [(collection, o) for o in objects])
+                return
+        for data_object in objects:
+            try:
+                self._queue.put_nowait((collection, data_object))
+            except asyncio.QueueFull:
+                self._record_drop(collection)
+
+    async def _write_batch(self, client: weaviate.WeaviateAsyncClient, collection: str,
+                           objects: List[DataObject]) -> bool:
+        """
+        Bulk-inserts objects into one collection with the retry, circuit
+        breaker and dead-letter rules of WeaviateBatchManager._write_batch.
+        Returns False when nothing was written.
+        """
+        remaining = objects
+        last_errors: Dict[int, Tuple[str, str]] = {}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(backoff_delay(attempt - 1, self.backoff_base, self.backoff_max))
+
+            if not self.breaker.allow_request():
+                break
+
+            try:
+                result = await client.collections.get(collection).data.insert_many(remaining)
+            except Exception as e:
+                self.breaker.record_failure()
+                self.failure_counts[type(e).__name__] += len(remaining)
+                logger.error(
+                    "Failed to async bulk insert %d objects (collection '%s', attempt %d/%d): %s",
+                    len(remaining), collection, attempt + 1, self.max_retries + 1, e
+                )
+                last_errors = {i: (type(e).__name__, str(e)) for i in range(len(remaining))}
+                continue
+
+            self.breaker.record_success()
+            errors = getattr(result, "errors", None) if result is not None else None
+            if not errors:
+                logger.debug("Async bulk inserted %d objects into '%s'", len(remaining), collection)
+                return True
+
+            retry: List[DataObject] = []
+            retry_errors: Dict[int, Tuple[str, str]] = {}
+            for index, error in errors.items():
+                message = getattr(error, "message", str(error))
+                error_type, transient = classify_error(message)
+                self.failure_counts[error_type] += 1
+                if transient:
+                    retry_errors[len(retry)] = (error_type, message)
+                    retry.append(remaining[index])
+                else:
+                    self._add_dead_letter(collection, remaining[index], error_type, message, attempt + 1)
+
+            logger.error(
+                "Async bulk insert into '%s' finished with %d failed objects out of %d (%d transient)",
+                collection, len(errors), len(remaining), len(retry)
+            )
+            if not retry:
+                return True
+            remaining, last_errors = retry, retry_errors
+
+        if remaining is objects:
+            return False
+        # Part of the batch was written, so the leftovers can't be handed back as a unit
+        for index, data_object in enumerate(remaining):
+            error_type, message = last_errors[index]
+            self._add_dead_letter(collection, data_object, error_type, message, self.max_retries + 1)
+        return True
+
+    def _add_dead_letter(self, collection: str, data_object: DataObject, error_type: str, message: str, attempts: int):
+        self.dead_letters.add(DeadLetter(
+            collection=collection,
+            data_object=data_object,
+            error_type=error_type,
+            message=message,
+            attempts=attempts
+        ))
+        logger.warning("Dead-lettered async object for '%s' (%s): %s", collection, error_type, message)
+
+    async def _run(self):
+        timeout = self.flush_interval if self.flush_interval and self.flush_interval > 0 else None
+        wake_event = self._wake_event
+        while True:
+            try:
+                await asyncio.wait_for(wake_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            wake_event.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Background async batch flush failed: %s", e)
+
+
+@lru_cache(None)
+def get_async_batch_manager() -> AsyncWeaviateBatchManager:
+    return AsyncWeaviateBatchManager()
+
+
+if hasattr(os, "register_at_fork"):
+    # The inherited event loop and async client are not usable in the child
+    os.register_at_fork(after_in_child=get_async_batch_manager.cache_clear)
+
+
+async def aflush():
+    """
+    Flushes both exporters: the asyncio-native one (awaited on this loop)
+    and the thread-based batch manager (in a worker thread, so the loop
+    is not blocked). Intended for graceful shutdown in ASGI servers.
+    """
+    await get_async_batch_manager().flush()
+    await asyncio.to_thread(lambda: get_batch_manager().flush())
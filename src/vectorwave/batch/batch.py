@@ -1,68 +1,522 @@
 import weaviate
 import atexit
 import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
 from functools import lru_cache
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
+from weaviate.classes.data import DataObject
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from ..database.db import get_weaviate_client
 from ..exception.exceptions import WeaviateConnectionError
+from .spool import SpanSpool
+from .circuit_breaker import CircuitBreaker
+from ..utils.backoff import backoff_delay
+from .dead_letter import DeadLetter, DeadLetterQueue, classify_error
+from ..collector.client import CollectorClient
 
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
+QUEUE_FULL_POLICIES = ("drop", "block")
+
+# Objects that overflow a full queue wait here for the worker to spool them
+OVERFLOW_MAX_SIZE = 1000
+
+
 class WeaviateBatchManager:
     """
     A singleton class that manages Weaviate batch imports.
+
+    add_object() only puts the object on a bounded in-memory queue. A
+    background worker thread drains the queue and writes it with one bulk
+    insert per collection when BATCH_SIZE objects are waiting, every
+    BATCH_FLUSH_INTERVAL_SEC seconds, on an explicit flush(), and once more
+    when the interpreter exits. Callers never wait on Weaviate.
+
+    Every connect and write attempt goes through a CircuitBreaker, and failed
+    writes are retried with jittered exponential backoff. While the circuit is
+    open no network call is made: objects stay in the queue, or go straight to
+    the spool when one is configured. This includes Weaviate being down at
+    startup: the worker always runs and keeps reconnecting (at least every
+    SPOOL_REPLAY_INTERVAL_SEC) through the breaker's half-open trials.
+
+    Bulk inserts are checked object by object: transiently failed objects are
+    retried, permanently rejected ones go to a bounded DeadLetterQueue
+    (dead_letters) that can be inspected and replayed. failure_counts groups
+    every failure by error type.
+
+    When SPOOL_DIR is set, objects that cannot be written (Weaviate down or a
+    failed bulk insert) go to a SpanSpool on disk. Objects that overflow the
+    queue are kept in a small in-memory overflow buffer that the worker
+    spools, so request threads never do file I/O; past OVERFLOW_MAX_SIZE
+    they are dropped. The spool is replayed once Weaviate is reachable again.
+
+    With COLLECTOR_SOCKET_PATH set, the manager talks to the per-host
+    collector process (a CollectorClient) instead of Weaviate; everything
+    else (queue, retries, circuit breaker, spool) works the same way.
+
+    A manager belongs to the process that created it. After os.fork() the
+    child discards its inherited copy (queue contents included) and builds a
+    new manager lazily, while the parent keeps writing its own pending
+    objects; the inherited copy's flush()/close() are no-ops in the child.
     """
 
     def __init__(self):
         self._initialized = False
+        self._pid = os.getpid()
         logger.debug("Initializing WeaviateBatchManager")
         self.client: weaviate.WeaviateClient = None
+        self.spool: Optional[SpanSpool] = None
+
+        self._queue: Optional[queue.Queue] = None
+        # Serializes bulk writes so the worker and explicit flushes don't interleave
+        self._write_lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._next_replay_at = 0.0
+        self.dropped_count = 0
+        # Objects spooled or requeued instead of written (they may still be written later)
+        self.unwritten_count = 0
+        # add_object() runs on many request threads at once
+        self._drop_lock = threading.Lock()
+        self._overflow: deque = deque()
+        self.dead_letters = DeadLetterQueue()
+        self.failure_counts: Counter = Counter()
 
         try:
             # (get_weaviate_settings is reused as it is handled by lru_cache)
             self.settings: WeaviateSettings = get_weaviate_settings()
-            self.client: weaviate.WeaviateClient = get_weaviate_client(self.settings)
+
+            self.batch_size = max(1, self.settings.BATCH_SIZE)
+            self.flush_interval = self.settings.BATCH_FLUSH_INTERVAL_SEC
+            self.queue_full_policy = self.settings.BATCH_QUEUE_FULL_POLICY.lower()
+            if self.queue_full_policy not in QUEUE_FULL_POLICIES:
+                logger.warning(
+                    "Unknown BATCH_QUEUE_FULL_POLICY '%s', falling back to 'drop'",
+                    self.settings.BATCH_QUEUE_FULL_POLICY
+                )
+                self.queue_full_policy = "drop"
+            self.block_timeout = self.settings.BATCH_QUEUE_BLOCK_TIMEOUT_SEC
+            self.spool_interval = self.settings.SPOOL_REPLAY_INTERVAL_SEC
+            self.max_retries = max(0, self.settings.WRITE_MAX_RETRIES)
+            self.backoff_base = self.settings.WRITE_BACKOFF_BASE_SEC
+            self.backoff_max = self.settings.WRITE_BACKOFF_MAX_SEC
+            self.breaker = CircuitBreaker(
+                failure_threshold=self.settings.CIRCUIT_FAILURE_THRESHOLD,
+                recovery_timeout=self.settings.CIRCUIT_RECOVERY_TIMEOUT_SEC
+            )
+
+            self._queue = queue.Queue(maxsize=max(0, self.settings.BATCH_MAX_QUEUE_SIZE))
+            self.dead_letters = DeadLetterQueue(max_size=self.settings.DEAD_LETTER_MAX_SIZE)
+
+            if self.settings.SPOOL_DIR:
+                self.spool = SpanSpool(
+                    directory=self.settings.SPOOL_DIR,
+                    segment_max_bytes=self.settings.SPOOL_SEGMENT_MAX_BYTES,
+                    max_bytes=self.settings.SPOOL_MAX_BYTES,
+                    fsync_every=self.settings.SPOOL_FSYNC_EVERY
+                )
+
+            self.client: weaviate.WeaviateClient = self._connect()
 
             if not self.client:
                 raise WeaviateConnectionError("Client is None, cannot configure batch.")
 
-            # self.client.batch.configure(
-            #     batch_size=20,
-            #     dynamic=True,
-            #     timeout_retries=3,
-            # )
-
-            # Register atexit: Automatically calls self.flush() on script exit
-            # atexit.register(self.flush)
             self._initialized = True
             logger.info("WeaviateBatchManager initialized successfully")
 
         except Exception as e:
             # Prevents VectorWave from stopping the main app upon DB connection failure
             logger.error("Failed to initialize WeaviateBatchManager: %s", e)
+            self.client = None
+            if self._queue is not None:
+                # The worker keeps reconnecting through the circuit breaker
+                self.breaker.record_failure()
+                if self.spool is not None:
+                    logger.warning("Spooling objects to '%s' until Weaviate is reachable", self.spool.directory)
+                else:
+                    logger.warning(
+                        "Holding up to %d objects in memory until Weaviate is reachable", self._queue.maxsize
+                    )
+
+        if self._accepting:
+            self._worker = threading.Thread(
+                target=self._run_worker,
+                name="vectorwave-batch-worker",
+                daemon=True
+            )
+            self._worker.start()
+
+            # Register atexit: Automatically flushes the queue on script exit
+            atexit.register(self.close)
+
+    @property
+    def _accepting(self) -> bool:
+        # False only when the settings could not be loaded; a missing client is an outage, not a reason to refuse
+        return self._queue is not None
 
     def add_object(self, collection: str, properties: dict, uuid: str = None, vector: Optional[List[float]] = None):
         """
         Adds an object to the Weaviate batch queue.
+        Never performs network I/O; the background worker writes the object.
         """
-        if not self._initialized or not self.client:
-            logger.warning("Batch manager not initialized, skipping add_object")
+        if not self._accepting or self._pid != os.getpid():
+            with self._drop_lock:
+                self.dropped_count += 1
+                dropped = self.dropped_count
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(
+                    "Batch manager not initialized, skipped object for '%s' (%d dropped so far)", collection, dropped
+                )
             return
 
+        item = (collection, DataObject(properties=properties, uuid=uuid, vector=vector))
+
         try:
-            self.client.collections.get(collection).data.insert(
-                properties=properties,
-                uuid=uuid,
-                vector=vector
+            if self.queue_full_policy == "block":
+                self._queue.put(item, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            if self.spool is not None:
+                with self._drop_lock:
+                    overflowed = len(self._overflow) < OVERFLOW_MAX_SIZE
+                    if overflowed:
+                        self._overflow.append(item)
+                if overflowed:
+                    self._wake_event.set()
+                    return
+            self._record_drop(collection)
+            return
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wake_event.set()
+
+    def flush(self) -> bool:
+        """
+        Writes every queued object to Weaviate, one bulk insert per collection.
+        Objects that cannot be written are spooled when a spool is configured.
+        Blocks the calling thread until the write has finished.
+
+        Returns True when every queued object was sent (dead-lettered objects
+        included, see loss_count()), False when objects were spooled, kept
+        queued or the manager is not usable.
+        """
+        if not self._accepting or self._pid != os.getpid():
+            # Also covers a copy inherited through fork(): the parent owns its queue
+            return False
+
+        with self._write_lock:
+            overflowed = self._spool_overflow()
+
+            if self.client is None:
+                self._try_reconnect()
+
+            if self.client is None or self.breaker.state == CircuitBreaker.OPEN:
+                # Fast path: no network attempt while Weaviate is known to be down
+                if self.spool is not None:
+                    pending = self._drain()
+                    self._count_unwritten(len(pending))
+                    self.spool.append_many(pending)
+                    self.spool.sync()
+                return False
+
+            written = not overflowed
+            pending = self._drain()
+            if pending:
+                grouped: Dict[str, List[DataObject]] = {}
+                for collection, data_object in pending:
+                    grouped.setdefault(collection, []).append(data_object)
+
+                for collection, objects in grouped.items():
+                    # A long outage can leave up to BATCH_MAX_QUEUE_SIZE objects; write BATCH_SIZE at a time
+                    for start in range(0, len(objects), self.batch_size):
+                        chunk = objects[start:start + self.batch_size]
+                        if not self._write_batch(collection, chunk):
+                            self._keep_unwritten(collection, chunk)
+                            written = False
+
+            if self.spool is not None:
+                self.spool.sync()
+                self._maybe_replay_spool()
+            return written
+
+    def replay_dead_letters(self) -> int:
+        """
+        Moves every dead-lettered object back onto the write queue
+        (e.g. after fixing the collection schema). Returns the number requeued.
+        """
+        letters = self.dead_letters.drain()
+        for letter in letters:
+            self.add_object(
+                collection=letter.collection,
+                properties=letter.data_object.properties,
+                uuid=letter.data_object.uuid,
+                vector=letter.data_object.vector
             )
+        if letters:
+            self._wake_event.set()
+        return len(letters)
+
+    def loss_count(self) -> int:
+        """
+        Objects that did not reach Weaviate when they were flushed: dropped,
+        dead-lettered, or spooled/requeued after a failed write. Compare the
+        values before and after a flush() to confirm everything was written.
+        """
+        return self.dropped_count + self.dead_letters.added_count + self.unwritten_count
+
+    def failure_stats(self) -> Dict[str, int]:
+        """Returns a snapshot of failure counts grouped by error type."""
+        return dict(self.failure_counts)
+
+    def close(self):
+        """
+        Stops the background worker and writes whatever is left in the queue.
+        Objects that can be neither written nor spooled are counted in
+        dropped_count.
+        """
+        if self._pid != os.getpid():
+            return
+        self._stop_event.set()
+        self._wake_event.set()
+        self.flush()
+        if self._queue is not None:
+            # Left behind when Weaviate was unreachable (or the circuit open) and no spool is configured
+            discarded = self._drain()
+            if discarded:
+                with self._drop_lock:
+                    self.dropped_count += len(discarded)
+                logger.error("Weaviate unreachable at exit, discarded %d queued objects", len(discarded))
+        if self.spool is not None:
+            self.spool.close()
+
+    def _try_reconnect(self):
+        if not self.breaker.allow_request():
+            return
 
+        try:
+            self.client = self._connect()
         except Exception as e:
-            logger.error("Failed to add object to batch (collection '%s'): %s", collection, e)
+            logger.debug("Weaviate still unreachable: %s", e)
+            self.client = None
+            self.breaker.record_failure()
+            return
+
+        if self.client:
+            self.breaker.record_success()
+            self._initialized = True
+            # Replay right away instead of waiting for the next interval
+            self._next_replay_at = 0.0
+            logger.info("Reconnected to Weaviate")
+
+    def _connect(self):
+        if self.settings.COLLECTOR_SOCKET_PATH:
+            return CollectorClient(
+                self.settings.COLLECTOR_SOCKET_PATH,
+                timeout=self.settings.COLLECTOR_TIMEOUT_SEC
+            ).connect()
+        return get_weaviate_client(self.settings)
+
+    def _insert_many(self, collection: str, objects: List[DataObject]):
+        if isinstance(self.client, CollectorClient):
+            rejected = self.client.insert_many(collection, objects)
+            if rejected:
+                # Dropped by the collector's full queue; counted here so loss_count() sees them
+                with self._drop_lock:
+                    self.dropped_count += rejected
+            return None
+        return self.client.collections.get(collection).data.insert_many(objects)
+
+    def _maybe_replay_spool(self):
+        if self.client is None or not self.spool.has_pending():
+            return
+        now = time.monotonic()
+        if now < self._next_replay_at:
+            return
+        self._next_replay_at = now + self.spool_interval
+
+        self.spool.replay(self._write_batch, self.batch_size)
+
+    def _keep_unwritten(self, collection: str, objects: List[DataObject]):
+        """
+        Objects whose write failed go to the spool, or back on the queue
+        (subject to its size limit) when no spool is configured.
+        """
+        self._count_unwritten(len(objects))
+        if self.spool is not None:
+            self.spool.append_many([(collection, o) for o in objects])
+            return
+        for data_object in objects:
+            try:
+                self._queue.put_nowait((collection, data_object))
+            except queue.Full:
+                self._record_drop(collection)
+
+    def _spool_overflow(self) -> int:
+        if self.spool is None:
+            return 0
+        with self._drop_lock:
+            overflow = list(self._overflow)
+            self._overflow.clear()
+        if overflow:
+            self._count_unwritten(len(overflow))
+            self.spool.append_many(overflow)
+        return len(overflow)
+
+    def _count_unwritten(self, count: int):
+        with self._drop_lock:
+            self.unwritten_count += count
+
+    def _drain(self) -> List[Tuple[str, DataObject]]:
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                return pending
+
+    def _record_drop(self, collection: str):
+        with self._drop_lock:
+            self.dropped_count += 1
+            dropped = self.dropped_count
+        # Log the first drop and then every 1000th so a full queue doesn't flood the log
+        if dropped == 1 or dropped % 1000 == 0:
+            logger.warning(
+                "Batch queue is full (max %d), dropped object for '%s' (%d dropped so far)",
+                self._queue.maxsize, collection, dropped
+            )
+
+    def _write_batch(self, collection: str, objects: List[DataObject]) -> bool:
+        """
+        Bulk-inserts objects into one collection, retrying with jittered
+        exponential backoff while the circuit breaker allows it.
+
+        A failed request retries the whole batch. Per-object errors reported
+        in the insert result are classified: transient ones are retried alone,
+        permanent ones (and transient ones left after the last attempt) are
+        dead-lettered.
+
+        Returns False when the request itself failed (the objects were not written).
+        """
+        remaining = objects
+        last_errors: Dict[int, Tuple[str, str]] = {}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                # Interruptible so close() at exit doesn't wait out the whole backoff
+                self._stop_event.wait(backoff_delay(attempt - 1, self.backoff_base, self.backoff_max))
+
+            if self.client is None or not self.breaker.allow_request():
+                break
+
+            try:
+                result = self._insert_many(collection, remaining)
+            except Exception as e:
+                self.breaker.record_failure()
+                self.failure_counts[type(e).__name__] += len(remaining)
+                logger.error(
+                    "Failed to bulk insert %d objects (collection '%s', attempt %d/%d): %s",
+                    len(remaining), collection, attempt + 1, self.max_retries + 1, e
+                )
+                last_errors = {i: (type(e).__name__, str(e)) for i in range(len(remaining))}
+                continue
+
+            self.breaker.record_success()
+            errors = getattr(result, "errors", None) if result is not None else None
+            if not errors:
+                logger.debug("Bulk inserted %d objects into '%s'", len(remaining), collection)
+                return True
+
+            retry: List[DataObject] = []
+            retry_errors: Dict[int, Tuple[str, str]] = {}
+            for index, error in errors.items():
+                message = getattr(error, "message", str(error))
+                error_type, transient = classify_error(message)
+                self.failure_counts[error_type] += 1
+                if transient:
+                    retry_errors[len(retry)] = (error_type, message)
+                    retry.append(remaining[index])
+                else:
+                    self._add_dead_letter(collection, remaining[index], error_type, message, attempt + 1)
+
+            logger.error(
+                "Bulk insert into '%s' finished with %d failed objects out of %d (%d transient)",
+                collection, len(errors), len(remaining), len(retry)
+            )
+            if not retry:
+                return True
+            remaining, last_errors = retry, retry_errors
+
+        if remaining is objects:
+            # Nothing was written; the caller spools or requeues the whole batch
+            return False
+        # Part of the batch was written, so the leftovers can't be handed back as a unit
+        return self._dead_letter_remaining(collection, remaining, last_errors, self.max_retries + 1)
+
+    def _dead_letter_remaining(self, collection: str, objects: List[DataObject],
+                               errors: Dict[int, Tuple[str, str]], attempts: int) -> bool:
+        for index, data_object in enumerate(objects):
+            error_type, message = errors[index]
+            self._add_dead_letter(collection, data_object, error_type, message, attempts)
+        return True
+
+    def _add_dead_letter(self, collection: str, data_object: DataObject, error_type: str, message: str, attempts: int):
+        self.dead_letters.add(DeadLetter(
+            collection=collection,
+            data_object=data_object,
+            error_type=error_type,
+            message=message,
+            attempts=attempts
+        ))
+        logger.warning("Dead-lettered object for '%s' (%s): %s", collection, error_type, message)
+
+    def _run_worker(self):
+        timeout = self.flush_interval if self.flush_interval and self.flush_interval > 0 else None
+        while not self._stop_event.is_set():
+            wait = timeout
+            if self.client is None and self.spool_interval > 0 and (wait is None or wait > self.spool_interval):
+                # Keep retrying the connection even without periodic flushes
+                wait = self.spool_interval
+            self._wake_event.wait(wait)
+            self._wake_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Background batch flush failed: %s", e)
 
 
 
 @lru_cache(None)
 def get_batch_manager() -> WeaviateBatchManager:
-    return WeaviateBatchManager()
\ No newline at end of file
+    return WeaviateBatchManager()
+
+
+def _reset_after_fork():
+    """
+    Runs in the child right after fork(). The inherited manager shares the
+    parent's gRPC channel and holds the parent's queued objects, so it is
+    dropped (not closed, which would tear down the parent's connection)
+    and the next get_batch_manager() call builds a fresh one.
+    """
+    get_batch_manager.cache_clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def flush():
+    """
+    Registers pending @vectorize functions, then flushes the shared batch
+    manager's queue to Weaviate.
+    """
+    # Imported here: the registry itself depends on this module
+    from ..core.registry import flush_registrations
+    flush_registrations()
+    get_batch_manager().flush()
@@ -0,0 +1,88 @@
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from weaviate.classes.data import DataObject
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+# (error type, is transient, lowercase substrings of the Weaviate error message)
+# The first matching rule wins.
+_ERROR_RULES: List[Tuple[str, bool, Tuple[str, ...]]] = [
+    ("RATE_LIMITED", True, ("too many requests", "429", "rate limit", "resource exhausted")),
+    ("TIMEOUT", True, ("timeout", "timed out", "deadline exceeded", "context canceled")),
+    ("UNAVAILABLE", True, ("unavailable", "503", "connection", "not ready", "shutting down")),
+    ("COLLECTION_NOT_FOUND", False, ("class not found", "collection not found", "could not find class")),
+    ("SCHEMA_MISMATCH", False, ("no such prop", "not found in class", "schema")),
+    ("VECTOR_DIMENSION_MISMATCH", False, ("vector lengths", "vector length", "vector with length", "dimension")),
+    ("DUPLICATE_ID", False, ("already exists", "duplicate")),
+    ("INVALID_PROPERTY", False, ("invalid", "cannot parse", "wrong type", "conflict")),
+]
+
+
+def classify_error(message: str) -> Tuple[str, bool]:
+    """
+    Maps a per-object Weaviate error message to (error_type, is_transient).
+    Unrecognized messages are treated as permanent 'UNKNOWN' errors.
+    """
+    text = (message or "").lower()
+    for error_type, transient, needles in _ERROR_RULES:
+        if any(needle in text for needle in needles):
+            return error_type, transient
+    return "UNKNOWN", False
+
+
+@dataclass
+class DeadLetter:
+    collection: str
+    data_object: DataObject
+    error_type: str
+    message: str
+    attempts: int
+    failed_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+
+class DeadLetterQueue:
+    """
+    Bounded, thread-safe store for objects Weaviate rejected permanently (or
+    that kept failing after all retries). When full, the oldest entry is
+    evicted. Entries can be inspected with entries() and taken out for a
+    replay with drain().
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max(1, max_size)
+        self.evicted_count = 0
+        # Every entry ever added, including evicted and drained ones
+        self.added_count = 0
+        self._entries: deque = deque()
+        self._lock = threading.Lock()
+
+    def add(self, letter: DeadLetter):
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.popleft()
+                self.evicted_count += 1
+            self._entries.append(letter)
+            self.added_count += 1
+
+    def entries(self) -> List[DeadLetter]:
+        with self._lock:
+            return list(self._entries)
+
+    def drain(self) -> List[DeadLetter]:
+        with self._lock:
+            entries = list(self._entries)
+            self._entries.clear()
+            return entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
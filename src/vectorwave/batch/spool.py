@@ -0,0 +1,253 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid as uuid_lib
+from typing import Optional, List, Dict, Tuple, Callable, Iterator
+
+from weaviate.classes.data import DataObject
+
+from ..vectorizer.base import vector_to_list
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+ACTIVE_SUFFIX = ".jsonl.open"
+SEALED_SUFFIX = ".jsonl"
+CLAIMED_SUFFIX = ".jsonl.replaying"
+
+
+def _pid_is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SpanSpool:
+    """
+    Append-only, segmented JSONL write-ahead spool for objects that could not
+    be sent to Weaviate (DB down, write failed, or in-memory queue full).
+
+    Each process appends to its own active segment
+    (``segment-<time_ns>-<pid>.jsonl.open``). A segment is sealed (renamed to
+    ``.jsonl``) when it grows past ``segment_max_bytes`` or before a replay.
+    Writes are flushed to the OS immediately but fsync'ed only every
+    ``fsync_every`` records and on sync()/close(), so one slow disk flush is
+    shared by many spans.
+
+    replay() claims sealed segments by atomically renaming them, so several
+    processes can share one spool directory. Segments left behind by a dead
+    process (including its active one) are picked up on the next replay.
+    Every record carries a UUID, which makes a replay that is interrupted and
+    repeated an upsert rather than a duplicate.
+    """
+
+    def __init__(self, directory: str, segment_max_bytes: int = 8 * 1024 * 1024,
+                 max_bytes: int = 512 * 1024 * 1024, fsync_every: int = 100):
+        self.directory = directory
+        self.segment_max_bytes = max(1, segment_max_bytes)
+        self.max_bytes = max_bytes
+        self.fsync_every = max(1, fsync_every)
+
+        self.dropped_count = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_path: Optional[str] = None
+        self._file_bytes = 0
+        self._unsynced = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(
+            os.path.getsize(p) for p in glob.glob(os.path.join(self.directory, "segment-*"))
+        )
+
+    def append_many(self, items: List[Tuple[str, DataObject]]) -> int:
+        """
+        Appends (collection, DataObject) pairs to the active segment.
+        Returns the number of records written; the rest are dropped when the
+        spool is over max_bytes.
+        """
+        if not items:
+            return 0
+
+        written = 0
+        with self._lock:
+            for collection, data_object in items:
+                line = self._encode(collection, data_object)
+                if self.max_bytes and self._total_bytes + len(line) > self.max_bytes:
+                    self.dropped_count += 1
+                    if self.dropped_count == 1 or self.dropped_count % 1000 == 0:
+                        logger.warning(
+                            "Spool '%s' is full (%d bytes), dropped object (%d dropped so far)",
+                            self.directory, self.max_bytes, self.dropped_count
+                        )
+                    continue
+
+                if self._file is None or self._file_bytes >= self.segment_max_bytes:
+                    self._rotate_locked()
+
+                self._file.write(line)
+                self._file_bytes += len(line)
+                self._total_bytes += len(line)
+                self._unsynced += 1
+                written += 1
+
+            if self._file is not None:
+                self._file.flush()
+                if self._unsynced >= self.fsync_every:
+                    self._fsync_locked()
+
+        return written
+
+    def sync(self):
+        """Forces pending records of the active segment to disk."""
+        with self._lock:
+            self._fsync_locked()
+
+    def close(self):
+        """Fsyncs and seals the active segment."""
+        with self._lock:
+            self._seal_locked()
+
+    def has_pending(self) -> bool:
+        return bool(self._total_bytes)
+
+    def replay(self, write_batch: Callable[[str, List[DataObject]], bool], batch_size: Optional[int] = None) -> int:
+        """
+        Bulk-loads spooled records through write_batch(collection, objects),
+        oldest segment first, in batches of at most batch_size objects per
+        collection (unlimited when None). A segment is deleted only after every one of its
+        batches was written; on the first failure the segment is released for
+        a later replay and replay stops.
+
+        Returns the number of records replayed.
+        """
+        with self._lock:
+            self._seal_locked()
+
+        replayed = 0
+        for path in self._replayable_segments():
+            claimed = path + ".replaying-" + str(os.getpid())
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                # Another process claimed it first
+                continue
+
+            try:
+                size = os.path.getsize(claimed)
+                grouped: Dict[str, List[DataObject]] = {}
+                for collection, data_object in self._read_segment(claimed):
+                    grouped.setdefault(collection, []).append(data_object)
+                size_limit = max(1, batch_size) if batch_size else None
+                succeeded = all(
+                    write_batch(collection, objects[start:start + size_limit] if size_limit else objects)
+                    for collection, objects in grouped.items()
+                    for start in range(0, len(objects), size_limit or len(objects))
+                )
+            except Exception as e:
+                logger.error("Failed to replay spool segment '%s': %s", os.path.basename(path), e)
+                succeeded = False
+
+            if succeeded:
+                os.remove(claimed)
+                with self._lock:
+                    self._total_bytes = max(0, self._total_bytes - size)
+                count = sum(len(objects) for objects in grouped.values())
+                replayed += count
+                logger.info("Replayed %d spooled objects from '%s'", count, os.path.basename(path))
+            else:
+                os.rename(claimed, path)
+                logger.warning("Replay of '%s' failed, keeping it for a later attempt", os.path.basename(path))
+                break
+
+        return replayed
+
+    def _replayable_segments(self) -> List[str]:
+        paths = glob.glob(os.path.join(self.directory, "segment-*" + SEALED_SUFFIX))
+
+        # Active or claimed segments whose owner process is gone
+        leftovers = glob.glob(os.path.join(self.directory, "segment-*" + ACTIVE_SUFFIX))
+        leftovers += glob.glob(os.path.join(self.directory, "segment-*" + CLAIMED_SUFFIX + "-*"))
+        for path in leftovers:
+            if path == self._file_path:
+                continue
+            pid = self._owner_pid(path)
+            if pid is not None and not _pid_is_alive(pid):
+                base = os.path.basename(path)
+                sealed = os.path.join(self.directory, base[:base.index(SEALED_SUFFIX)] + SEALED_SUFFIX)
+                try:
+                    os.rename(path, sealed)
+                    paths.append(sealed)
+                except OSError:
+                    continue
+
+        return sorted(set(paths))
+
+    @staticmethod
+    def _owner_pid(path: str) -> Optional[int]:
+        base = os.path.basename(path)
+        try:
+            if CLAIMED_SUFFIX + "-" in base:
+                return int(base.rsplit("-", 1)[1])
+            return int(base[:base.index(SEALED_SUFFIX)].rsplit("-", 1)[1])
+        except (ValueError, IndexError):
+            return None
+
+    def _read_segment(self, path: str) -> Iterator[Tuple[str, DataObject]]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield record["collection"], DataObject(
+                        properties=record["properties"],
+                        uuid=record.get("uuid"),
+                        vector=record.get("vector")
+                    )
+                except (ValueError, KeyError) as e:
+                    # Typically a record torn by a crash in the middle of a write
+                    logger.warning("Skipping corrupt spool record %s:%d: %s", os.path.basename(path), line_no, e)
+
+    @staticmethod
+    def _encode(collection: str, data_object: DataObject) -> str:
+        record = {
+            "collection": collection,
+            "properties": data_object.properties,
+            "uuid": str(data_object.uuid) if data_object.uuid else str(uuid_lib.uuid4()),
+            "vector": vector_to_list(data_object.vector),
+        }
+        return json.dumps(record, default=str, ensure_ascii=False) + "\n"
+
+    def _rotate_locked(self):
+        self._seal_locked()
+        name = f"segment-{time.time_ns()}-{os.getpid()}{ACTIVE_SUFFIX}"
+        self._file_path = os.path.join(self.directory, name)
+        self._file = open(self._file_path, "a", encoding="utf-8")
+        self._file_bytes = 0
+
+    def _fsync_locked(self):
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _seal_locked(self):
+        if self._file is None:
+            return
+        self._fsync_locked()
+        self._file.close()
+        os.rename(self._file_path, self._file_path[:-len(ACTIVE_SUFFIX)] + SEALED_SUFFIX)
+        self._file = None
+        self._file_path = None
+        self._file_bytes = 0
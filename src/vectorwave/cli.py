@@ -0,0 +1,169 @@
+import argparse
+import logging
+import signal
+import sys
+from typing import Optional, List
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+def _run_collector(args: argparse.Namespace) -> int:
+    from .models.db_config import get_weaviate_settings
+    from .batch.batch import WeaviateBatchManager
+    from .collector.server import CollectorServer
+
+    settings = get_weaviate_settings()
+    # The collector itself writes to Weaviate, never to another collector
+    settings.COLLECTOR_SOCKET_PATH = None
+    if args.batch_size is not None:
+        settings.BATCH_SIZE = args.batch_size
+    if args.flush_interval is not None:
+        settings.BATCH_FLUSH_INTERVAL_SEC = args.flush_interval
+    if args.max_queue_size is not None:
+        settings.BATCH_MAX_QUEUE_SIZE = args.max_queue_size
+
+    server = CollectorServer(args.socket, backend=WeaviateBatchManager())
+
+    def _stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    logger.info("VectorWave collector stopped")
+    return 0
+
+
+def _run_register(args: argparse.Namespace) -> int:
+    from .models.db_config import get_weaviate_settings
+
+    settings = get_weaviate_settings()
+    # Collect every registration while importing and write them in one pass below
+    settings.REGISTRATION_MODE = "deferred"
+    settings.REGISTRATION_FLUSH_DELAY_SEC = 0
+    # Only the tracer's fast path would run; no spans are wanted from imports
+    settings.TRACING_ENABLED = False
+    if args.force:
+        settings.REGISTRATION_SKIP_UNCHANGED = False
+
+    from .core.registry import get_function_registry, import_modules
+    from .batch.batch import get_batch_manager
+
+    if args.path:
+        sys.path[:0] = args.path
+    modules = import_modules(args.packages)
+    registry = get_function_registry()
+    logger.info("Imported %d modules, %d functions to register", len(modules), registry.pending_count())
+
+    batch = get_batch_manager()
+    losses = batch.loss_count()
+    registered = registry.flush(
+        write=True,
+        embed_batch_size=args.batch_size if args.batch_size is not None else settings.HF_POOL_CHUNK_SIZE,
+        embed_workers=args.workers if args.workers is not None else settings.HF_POOL_WORKERS
+    )
+    batch.close()
+
+    # 'registered' counts queued objects; confirm they were actually written
+    lost = batch.loss_count() - losses
+    if registered and (batch.client is None or lost):
+        logger.error(
+            "Registration incomplete: %d functions queued, Weaviate %s, %d objects dropped, "
+            "dead-lettered or spooled",
+            registered, "connected" if batch.client is not None else "unreachable", lost
+        )
+        return 1
+    logger.info("Registered %d functions", registered)
+    return 0
+
+
+def _run_embedding_server(args: argparse.Namespace) -> int:
+    from .models.db_config import get_weaviate_settings
+    from .vectorizer.factory import get_vectorizer
+    from .vectorizer.server import EmbeddingServer
+
+    settings = get_weaviate_settings()
+    # The server owns the model itself, never another server
+    settings.VECTORIZER = "huggingface"
+    if args.model:
+        settings.HF_MODEL_NAME = args.model
+    if args.batch_size is not None:
+        settings.EMBED_BATCH_MAX_SIZE = args.batch_size
+    if args.wait_ms is not None:
+        settings.EMBED_BATCH_MAX_WAIT_MS = args.wait_ms
+
+    vectorizer = get_vectorizer()
+    if vectorizer is None:
+        logger.error("Could not load the HuggingFace model '%s'", settings.HF_MODEL_NAME)
+        return 1
+    server = EmbeddingServer(args.socket, vectorizer)
+
+    def _stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    logger.info("VectorWave embedding server stopped")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vectorwave", description="VectorWave command line tools")
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    collector = subparsers.add_parser(
+        "collector",
+        help="Run the per-host span collector",
+        description="Receives spans from worker processes over a Unix socket and bulk-writes them to Weaviate."
+    )
+    collector.add_argument("--socket", required=True, help="Unix domain socket path to listen on")
+    collector.add_argument("--batch-size", type=int, default=1000, help="Objects per bulk insert (default: 1000)")
+    collector.add_argument("--flush-interval", type=float, default=None, help="Seconds between periodic flushes")
+    collector.add_argument("--max-queue-size", type=int, default=None, help="Maximum objects waiting to be written")
+    collector.set_defaults(handler=_run_collector)
+
+    register = subparsers.add_parser(
+        "register",
+        help="Register @vectorize functions ahead of time",
+        description="Imports the given packages, then embeds and bulk-upserts every @vectorize function found. "
+                    "Run the application with REGISTRATION_MODE=skip afterwards."
+    )
+    register.add_argument("packages", nargs="+", help="Modules or packages to import (submodules included)")
+    register.add_argument("--batch-size", type=int, default=None,
+                          help="Descriptions per embedding call (default: HF_POOL_CHUNK_SIZE)")
+    register.add_argument("--workers", type=int, default=None,
+                          help="Embedding processes for a local model (default: HF_POOL_WORKERS)")
+    register.add_argument("--path", action="append", default=[], help="Extra directory to put on sys.path")
+    register.add_argument("--force", action="store_true", help="Register unchanged functions too")
+    register.set_defaults(handler=_run_register)
+
+    embedding_server = subparsers.add_parser(
+        "embedding-server",
+        help="Serve embeddings to worker processes",
+        description="Loads the HuggingFace model once and serves embed_batch requests over a Unix socket. "
+                    "Run workers with VECTORIZER=embedding_server and EMBEDDING_SERVER_SOCKET_PATH."
+    )
+    embedding_server.add_argument("--socket", required=True, help="Unix domain socket path to listen on")
+    embedding_server.add_argument("--model", default=None, help="Model name (default: HF_MODEL_NAME)")
+    embedding_server.add_argument("--batch-size", type=int, default=None, help="Maximum texts per forward pass")
+    embedding_server.add_argument("--wait-ms", type=float, default=None, help="Milliseconds to wait to fill a batch")
+    embedding_server.set_defaults(handler=_run_embedding_server)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import logging
+import socket
+from typing import Optional, List
+
+from weaviate.classes.data import DataObject
+
+from ..exception.exceptions import WeaviateConnectionError
+from ..ipc.framing import send_frame, recv_frame
+from ..vectorizer.base import vector_to_list
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+def encode_object(data_object: DataObject) -> dict:
+    return {
+        "properties": data_object.properties,
+        "uuid": str(data_object.uuid) if data_object.uuid else None,
+        "vector": vector_to_list(data_object.vector),
+    }
+
+
+class CollectorClient:
+    """
+    Connection from a worker process to the per-host VectorWave collector.
+    Used by WeaviateBatchManager in place of a Weaviate client when
+    COLLECTOR_SOCKET_PATH is set: each bulk insert becomes one frame on the
+    Unix socket, acknowledged by the collector once it has queued the objects.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def connect(self) -> "CollectorClient":
+        """
+        [Raises]
+        - WeaviateConnectionError: If the collector socket cannot be reached.
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise WeaviateConnectionError(f"Failed to connect to VectorWave collector at '{self.socket_path}': {e}")
+        self._sock = sock
+        logger.info("Connected to VectorWave collector at '%s'", self.socket_path)
+        return self
+
+    def insert_many(self, collection: str, objects: List[DataObject]) -> int:
+        """
+        Sends one batch to the collector and waits for its acknowledgement.
+        Per-object results are handled by the collector. Returns the number of
+        objects the collector did not accept (its queue was full).
+        """
+        if self._sock is None:
+            self.connect()
+        try:
+            send_frame(self._sock, {
+                "collection": collection,
+                "objects": [encode_object(o) for o in objects],
+            })
+            ack = recv_frame(self._sock)
+        except (OSError, ValueError) as e:
+            self.close()
+            raise WeaviateConnectionError(f"Lost connection to VectorWave collector: {e}")
+
+        if ack is None:
+            self.close()
+            raise WeaviateConnectionError("VectorWave collector closed the connection")
+        if ack.get("error"):
+            raise WeaviateConnectionError(f"VectorWave collector rejected the batch: {ack['error']}")
+        rejected = max(0, len(objects) - ack.get("accepted", len(objects)))
+        if rejected:
+            logger.warning(
+                "VectorWave collector queue is full, it dropped %d of %d objects for '%s'",
+                rejected, len(objects), collection
+            )
+        return rejected
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
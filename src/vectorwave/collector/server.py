@@ -0,0 +1,131 @@
+import logging
+import os
+import socket
+import socketserver
+import threading
+from typing import Optional
+
+from ..ipc.framing import send_frame, recv_frame
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class _CollectorRequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        backend = self.server.backend
+        while True:
+            try:
+                message = recv_frame(self.request)
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping collector connection: %s", e)
+                return
+            if message is None:
+                return
+
+            try:
+                collection = message["collection"]
+                objects = message["objects"]
+                # Serialized so the dropped_count delta belongs to this batch only
+                with self.server.accept_lock:
+                    dropped_before = getattr(backend, "dropped_count", 0)
+                    for obj in objects:
+                        backend.add_object(
+                            collection=collection,
+                            properties=obj["properties"],
+                            uuid=obj.get("uuid"),
+                            vector=obj.get("vector")
+                        )
+                    dropped = getattr(backend, "dropped_count", 0) - dropped_before
+                ack = {"accepted": len(objects) - dropped}
+            except Exception as e:
+                logger.error("Collector failed to accept a batch: %s", e)
+                ack = {"error": str(e)}
+
+            try:
+                send_frame(self.request, ack)
+            except OSError:
+                return
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class CollectorServer:
+    """
+    Per-host span collector. Worker processes (WeaviateBatchManager with
+    COLLECTOR_SOCKET_PATH set) send small batches over a Unix domain socket;
+    the collector funnels them into one backend, normally a
+    WeaviateBatchManager configured for large bulk inserts, so the host holds
+    a single Weaviate connection instead of one per worker.
+
+    backend can be any object with add_object(collection, properties, uuid,
+    vector) and close(). If it has a dropped_count, the acknowledgement
+    reports only the objects it actually queued.
+    """
+
+    def __init__(self, socket_path: str, backend=None):
+        self.socket_path = socket_path
+        if backend is None:
+            from ..batch.batch import WeaviateBatchManager
+            backend = WeaviateBatchManager()
+        self.backend = backend
+        self._server: Optional[_ThreadingUnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "CollectorServer":
+        """Binds the socket and serves in a background thread."""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="vectorwave-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Binds the socket and serves on the calling thread until shutdown()."""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._cleanup()
+
+    def shutdown(self):
+        """Stops accepting batches and flushes everything to the backend."""
+        if self._server is not None:
+            self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._cleanup()
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # Stale socket file left by a collector that didn't exit cleanly
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"A collector is already listening on '{self.socket_path}'")
+            finally:
+                probe.close()
+
+        self._server = _ThreadingUnixServer(self.socket_path, _CollectorRequestHandler)
+        self._server.backend = self.backend
+        self._server.accept_lock = threading.Lock()
+        logger.info("VectorWave collector listening on '%s'", self.socket_path)
+
+    def _cleanup(self):
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        try:
+            self.backend.close()
+        except Exception as e:
+            logger.error("Failed to flush collector backend: %s", e)
@@ -3,23 +3,32 @@
 import logging
 import inspect
 from functools import wraps
+from typing import Optional
 
 from weaviate.util import generate_uuid5
 
-from ..batch.batch import get_batch_manager
 from ..models.db_config import get_weaviate_settings
-from ..monitoring.tracer import trace_root, trace_span
-from ..vectorizer.factory import get_vectorizer
+from ..monitoring.tracer import trace_root_span
+from .registry import get_function_registry, PendingRegistration
 
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
+# Call keyword arguments recorded on execution spans; execution tags of the same name take precedence
+CALL_ATTRIBUTES_TO_CAPTURE = ['team', 'priority', 'run_id']
+
 def vectorize(search_description: str,
               sequence_narrative: str,
+              sample_rate: Optional[float] = None,
+              slow_threshold_ms: Optional[float] = None,
               **execution_tags):
     """
     VectorWave Decorator
     ...
+    sample_rate: Fraction (0.0-1.0) of calls traced for this function.
+                 Defaults to the global TRACE_SAMPLE_RATE setting.
+    slow_threshold_ms: With tail sampling enabled, calls taking at least this
+                 long are always kept. Defaults to TAIL_SLOW_THRESHOLD_MS.
     """
 
     def decorator(func):
@@ -35,28 +44,8 @@ def vectorize(search_description: str,
             func_identifier = f"{module_name}.{function_name}"
             func_uuid = generate_uuid5(func_identifier)
 
-            static_properties = {
-                "function_name": function_name,
-                "module_name": module_name,
-                "docstring": inspect.getdoc(func) or "",
-                "source_code": inspect.getsource(func),
-                "search_description": search_description,
-                "sequence_narrative": sequence_narrative
-            }
-
-            batch = get_batch_manager()
             settings = get_weaviate_settings()
 
-            vectorizer = get_vectorizer()
-            vector_to_add = None
-
-            if vectorizer:
-                try:
-                    logger.info(f"Vectorizing '{function_name}' using Python vectorizer...")
-                    vector_to_add = vectorizer.embed(search_description)
-                except Exception as e:
-                    logger.warning(f"Failed to vectorize '{function_name}' with Python client: {e}")
-
             if execution_tags:
                 if not settings.custom_properties:
                     logger.warning(
@@ -76,14 +65,15 @@ def vectorize(search_description: str,
                                 key
                             )
 
-            static_properties.update(valid_execution_tags)
-
-            batch.add_object(
-                collection=settings.COLLECTION_NAME,
-                properties=static_properties,
-                uuid=func_uuid,
-                vector=vector_to_add
-            )
+            # "skip": registration was done ahead of time ('vectorwave register')
+            if settings.REGISTRATION_MODE.lower() != "skip":
+                get_function_registry().add(PendingRegistration(
+                    func=func,
+                    uuid=func_uuid,
+                    search_description=search_description,
+                    sequence_narrative=sequence_narrative,
+                    tags=dict(valid_execution_tags)
+                ))
 
         except Exception as e:
             logger.error("Error in @vectorize setup for '%s': %s", func.__name__, e)
@@ -99,60 +89,15 @@ def vectorize(search_description: str,
                     return func(*args, **kwargs)
                 return original_sync_func_wrapper
 
-        if is_async_func:
-
-            @trace_root()
-            @trace_span(attributes_to_capture=['function_uuid', 'team', 'priority', 'run_id'])
-            @wraps(func)
-            async def inner_wrapper(*args, **kwargs):
-                original_kwargs = kwargs.copy()
-                keys_to_remove = list(valid_execution_tags.keys())
-                keys_to_remove.append('function_uuid')
-                for key in execution_tags.keys():
-                    if key not in keys_to_remove:
-                        keys_to_remove.append(key)
-                for key in keys_to_remove:
-                    original_kwargs.pop(key, None)
-
-                # [MODIFIED] await 사용
-                return await func(*args, **original_kwargs)
-
-            @wraps(func)
-            async def outer_wrapper(*args, **kwargs):
-                full_kwargs = kwargs.copy()
-                full_kwargs.update(valid_execution_tags)
-                full_kwargs['function_uuid'] = func_uuid
-
-                # [MODIFIED] await 사용
-                return await inner_wrapper(*args, **full_kwargs)
-
-            return outer_wrapper
-
-        else:
-
-            @trace_root()
-            @trace_span(attributes_to_capture=['function_uuid', 'team', 'priority', 'run_id'])
-            @wraps(func)
-            def inner_wrapper(*args, **kwargs):
-                original_kwargs = kwargs.copy()
-                keys_to_remove = list(valid_execution_tags.keys())
-                keys_to_remove.append('function_uuid')
-                for key in execution_tags.keys():
-                    if key not in keys_to_remove:
-                        keys_to_remove.append(key)
-                for key in keys_to_remove:
-                    original_kwargs.pop(key, None)
-
-                return func(*args, **original_kwargs)
-
-            @wraps(func)
-            def outer_wrapper(*args, **kwargs):
-                full_kwargs = kwargs.copy()
-                full_kwargs.update(valid_execution_tags)
-                full_kwargs['function_uuid'] = func_uuid
-
-                return inner_wrapper(*args, **full_kwargs)
-
-            return outer_wrapper
+        span_attributes = {"function_uuid": func_uuid}
+        span_attributes.update(valid_execution_tags)
+
+        return trace_root_span(
+            func,
+            attributes=span_attributes,
+            sample_rate=sample_rate,
+            slow_threshold_ms=slow_threshold_ms,
+            attributes_to_capture=CALL_ATTRIBUTES_TO_CAPTURE
+        )
 
     return decorator
\ No newline at end of file
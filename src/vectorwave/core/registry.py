@@ -0,0 +1,387 @@
+import atexit
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import pkgutil
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..batch.batch import get_batch_manager
+from ..database.db_search import count_functions, fetch_function_hashes
+from ..models.db_config import get_weaviate_settings, WeaviateSettings
+from ..vectorizer.base import numpy_available
+from ..vectorizer.factory import create_encode_pool, get_vectorizer
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+def compute_content_hash(properties: Dict[str, Any], settings: WeaviateSettings) -> str:
+    """
+    Stable hash of a function definition: its registered properties (source,
+    docstring, description, narrative, tags, ...) plus the vectorizer setup,
+    so changing the embedding model also counts as a change.
+    """
+    vectorizer = settings.VECTORIZER.lower()
+    payload = {
+        "properties": {key: value for key, value in properties.items() if key != "content_hash"},
+        # The embedding server runs the same HuggingFace model, so its vectors are interchangeable
+        "vectorizer": "huggingface" if vectorizer == "embedding_server" else vectorizer,
+        "model": _embedding_model(settings),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _embedding_model(settings: WeaviateSettings) -> Optional[str]:
+    vectorizer = settings.VECTORIZER.lower()
+    if vectorizer in ("huggingface", "embedding_server"):
+        return settings.HF_MODEL_NAME
+    if vectorizer == "openai_client":
+        return settings.OPENAI_EMBEDDING_MODEL
+    return None
+
+
+def _cache_target(settings: WeaviateSettings) -> str:
+    # Hashes are only valid for the Weaviate instance and collection they were checked against
+    return f"{settings.WEAVIATE_HOST}:{settings.WEAVIATE_PORT}/{settings.COLLECTION_NAME}"
+
+
+def _load_hash_cache(path: str, target: str) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        hashes = data.get(target, {}) if isinstance(data, dict) else {}
+        return hashes if isinstance(hashes, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read registration hash cache '%s': %s", path, e)
+        return {}
+
+
+def _save_hash_cache(path: str, target: str, hashes: Dict[str, str], replace: bool = False):
+    try:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+
+        if replace:
+            data[target] = dict(hashes)
+        else:
+            data.setdefault(target, {}).update(hashes)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write registration hash cache '%s': %s", path, e)
+
+
+@dataclass
+class PendingRegistration:
+    func: Callable
+    uuid: str
+    search_description: str
+    sequence_narrative: str
+    tags: Dict[str, Any] = field(default_factory=dict)
+
+    def build_properties(self) -> Dict[str, Any]:
+        try:
+            source_code = inspect.getsource(self.func)
+        except (OSError, TypeError) as e:
+            # e.g. functions defined in a REPL or generated with exec()
+            logger.debug("No source available for '%s': %s", self.func.__name__, e)
+            source_code = ""
+
+        properties = {
+            "function_name": self.func.__name__,
+            "module_name": self.func.__module__,
+            "docstring": inspect.getdoc(self.func) or "",
+            "source_code": source_code,
+            "search_description": self.search_description,
+            "sequence_narrative": self.sequence_narrative
+        }
+        properties.update(self.tags)
+        return properties
+
+
+class FunctionRegistry:
+    """
+    Collects the static registrations of @vectorize functions instead of
+    writing each one at import time.
+
+    Pending registrations are written together by flush(): the source code is
+    read then, functions whose content_hash is already stored are dropped,
+    the remaining search descriptions are embedded with a single
+    embed_batch() call, and the objects go to the batch manager, which
+    upserts them (the UUIDs are deterministic) in bulk.
+
+    flush() runs in a background timer REGISTRATION_FLUSH_DELAY_SEC after the
+    first pending registration, when initialize_database() or
+    vectorwave.flush() is called, and at interpreter exit. With
+    REGISTRATION_MODE="immediate" every registration is flushed right away.
+    """
+
+    def __init__(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        # Keyed by UUID: re-decorating a function replaces its pending entry
+        self._pending: Dict[str, PendingRegistration] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, registration: PendingRegistration):
+        settings = get_weaviate_settings()
+        with self._lock:
+            self._pending[registration.uuid] = registration
+
+        if settings.REGISTRATION_MODE.lower() == "immediate":
+            self.flush()
+            return
+
+        delay = settings.REGISTRATION_FLUSH_DELAY_SEC
+        if delay and delay > 0:
+            self._schedule(delay)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, write: bool = False, embed_batch_size: Optional[int] = None, embed_workers: int = 0) -> int:
+        """
+        Sends every pending registration to the batch manager. With
+        write=True the batch manager is flushed too, so the registrations are
+        in Weaviate when this returns. Functions whose definition is unchanged
+        are skipped. Returns the number of functions handed to the batch manager.
+
+        The local hash cache (REGISTRATION_HASH_CACHE_FILE) is only updated
+        after a write=True flush that wrote everything to Weaviate directly
+        (never in collector mode); otherwise the next start confirms the
+        hashes with Weaviate.
+
+        Descriptions are embedded in one embed_batch() call, or in chunks of
+        embed_batch_size spread over an encode pool of embed_workers
+        processes (used by 'vectorwave register').
+        """
+        with self._lock:
+            pending: List[PendingRegistration] = list(self._pending.values())
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        registered = 0
+        if pending:
+            settings = get_weaviate_settings()
+            records: List[Tuple[PendingRegistration, Dict[str, Any]]] = []
+            for registration in pending:
+                properties = registration.build_properties()
+                properties["content_hash"] = compute_content_hash(properties, settings)
+                records.append((registration, properties))
+
+            if settings.REGISTRATION_SKIP_UNCHANGED:
+                records = self._drop_unchanged(records, settings)
+
+            if records:
+                vectors = self._embed(
+                    [registration.search_description for registration, _ in records],
+                    embed_batch_size, embed_workers
+                )
+                python_vectorizer = get_vectorizer() is not None
+
+                batch = get_batch_manager()
+                losses = batch.loss_count()
+                for (registration, properties), vector in zip(records, vectors):
+                    if vector is None and python_vectorizer:
+                        # Embedding failed: stored without its hash, the function is embedded
+                        # again on the next start instead of being skipped as unchanged
+                        properties.pop("content_hash", None)
+                    try:
+                        batch.add_object(
+                            collection=settings.COLLECTION_NAME,
+                            properties=properties,
+                            uuid=registration.uuid,
+                            vector=vector
+                        )
+                        registered += 1
+                    except Exception as e:
+                        logger.error("Failed to register function '%s': %s", registration.func.__name__, e)
+                logger.info("Registered %d functions", registered)
+
+                if write and registered:
+                    written = batch.flush()
+                    # Only remember hashes confirmed to be in Weaviate: written directly (not
+                    # through a collector), nothing spooled, kept queued, dropped or
+                    # dead-lettered, and only records with a vector
+                    confirmed = written and batch.client is not None and batch.loss_count() == losses
+                    cache_file = None if settings.COLLECTOR_SOCKET_PATH else settings.REGISTRATION_HASH_CACHE_FILE
+                    hashes = {
+                        registration.uuid: properties["content_hash"]
+                        for registration, properties in records
+                        if "content_hash" in properties
+                    }
+                    if cache_file and confirmed and hashes:
+                        _save_hash_cache(cache_file, _cache_target(settings), hashes)
+        return registered
+
+    def _drop_unchanged(self, records: List[Tuple[PendingRegistration, Dict[str, Any]]],
+                        settings: WeaviateSettings) -> List[Tuple[PendingRegistration, Dict[str, Any]]]:
+        """
+        Removes records whose content_hash is already stored: first checked
+        against the local cache file, then with one bulk fetch from Weaviate
+        for the rest.
+
+        The cache is ignored (and cleared) when the function collection is
+        empty, e.g. after it was recreated. It is not used in collector mode,
+        where it cannot be checked against Weaviate.
+        """
+        # In collector mode the workers do not talk to Weaviate directly
+        collector_mode = bool(settings.COLLECTOR_SOCKET_PATH)
+        cache_file = None if collector_mode else settings.REGISTRATION_HASH_CACHE_FILE
+        target = _cache_target(settings)
+        known = _load_hash_cache(cache_file, target) if cache_file else {}
+        if known:
+            try:
+                stale = count_functions() == 0
+            except Exception as e:
+                logger.warning("Could not check the function collection, ignoring the hash cache: %s", e)
+                known = {}
+            else:
+                if stale:
+                    logger.info("Function collection is empty, clearing the registration hash cache")
+                    _save_hash_cache(cache_file, target, {}, replace=True)
+                    known = {}
+
+        unconfirmed = [
+            registration.uuid for registration, properties in records
+            if known.get(registration.uuid) != properties["content_hash"]
+        ]
+        if unconfirmed and not collector_mode:
+            try:
+                stored = fetch_function_hashes(unconfirmed)
+            except Exception as e:
+                logger.warning("Could not fetch stored function hashes, registering all: %s", e)
+                stored = {}
+            known.update(stored)
+            if cache_file and stored:
+                _save_hash_cache(cache_file, target, stored)
+
+        changed = [
+            (registration, properties) for registration, properties in records
+            if known.get(registration.uuid) != properties["content_hash"]
+        ]
+        if len(changed) < len(records):
+            logger.info("Skipped %d unchanged functions", len(records) - len(changed))
+        return changed
+
+    def _embed(self, descriptions: List[str], batch_size: Optional[int] = None,
+               workers: int = 0) -> List[Optional[List[float]]]:
+        vectorizer = get_vectorizer()
+        if not vectorizer:
+            return [None] * len(descriptions)
+        try:
+            logger.info("Vectorizing %d function descriptions using Python vectorizer...", len(descriptions))
+            size = batch_size if batch_size and batch_size > 0 else len(descriptions)
+            pool = create_encode_pool(workers, size) if workers > 1 and len(descriptions) > size else None
+            encoder = pool or vectorizer
+            # With numpy, float32 rows go to the batch manager as they are; converting
+            # them for the wire is deferred to the Weaviate client layer
+            embed = encoder.embed_batch_numpy if numpy_available() else encoder.embed_batch
+            if pool is not None:
+                with pool:
+                    vectors = list(embed(descriptions))
+            else:
+                vectors = [
+                    vector
+                    for start in range(0, len(descriptions), size)
+                    for vector in embed(descriptions[start:start + size])
+                ]
+
+            if len(vectors) != len(descriptions):
+                raise ValueError(f"expected {len(descriptions)} vectors, got {len(vectors)}")
+            return vectors
+        except Exception as e:
+            logger.warning("Failed to vectorize function descriptions with Python client: %s", e)
+            return [None] * len(descriptions)
+
+    def _schedule(self, delay: float):
+        with self._lock:
+            if self._timer is not None or not self._pending:
+                return
+            self._timer = threading.Timer(delay, self._flush_in_background)
+            self._timer.name = "vectorwave-registration"
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("Background function registration failed: %s", e)
+
+    def _flush_at_exit(self):
+        if self._pid != os.getpid():
+            return
+        try:
+            # The batch manager may already be closed by its own atexit hook
+            self.flush(write=True)
+        except Exception as e:
+            logger.error("Function registration at exit failed: %s", e)
+
+    def _reset_after_fork(self):
+        # The parent registers its pending functions; the timer thread is gone
+        self._lock = threading.Lock()
+        self._pending.clear()
+        self._timer = None
+        self._pid = os.getpid()
+
+
+@lru_cache(None)
+def get_function_registry() -> FunctionRegistry:
+    registry = FunctionRegistry()
+    atexit.register(registry._flush_at_exit)
+    return registry
+
+
+def _reset_after_fork():
+    if get_function_registry.cache_info().currsize:
+        get_function_registry()._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def flush_registrations(write: bool = False) -> int:
+    """
+    Registers every pending @vectorize function now (see FunctionRegistry.flush).
+    """
+    return get_function_registry().flush(write=write)
+
+
+def import_modules(names: List[str]) -> List[str]:
+    """
+    Imports the given modules; for packages, every submodule too. Importing
+    runs the @vectorize decorators, which fills the pending registry.
+    Returns the names of the imported modules.
+    """
+    imported = []
+    for name in names:
+        module = importlib.import_module(name)
+        imported.append(name)
+        if hasattr(module, "__path__"):
+            for info in pkgutil.walk_packages(module.__path__, prefix=f"{name}."):
+                try:
+                    importlib.import_module(info.name)
+                    imported.append(info.name)
+                except Exception as e:
+                    logger.warning("Could not import '%s': %s", info.name, e)
+    return imported
@@ -1,7 +1,7 @@
 import logging
+import os
 import weaviate
 import weaviate.classes.config as wvc  # (wvc = Weaviate Classes Config)
-import weaviate.config as wvc_config
 from weaviate.config import AdditionalConfig
 from vectorwave.models.db_config import WeaviateSettings
 from vectorwave.exception.exceptions import (
@@ -12,7 +12,7 @@ from vectorwave.exception.exceptions import (
 from functools import lru_cache
 from weaviate.exceptions import WeaviateConnectionError as WeaviateClientConnectionError
 from vectorwave.models.db_config import get_weaviate_settings
-from vectorwave.vectorizer.factory import get_vectorizer
+from vectorwave.vectorizer.factory import warm_up_vectorizer
 
 # Create module-level logger
 logger = logging.getLogger(__name__)
@@ -53,6 +53,38 @@ def get_weaviate_client(settings: WeaviateSettings) -> weaviate.WeaviateClient:
     return client
 
 
+async def get_weaviate_async_client(settings: WeaviateSettings) -> weaviate.WeaviateAsyncClient:
+    """
+    Creates, connects and returns an asyncio-native Weaviate client.
+    Must be awaited on the event loop that will use the client.
+
+    [Raises]
+    - WeaviateConnectionError: If connection fails.
+    - WeaviateNotReadyError: If connected, but the server is not ready.
+    """
+
+    client: weaviate.WeaviateAsyncClient
+
+    try:
+        client = weaviate.use_async_with_local(
+            host=settings.WEAVIATE_HOST,
+            port=settings.WEAVIATE_PORT,
+            grpc_port=settings.WEAVIATE_GRPC_PORT
+        )
+        await client.connect()
+    except WeaviateClientConnectionError as e:
+        raise WeaviateConnectionError(f"Failed to connect to Weaviate (async): {e}")
+    except Exception as e:
+        raise WeaviateConnectionError(f"An unknown error occurred while connecting to Weaviate (async): {e}")
+
+    if not await client.is_ready():
+        await client.close()
+        raise WeaviateNotReadyError("Connected to Weaviate, but the server is not ready.")
+
+    logger.info("Weaviate async client connected successfully")
+    return client
+
+
 @lru_cache()
 def get_cached_client() -> weaviate.WeaviateClient:
     """
@@ -65,6 +97,13 @@ def get_cached_client() -> weaviate.WeaviateClient:
     return client
 
 
+if hasattr(os, "register_at_fork"):
+    # A gRPC channel must not be shared across fork(); the child connects again
+    # on its next get_cached_client() call. The inherited client is only dropped,
+    # closing it would also close the parent's connection.
+    os.register_at_fork(after_in_child=get_cached_client.cache_clear)
+
+
 def create_vectorwave_schema(client: weaviate.WeaviateClient, settings: WeaviateSettings):
     """
     Defines and creates the VectorWaveFunctions collection schema.
@@ -115,6 +154,11 @@ def create_vectorwave_schema(client: weaviate.WeaviateClient, settings: Weaviate
             data_type=wvc.DataType.TEXT,
             description="User-provided context about what happens next (from @vectorize)"
         ),
+        wvc.Property(
+            name="content_hash",
+            data_type=wvc.DataType.TEXT,
+            description="Hash of the registered definition, used to skip re-registering unchanged functions"
+        ),
     ]
 
     # 4. Parse Custom Properties (loaded from JSON file via settings object)
@@ -166,7 +210,7 @@ def create_vectorwave_schema(client: weaviate.WeaviateClient, settings: Weaviate
 
     logger.info("Configuring vectorizer: %s", vectorizer_name_setting)
 
-    if vectorizer_name_setting == "huggingface" or vectorizer_name_setting == "openai_client":
+    if vectorizer_name_setting in ("huggingface", "openai_client", "embedding_server"):
         print(f"Python-based vectorizer ('{vectorizer_name_setting}') is active.")
         print("Setting Weaviate schema vectorizer to 'none'.")
         vector_config = wvc.Configure.Vectorizer.none()
@@ -273,6 +317,11 @@ def create_execution_schema(client: weaviate.WeaviateClient, settings: WeaviateS
             data_type=wvc.DataType.TEXT,
             description="Categorized error code for the failure (e.g., 'INVALID_INPUT', 'TIMEOUT')"
         ),
+        wvc.Property(
+            name="sample_rate",
+            data_type=wvc.DataType.NUMBER,
+            description="Effective probability this trace was sampled with (weight counts by 1 / sample_rate)"
+        ),
     ]
 
     if settings.custom_properties:
@@ -315,16 +364,26 @@ def create_execution_schema(client: weaviate.WeaviateClient, settings: WeaviateS
         raise SchemaCreationError(f"Error during execution schema creation: {e}")
 
 
-def initialize_database():
+def initialize_database(warm_up: bool = True):
     """
     Helper function to initialize both the client and the two schemas.
+
+    With warm_up=True the Python vectorizer is created first. With
+    HF_BACKGROUND_LOAD=true a HuggingFace model then loads in the background
+    while Weaviate is set up; otherwise it is loaded before this continues.
     """
     try:
         settings = get_weaviate_settings()
+        if warm_up:
+            warm_up_vectorizer()
         client = get_cached_client()
         if client:
             create_vectorwave_schema(client, settings)
             create_execution_schema(client, settings)
+
+            # Imported here: the registry depends on the batch manager, which imports this module
+            from ..core.registry import flush_registrations
+            flush_registrations(write=True)
             return client
     except Exception as e:
         logger.error("Failed to initialize VectorWave database: %s", e)
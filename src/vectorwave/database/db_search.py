@@ -8,6 +8,7 @@ from weaviate.collections.classes.filters import _Filters
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from .db import get_cached_client
 from ..exception.exceptions import WeaviateConnectionError
+from ..vectorizer.base import numpy_available
 from ..vectorizer.factory import get_vectorizer
 
 import uuid
@@ -44,7 +45,7 @@ def search_functions(query: str, limit: int = 5, filters: Optional[Dict[str, Any
         if vectorizer:
             print("[VectorWave] Searching with Python client (near_vector)...")
             try:
-                query_vector = vectorizer.embed(query)
+                query_vector = vectorizer.embed_numpy(query) if numpy_available() else vectorizer.embed(query)
             except Exception as e:
                 print(f"Error vectorizing query with Python client: {e}")
                 raise WeaviateConnectionError(f"Query vectorization failed: {e}")
@@ -119,4 +120,54 @@ def search_executions(
         return results
 
     except Exception as e:
-        raise WeaviateConnectionError(f"Failed to execute 'search_executions': {e}")
\ No newline at end of file
+        raise WeaviateConnectionError(f"Failed to execute 'search_executions': {e}")
+
+# Well below Weaviate's QUERY_MAXIMUM_RESULTS (10000 by default)
+FETCH_HASHES_PAGE_SIZE = 1000
+
+
+def count_functions() -> int:
+    """
+    Returns the number of objects in the [VectorWaveFunctions] collection.
+    """
+    try:
+        settings: WeaviateSettings = get_weaviate_settings()
+        client: weaviate.WeaviateClient = get_cached_client()
+
+        collection = client.collections.get(settings.COLLECTION_NAME)
+        return collection.aggregate.over_all(total_count=True).total_count or 0
+
+    except Exception as e:
+        raise WeaviateConnectionError(f"Failed to execute 'count_functions': {e}")
+
+
+def fetch_function_hashes(uuids: List[str]) -> Dict[str, str]:
+    """
+    Fetches the stored 'content_hash' of the given function objects from the
+    [VectorWaveFunctions] collection, one query per FETCH_HASHES_PAGE_SIZE UUIDs.
+    Returns {uuid: content_hash}; objects without a hash are left out.
+    """
+    if not uuids:
+        return {}
+    try:
+        settings: WeaviateSettings = get_weaviate_settings()
+        client: weaviate.WeaviateClient = get_cached_client()
+
+        collection = client.collections.get(settings.COLLECTION_NAME)
+        hashes: Dict[str, str] = {}
+        for start in range(0, len(uuids), FETCH_HASHES_PAGE_SIZE):
+            page = uuids[start:start + FETCH_HASHES_PAGE_SIZE]
+            response = collection.query.fetch_objects(
+                filters=wvc.query.Filter.by_id().contains_any(page),
+                return_properties=["content_hash"],
+                limit=len(page)
+            )
+            hashes.update(
+                (str(obj.uuid), obj.properties["content_hash"])
+                for obj in response.objects
+                if obj.properties.get("content_hash")
+            )
+        return hashes
+
+    except Exception as e:
+        raise WeaviateConnectionError(f"Failed to execute 'fetch_function_hashes': {e}")
@@ -0,0 +1,50 @@
+import json
+import socket
+import struct
+from typing import Any, Optional
+
+# Every message is a 4-byte big-endian length followed by a UTF-8 JSON document
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def encode_frame(message: Any) -> bytes:
+    payload = json.dumps(message, default=str, ensure_ascii=False).encode("utf-8")
+    if len(payload) > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return _HEADER.pack(len(payload)) + payload
+
+
+def send_frame(sock: socket.socket, message: Any):
+    sock.sendall(encode_frame(message))
+
+
+def recv_frame(sock: socket.socket) -> Optional[Any]:
+    """
+    Reads one frame. Returns None if the peer closed the connection cleanly
+    before a new frame started.
+    """
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Incoming frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    payload = _recv_exactly(sock, length)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a frame")
+    return json.loads(payload.decode("utf-8"))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ConnectionError("Connection closed in the middle of a frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
@@ -23,7 +23,7 @@ class WeaviateSettings(BaseSettings):
     EXECUTION_COLLECTION_NAME: str = "VectorWaveExecutions"
     IS_VECTORIZE_COLLECTION_NAME: bool = True
 
-    # "weaviate_module", "huggingface", "openai_client", "none"
+    # "weaviate_module", "huggingface", "openai_client", "embedding_server", "none"
     VECTORIZER: str = "weaviate_module"
 
 
@@ -32,11 +32,150 @@ class WeaviateSettings(BaseSettings):
     WEAVIATE_GENERATIVE_MODULE: str = "generative-openai"
 
     OPENAI_API_KEY: Optional[str] = None
+    # OpenAI embeddings client (VECTORIZER="openai_client"): inputs are split into
+    # requests of at most OPENAI_MAX_BATCH_SIZE texts / OPENAI_MAX_BATCH_TOKENS
+    # estimated tokens, OPENAI_MAX_CONCURRENCY requests run at once, and 429/5xx
+    # errors are retried OPENAI_MAX_RETRIES times with backoff.
+    OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_MAX_BATCH_SIZE: int = 2048
+    OPENAI_MAX_BATCH_TOKENS: int = 300000
+    OPENAI_MAX_CONCURRENCY: int = 4
+    OPENAI_MAX_RETRIES: int = 5
     HF_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # Load the HuggingFace model (and run one warm-up encode) in a background
+    # thread; only calls that need it before it is ready wait for it. Off by
+    # default: a model that fails to load then surfaces as RuntimeError on
+    # every embed() instead of get_vectorizer() returning None.
+    HF_BACKGROUND_LOAD: bool = False
+
+    # CPU runtime for the HuggingFace model: "torch" (fp32), "torch_int8"
+    # (dynamic quantization) or "onnx" (ONNX Runtime; set HF_ONNX_FILE_NAME to
+    # use a quantized export such as "onnx/model_qint8_avx2.onnx").
+    HF_BACKEND: str = "torch"
+    HF_ONNX_FILE_NAME: Optional[str] = None
+
+    # Bulk jobs ('vectorwave register') spread embedding over HF_POOL_WORKERS
+    # processes (0/1 embeds in-process), HF_POOL_CHUNK_SIZE texts per task.
+    HF_POOL_WORKERS: int = 0
+    HF_POOL_CHUNK_SIZE: int = 256
+
+    # VECTORIZER="embedding_server": embed through the local server started
+    # with 'vectorwave embedding-server' (one model copy per host) on this socket.
+    EMBEDDING_SERVER_SOCKET_PATH: Optional[str] = None
+    EMBEDDING_SERVER_TIMEOUT_SEC: float = 30.0
+
+    # Embedding cache around the Python vectorizer: an in-memory LRU of
+    # EMBEDDING_CACHE_SIZE vectors (0 disables caching) and, when
+    # EMBEDDING_CACHE_DB_PATH is set, a SQLite store of up to
+    # EMBEDDING_CACHE_DB_MAX_ENTRIES vectors shared across restarts.
+    EMBEDDING_CACHE_SIZE: int = 4096
+    EMBEDDING_CACHE_DB_PATH: Optional[str] = None
+    EMBEDDING_CACHE_DB_MAX_ENTRIES: int = 100000
+
+    # Concurrent embed() calls are coalesced into one embed_batch() call of up
+    # to EMBED_BATCH_MAX_SIZE texts (<= 1 disables the dispatcher), waiting at
+    # most EMBED_BATCH_MAX_WAIT_MS for more calls. With 0 ms nothing is delayed;
+    # calls that arrive while a batch is running are sent together next.
+    EMBED_BATCH_MAX_SIZE: int = 64
+    EMBED_BATCH_MAX_WAIT_MS: float = 0.0
+    # A caller whose batch takes longer than this embeds its texts itself
+    # (<= 0 waits indefinitely).
+    EMBED_BATCH_TIMEOUT_SEC: float = 60.0
 
     CUSTOM_PROPERTIES_FILE_PATH: str = ".weaviate_properties"
     FAILURE_MAPPING_FILE_PATH: str = ".vectorwave_errors.json"
 
+    # @vectorize registrations are collected and written together (one
+    # embed_batch + bulk upsert) REGISTRATION_FLUSH_DELAY_SEC after the first
+    # one, on initialize_database()/flush() and at exit. <= 0 disables the
+    # background timer. "immediate" registers each function at decoration time,
+    # "skip" never registers at runtime (done ahead with 'vectorwave register').
+    REGISTRATION_MODE: str = "deferred"
+    REGISTRATION_FLUSH_DELAY_SEC: float = 1.0
+
+    # Each function object stores a content_hash of its definition. Functions
+    # whose hash is already known (REGISTRATION_HASH_CACHE_FILE, then one bulk
+    # fetch from Weaviate) are neither embedded nor written again. The cache is
+    # dropped when the collection is empty and unused in collector mode, but it
+    # cannot tell when single objects were deleted: remove the file then.
+    REGISTRATION_SKIP_UNCHANGED: bool = True
+    REGISTRATION_HASH_CACHE_FILE: Optional[str] = None
+
+    # Global kill switch. While off, traced functions call straight through.
+    # Flip it at runtime with vectorwave.set_tracing_enabled() or by writing
+    # "on"/"off" to TRACING_CONTROL_FILE (polled every TRACING_CONTROL_POLL_SEC).
+    TRACING_ENABLED: bool = True
+    TRACING_CONTROL_FILE: Optional[str] = None
+    TRACING_CONTROL_POLL_SEC: float = 1.0
+
+    # Head sampling: fraction of traces (0.0-1.0) recorded by trace_root,
+    # decided deterministically from the trace_id. @vectorize(sample_rate=...)
+    # overrides it per function.
+    TRACE_SAMPLE_RATE: float = 1.0
+
+    # Tail sampling: spans of a (head-sampled) trace are held in memory until
+    # its root span finishes, then the whole trace is kept if any span failed,
+    # the root took at least TAIL_SLOW_THRESHOLD_MS (overridable per function
+    # with @vectorize(slow_threshold_ms=...)), or with TAIL_BASELINE_RATE.
+    # Traces started while TAIL_MAX_INFLIGHT_TRACES are buffered fall back to
+    # a head decision at TAIL_BASELINE_RATE.
+    TAIL_SAMPLING_ENABLED: bool = False
+    TAIL_SLOW_THRESHOLD_MS: Optional[float] = None
+    TAIL_BASELINE_RATE: float = 0.0
+    TAIL_MAX_SPANS_PER_TRACE: int = 1000
+    TAIL_MAX_INFLIGHT_TRACES: int = 10000
+
+    # Adaptive sampling: per root function name, keeps about
+    # ADAPTIVE_MAX_TRACES_PER_SEC traces per second whatever the call rate,
+    # and always the first ADAPTIVE_MIN_TRACES_PER_WINDOW calls of each
+    # ADAPTIVE_WINDOW_SEC window. Applied after head sampling; every span
+    # records the resulting effective rate in 'sample_rate'.
+    ADAPTIVE_SAMPLING_ENABLED: bool = False
+    ADAPTIVE_MAX_TRACES_PER_SEC: float = 10.0
+    ADAPTIVE_MIN_TRACES_PER_WINDOW: int = 1
+    ADAPTIVE_WINDOW_SEC: float = 1.0
+
+    # Buffered writer: objects are bulk-inserted once BATCH_SIZE is reached
+    # or every BATCH_FLUSH_INTERVAL_SEC seconds, whichever comes first.
+    BATCH_SIZE: int = 100
+    BATCH_FLUSH_INTERVAL_SEC: float = 2.0
+
+    # Bounded export queue drained by a background worker thread.
+    # "drop" discards new objects when the queue is full, "block" waits up to
+    # BATCH_QUEUE_BLOCK_TIMEOUT_SEC for free space before discarding them.
+    BATCH_MAX_QUEUE_SIZE: int = 10000
+    BATCH_QUEUE_FULL_POLICY: str = "drop"
+    BATCH_QUEUE_BLOCK_TIMEOUT_SEC: float = 1.0
+
+    # Optional write-ahead spool (segmented JSONL) used while Weaviate is
+    # unreachable or the queue is full. Disabled when SPOOL_DIR is not set.
+    SPOOL_DIR: Optional[str] = None
+    SPOOL_SEGMENT_MAX_BYTES: int = 8 * 1024 * 1024
+    SPOOL_MAX_BYTES: int = 512 * 1024 * 1024
+    SPOOL_FSYNC_EVERY: int = 100
+    SPOOL_REPLAY_INTERVAL_SEC: float = 10.0
+
+    # Circuit breaker and retries around every Weaviate write/connect attempt.
+    # Retries wait a jittered exponential delay (full jitter) between attempts.
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT_SEC: float = 30.0
+    WRITE_MAX_RETRIES: int = 3
+    WRITE_BACKOFF_BASE_SEC: float = 0.5
+    WRITE_BACKOFF_MAX_SEC: float = 10.0
+
+    # Objects Weaviate rejects permanently are kept here for inspection/replay
+    DEAD_LETTER_MAX_SIZE: int = 1000
+
+    # Send batches to a per-host collector process over this Unix socket
+    # instead of connecting to Weaviate from every worker process.
+    COLLECTOR_SOCKET_PATH: Optional[str] = None
+    COLLECTOR_TIMEOUT_SEC: float = 5.0
+
+    # Route spans of async traces through the asyncio-native exporter
+    # (WeaviateAsyncClient + asyncio.Queue) instead of the worker thread.
+    ASYNC_EXPORTER: bool = False
+
     custom_properties: Optional[Dict[str, Dict[str, Any]]] = None
     global_custom_values: Optional[Dict[str, Any]] = None
     failure_mapping: Optional[Dict[str, str]] = None
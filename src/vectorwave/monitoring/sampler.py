@@ -0,0 +1,101 @@
+import logging
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from ..models.db_config import get_weaviate_settings
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class _Window:
+    __slots__ = ("start", "seen", "kept", "probability")
+
+    def __init__(self, start: float, probability: float):
+        self.start = start
+        self.seen = 0
+        self.kept = 0
+        self.probability = probability
+
+
+class AdaptiveSampler:
+    """
+    Per-function, rate-limited trace sampler.
+
+    Time is cut into windows of window_sec seconds, tracked separately for
+    every function name. The keep probability of a window is
+    max_per_second * window_sec divided by the number of calls seen in the
+    previous window, so the number of stored traces stays roughly flat when
+    traffic spikes. On top of that:
+
+    - the first min_per_window calls of every window are always kept, so
+      rarely called functions are still sampled;
+    - no more than max_per_second * window_sec traces are kept per window,
+      which bounds a spike that starts in the middle of a window.
+
+    should_sample() returns the probability a kept call was sampled with
+    (1.0 for guaranteed samples), or None for a dropped call. Weighting each
+    stored trace by 1 / rate gives an estimate of the real call count.
+    """
+
+    def __init__(self, max_per_second: float, min_per_window: int = 1, window_sec: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, rand: Callable[[], float] = random.random):
+        self.window_sec = window_sec if window_sec > 0 else 1.0
+        self.max_per_window = max(1, int(max_per_second * self.window_sec))
+        self.min_per_window = max(0, min(min_per_window, self.max_per_window))
+        self._clock = clock
+        self._rand = rand
+
+        self._lock = threading.Lock()
+        self._windows: Dict[str, _Window] = {}
+
+    def should_sample(self, function_name: str) -> Optional[float]:
+        now = self._clock()
+        with self._lock:
+            window = self._windows.get(function_name)
+            if window is None:
+                window = self._windows[function_name] = _Window(now, 1.0)
+            elif now - window.start >= self.window_sec:
+                window = self._windows[function_name] = self._next_window(window, now)
+
+            window.seen += 1
+            if window.kept < self.min_per_window:
+                window.kept += 1
+                return 1.0
+            if window.kept >= self.max_per_window:
+                return None
+            if window.probability >= 1.0 or self._rand() < window.probability:
+                window.kept += 1
+                return window.probability
+            return None
+
+    def rate(self, function_name: str) -> float:
+        """Current keep probability for function_name (1.0 if unseen)."""
+        with self._lock:
+            window = self._windows.get(function_name)
+            return window.probability if window is not None else 1.0
+
+    def _next_window(self, previous: _Window, now: float) -> _Window:
+        # An idle gap longer than one window means the previous count is stale
+        if now - previous.start >= 2 * self.window_sec or previous.seen <= self.max_per_window:
+            return _Window(now, 1.0)
+        return _Window(now, self.max_per_window / previous.seen)
+
+
+@lru_cache(None)
+def get_adaptive_sampler() -> AdaptiveSampler:
+    settings = get_weaviate_settings()
+    return AdaptiveSampler(
+        max_per_second=settings.ADAPTIVE_MAX_TRACES_PER_SEC,
+        min_per_window=settings.ADAPTIVE_MIN_TRACES_PER_WINDOW,
+        window_sec=settings.ADAPTIVE_WINDOW_SEC
+    )
+
+
+if hasattr(os, "register_at_fork"):
+    # The sampler lock may be held by a thread that does not exist in the child
+    os.register_at_fork(after_in_child=get_adaptive_sampler.cache_clear)
@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from ..models.db_config import get_weaviate_settings
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+_OFF_VALUES = {"0", "off", "false", "no", "disabled"}
+_ON_VALUES = {"1", "on", "true", "yes", "enabled"}
+
+
+class TracingSwitch:
+    """
+    Process-wide on/off switch for tracing, checked first by every traced
+    call. While off, @vectorize/trace_root/trace_span call the original
+    function directly.
+
+    The initial state comes from TRACING_ENABLED. It can be flipped at runtime
+    with set_tracing_enabled(), or by writing 'on'/'off' to
+    TRACING_CONTROL_FILE, which a daemon thread polls every
+    TRACING_CONTROL_POLL_SEC seconds. The most recent change wins; removing
+    the file restores TRACING_ENABLED.
+    """
+
+    def __init__(self):
+        # Plain attribute read on the hot path; writes are atomic
+        self.enabled = True
+        self._configured = False
+        self._lock = threading.Lock()
+        self._control_file: Optional[str] = None
+        self._poll_interval = 1.0
+        self._default = True
+        self._last_mtime: Optional[float] = None
+        self._watcher: Optional[threading.Thread] = None
+
+    def configure(self):
+        """Loads the settings once; called when the first function is traced."""
+        if self._configured:
+            return
+        with self._lock:
+            if self._configured:
+                return
+            settings = get_weaviate_settings()
+            self._default = settings.TRACING_ENABLED
+            self.enabled = settings.TRACING_ENABLED
+            self._control_file = settings.TRACING_CONTROL_FILE
+            self._poll_interval = max(0.05, settings.TRACING_CONTROL_POLL_SEC)
+            self._configured = True
+
+        if self._control_file:
+            self.check_control_file()
+            self._start_watcher()
+
+    def set(self, enabled: bool):
+        self.configure()
+        if self.enabled != enabled:
+            logger.info("Tracing %s", "enabled" if enabled else "disabled")
+        self.enabled = enabled
+
+    def check_control_file(self):
+        """Applies the control file if it changed since the last check."""
+        path = self._control_file
+        if not path:
+            return
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            if self._last_mtime is not None:
+                self._last_mtime = None
+                self.set(self._default)
+            return
+        except OSError as e:
+            logger.warning("Could not stat tracing control file '%s': %s", path, e)
+            return
+
+        if mtime == self._last_mtime:
+            return
+        self._last_mtime = mtime
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read().strip().lower()
+        except OSError as e:
+            logger.warning("Could not read tracing control file '%s': %s", path, e)
+            return
+
+        if value in _OFF_VALUES:
+            self.set(False)
+        elif value in _ON_VALUES:
+            self.set(True)
+        else:
+            logger.warning("Ignoring unknown value %r in tracing control file '%s'", value, path)
+
+    def reset(self):
+        """Forgets the loaded settings and runtime changes (used by tests)."""
+        with self._lock:
+            self.enabled = True
+            self._configured = False
+            self._last_mtime = None
+            self._watcher = None
+
+    def _start_watcher(self):
+        self._watcher = threading.Thread(
+            target=self._watch, name="vectorwave-tracing-switch", daemon=True
+        )
+        self._watcher.start()
+
+    def _watch(self):
+        me = threading.current_thread()
+        while self._watcher is me:
+            time.sleep(self._poll_interval)
+            try:
+                self.check_control_file()
+            except Exception as e:
+                logger.error("Tracing control file check failed: %s", e)
+
+
+tracing_switch = TracingSwitch()
+
+
+def set_tracing_enabled(enabled: bool):
+    """Turns tracing on or off for the whole process, effective immediately."""
+    tracing_switch.set(bool(enabled))
+
+
+def is_tracing_enabled() -> bool:
+    tracing_switch.configure()
+    return tracing_switch.enabled
+
+
+def _restart_watcher_after_fork():
+    # Threads do not survive fork(); keep the current state, restart polling
+    tracing_switch._lock = threading.Lock()
+    if tracing_switch._control_file and tracing_switch._configured:
+        tracing_switch._start_watcher()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_watcher_after_fork)
@@ -1,77 +1,376 @@
 import logging
 import inspect
+import os
+import random
+import threading
 import time
 import traceback
+import zlib
 from functools import wraps
 from contextvars import ContextVar
 from typing import Optional, List, Dict, Any, Callable
-from uuid import uuid4
 from datetime import datetime, timezone
 
 from ..batch.batch import get_batch_manager
+from ..batch.async_batch import get_async_batch_manager
+from .sampler import get_adaptive_sampler
+from .switch import tracing_switch
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
+_UUID4_MASK = ~((0xf000 << 64) | (0xc000 << 48))
+_UUID4_BITS = (0x4000 << 64) | (0x8000 << 48)
+
+
+def _new_id() -> str:
+    """
+    Random version-4 UUID string for trace and span ids, about 3x cheaper
+    than str(uuid4()). Ids need to be unique, not unpredictable, so the
+    (fork-reseeded) random module is used instead of os.urandom.
+    """
+    h = '%032x' % (random.getrandbits(128) & _UUID4_MASK | _UUID4_BITS)
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# (second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_last_second = (None, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time in ISO 8601 (same text as datetime.isoformat() with
+    microseconds); the date/time part is formatted once per second.
+    """
+    global _last_second
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _last_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _last_second = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}+00:00"
+
+
 class TraceCollector:
-    def __init__(self, trace_id: str):
+    def __init__(self, trace_id: str, is_async: bool = False, tail_sampling: bool = False,
+                 sample_rate: float = 1.0, head_rate: float = 1.0):
         self.trace_id = trace_id
+        # Effective sampling probability, stored on every span for re-weighting
+        self.sample_rate = sample_rate
+        self.head_rate = head_rate
         self.settings: WeaviateSettings = get_weaviate_settings()
-        self.batch = get_batch_manager()
+        # Async traces export through the event loop when ASYNC_EXPORTER is on
+        if is_async and self.settings.ASYNC_EXPORTER:
+            self.batch = get_async_batch_manager()
+        else:
+            self.batch = get_batch_manager()
+
+        # Tail sampling: spans wait in pending_spans until finish() decides
+        self.tail_sampling = tail_sampling
+        self.pending_spans: List[Dict[str, Any]] = []
+        self.has_error = False
+        self.overflow_count = 0
+        self._tail_decision: Optional[bool] = None
+
+    def record_span(self, properties: Dict[str, Any]):
+        """
+        Exports a finished span, or buffers it while a tail-sampling decision
+        for the trace is pending. Spans beyond TAIL_MAX_SPANS_PER_TRACE are
+        counted in overflow_count and not kept.
+        """
+        if not self.tail_sampling or self._tail_decision is True:
+            self._export(properties)
+            return
+        if self._tail_decision is False:
+            return
+
+        if properties.get("status") == "ERROR":
+            self.has_error = True
+        if len(self.pending_spans) >= self.settings.TAIL_MAX_SPANS_PER_TRACE:
+            self.overflow_count += 1
+            return
+        self.pending_spans.append(properties)
+
+    def finish(self, root_duration_ms: float, slow_threshold_ms: Optional[float] = None) -> bool:
+        """
+        Called when the root span returns. Under tail sampling, keeps the
+        whole trace if any span failed, the root took at least the slow
+        threshold, or the trace falls into TAIL_BASELINE_RATE; otherwise the
+        buffered spans are discarded. Returns whether the trace is kept.
+        """
+        if not self.tail_sampling:
+            return True
+        if self._tail_decision is not None:
+            return self._tail_decision
+
+        _release_tail_slot()
+        threshold = slow_threshold_ms if slow_threshold_ms is not None else self.settings.TAIL_SLOW_THRESHOLD_MS
+        baseline = self.settings.TAIL_BASELINE_RATE
+        if self.has_error or (threshold is not None and root_duration_ms >= threshold):
+            keep = True
+        else:
+            keep = is_trace_sampled(self.trace_id, baseline)
+            if keep:
+                # Same trace_id hash as the head decision, so both hold with min(head, baseline)
+                self._scale_sample_rate(min(1.0, baseline / self.head_rate) if self.head_rate > 0 else 1.0)
+        self._tail_decision = keep
+
+        pending, self.pending_spans = self.pending_spans, []
+        if keep:
+            if self.overflow_count:
+                logger.warning(
+                    "Trace %s exceeded TAIL_MAX_SPANS_PER_TRACE, %d spans were not kept",
+                    self.trace_id, self.overflow_count
+                )
+            for properties in pending:
+                self._export(properties)
+        return keep
+
+    def _scale_sample_rate(self, factor: float):
+        self.sample_rate *= factor
+        for properties in self.pending_spans:
+            properties["sample_rate"] = self.sample_rate
+
+    def _export(self, properties: Dict[str, Any]):
+        self.batch.add_object(
+            collection=self.settings.EXECUTION_COLLECTION_NAME,
+            properties=properties
+        )
+
+
+# Number of traces currently buffering spans for a tail-sampling decision
+_tail_slots_lock = threading.Lock()
+_tail_inflight = 0
+
+
+def _acquire_tail_slot(max_inflight: int) -> bool:
+    global _tail_inflight
+    with _tail_slots_lock:
+        if _tail_inflight >= max_inflight:
+            return False
+        _tail_inflight += 1
+        return True
+
+
+def _release_tail_slot():
+    global _tail_inflight
+    with _tail_slots_lock:
+        _tail_inflight = max(0, _tail_inflight - 1)
+
+
+def _reset_tail_slots():
+    global _tail_slots_lock, _tail_inflight
+    # Traces buffered by other threads of the parent do not exist in the child
+    _tail_slots_lock = threading.Lock()
+    _tail_inflight = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_tail_slots)
+
+
+class _NotSampled:
+    """
+    Marker stored in current_tracer_var for a trace the sampler rejected.
+    It is not None, so nested trace_root calls don't start a new trace, and
+    it is falsy, so every nested trace_span takes its existing no-tracer
+    fast path (no timing, no attribute capture, no span record).
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
 
+NOT_SAMPLED = _NotSampled()
 
 current_tracer_var: ContextVar[Optional[TraceCollector]] = ContextVar('current_tracer', default=None)
 
 
-def trace_root() -> Callable:
+def is_trace_sampled(trace_id: str, sample_rate: float) -> bool:
+    """
+    Deterministic head-sampling decision: the same trace_id always gives the
+    same answer for a given rate, so services sharing a trace_id agree.
+    """
+    if sample_rate >= 1.0:
+        return True
+    if sample_rate <= 0.0:
+        return False
+    return zlib.crc32(trace_id.encode("utf-8")) < sample_rate * 0x100000000
+
+
+def _start_trace(kwargs: Dict[str, Any], sample_rate: Optional[float], is_async: bool, function_name: str):
+    trace_id = kwargs.pop('trace_id', None) or _new_id()
+    settings = get_weaviate_settings()
+    head_rate = sample_rate if sample_rate is not None else settings.TRACE_SAMPLE_RATE
+    if not is_trace_sampled(trace_id, head_rate):
+        return NOT_SAMPLED
+    head_rate = min(1.0, head_rate)
+    effective_rate = head_rate
+
+    if settings.ADAPTIVE_SAMPLING_ENABLED:
+        adaptive_rate = get_adaptive_sampler().should_sample(function_name)
+        if adaptive_rate is None:
+            return NOT_SAMPLED
+        effective_rate *= adaptive_rate
+
+    if settings.TAIL_SAMPLING_ENABLED:
+        if _acquire_tail_slot(settings.TAIL_MAX_INFLIGHT_TRACES):
+            return TraceCollector(trace_id=trace_id, is_async=is_async, tail_sampling=True,
+                                  sample_rate=effective_rate, head_rate=head_rate)
+        # Too many traces buffered: decide up front at the baseline rate
+        logger.debug("Tail sampling buffer full, head-sampling trace %s", trace_id)
+        baseline = settings.TAIL_BASELINE_RATE
+        if not is_trace_sampled(trace_id, baseline):
+            return NOT_SAMPLED
+        effective_rate *= min(1.0, baseline / head_rate)
+
+    return TraceCollector(trace_id=trace_id, is_async=is_async,
+                          sample_rate=effective_rate, head_rate=head_rate)
+
+
+def _finish_trace(tracer, start_time: float, slow_threshold_ms: Optional[float]):
+    if not tracer or not tracer.tail_sampling:
+        return
+    try:
+        tracer.finish((time.perf_counter() - start_time) * 1000, slow_threshold_ms)
+    except Exception as e:
+        logger.error("Failed to finish trace %s: %s", tracer.trace_id, e)
+
+
+def trace_root(sample_rate: Optional[float] = None, slow_threshold_ms: Optional[float] = None) -> Callable:
     """
     Decorator factory for the workflow's entry point function.
     Creates and sets the TraceCollector in ContextVar.
+
+    sample_rate (0.0-1.0) overrides the global TRACE_SAMPLE_RATE setting for
+    traces started by this function. The decision is made once per trace,
+    from its trace_id, and applies to every nested span.
+
+    slow_threshold_ms overrides TAIL_SLOW_THRESHOLD_MS for traces started by
+    this function when tail sampling is enabled.
     """
 
     def decorator(func: Callable) -> Callable:
+        switch = tracing_switch
+        switch.configure()
 
         # check the original function is async
         if inspect.iscoroutinefunction(func):
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
+                if not switch.enabled:
+                    kwargs.pop('trace_id', None)
+                    return await func(*args, **kwargs)
                 if current_tracer_var.get() is not None:
                     # then using await
                     return await func(*args, **kwargs)
 
-                trace_id = kwargs.pop('trace_id', str(uuid4()))
-                tracer = TraceCollector(trace_id=trace_id)
+                tracer = _start_trace(kwargs, sample_rate, is_async=True, function_name=func.__name__)
                 token = current_tracer_var.set(tracer)
+                start_time = time.perf_counter()
 
                 try:
                     # ditto
                     return await func(*args, **kwargs)
                 finally:
                     current_tracer_var.reset(token)
+                    _finish_trace(tracer, start_time, slow_threshold_ms)
 
             return async_wrapper
 
         else: # original sync logic
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
+                if not switch.enabled:
+                    kwargs.pop('trace_id', None)
+                    return func(*args, **kwargs)
                 if current_tracer_var.get() is not None:
                     return func(*args, **kwargs)
 
-                trace_id = kwargs.pop('trace_id', str(uuid4()))
-                tracer = TraceCollector(trace_id=trace_id)
+                tracer = _start_trace(kwargs, sample_rate, is_async=False, function_name=func.__name__)
                 token = current_tracer_var.set(tracer)
+                start_time = time.perf_counter()
 
                 try:
                     return func(*args, **kwargs)
                 finally:
                     current_tracer_var.reset(token)
+                    _finish_trace(tracer, start_time, slow_threshold_ms)
 
             return sync_wrapper
 
     return decorator
 
 
+def _capture_attributes(function_name: str, attributes_to_capture: List[str], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    captured_attributes = {}
+    try:
+        for attr_name in attributes_to_capture:
+            if attr_name in kwargs:
+                value = kwargs[attr_name]
+                if not isinstance(value, (str, int, float, bool, list, dict, type(None))):
+                    value = str(value)
+                captured_attributes[attr_name] = value
+    except Exception as e:
+        logger.warning("Failed to capture attributes for '%s': %s", function_name, e)
+    return captured_attributes
+
+
+def _resolve_error_code(e: Exception, settings: WeaviateSettings) -> str:
+    """
+    error_code attribute of the exception first, then the failure mapping
+    (.vectorwave_errors.json), then the exception class name.
+    """
+    try:
+        error_code = None
+        if hasattr(e, 'error_code'):
+            error_code = str(e.error_code)
+
+        elif settings.failure_mapping:
+            exception_class_name = type(e).__name__
+            if exception_class_name in settings.failure_mapping:
+                error_code = settings.failure_mapping[exception_class_name]
+
+        if not error_code:
+            error_code = type(e).__name__
+        return error_code
+    except Exception as e_code:
+        logger.warning(f"Failed to determine error_code: {e_code}")
+        return "UNKNOWN_ERROR_CODE_FAILURE"
+
+
+def _record_span(tracer: TraceCollector, base_properties: Dict[str, Any], start_time: float,
+                 status: str, error_msg: Optional[str], error_code: Optional[str]):
+    """
+    Builds the span record and hands it to the tracer. base_properties holds
+    function_name plus any global values and attributes; they take precedence
+    over the generated fields.
+    """
+    span_properties = {
+        "trace_id": tracer.trace_id,
+        "span_id": _new_id(),
+        "timestamp_utc": _utc_timestamp(),
+        "duration_ms": (time.perf_counter() - start_time) * 1000,
+        "status": status,
+        "error_message": error_msg,
+        "error_code": error_code,
+        "sample_rate": tracer.sample_rate,
+    }
+    span_properties.update(base_properties)
+
+    try:
+        tracer.record_span(span_properties)
+    except Exception as e:
+        logger.error(
+            "Failed to log span for '%s' (trace_id: %s): %s",
+            base_properties.get("function_name"), tracer.trace_id, e
+        )
+
+
 def trace_span(
         _func: Optional[Callable] = None,
         *,
@@ -83,164 +382,171 @@ def trace_span(
     """
 
     def decorator(func: Callable) -> Callable:
+        switch = tracing_switch
+        switch.configure()
 
+        def span_base(tracer: TraceCollector, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            base_properties = {"function_name": func.__name__}
+            if tracer.settings.global_custom_values:
+                base_properties.update(tracer.settings.global_custom_values)
+            if attributes_to_capture:
+                base_properties.update(_capture_attributes(func.__name__, attributes_to_capture, kwargs))
+            return base_properties
 
         if inspect.iscoroutinefunction(func):
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
+                if not switch.enabled:
+                    return await func(*args, **kwargs)
                 tracer = current_tracer_var.get()
                 if not tracer:
-
                     return await func(*args, **kwargs)
 
+                base_properties = span_base(tracer, kwargs)
                 start_time = time.perf_counter()
-                status = "SUCCESS"
-                error_msg = None
-                error_code = None
-                result = None
-
-                captured_attributes = {}
-                if attributes_to_capture:
-                    try:
-                        for attr_name in attributes_to_capture:
-                            if attr_name in kwargs:
-                                value = kwargs[attr_name]
-                                if not isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                                    value = str(value)
-                                captured_attributes[attr_name] = value
-                    except Exception as e:
-                        logger.warning("Failed to capture attributes for '%s': %s", func.__name__, e)
-
+                status, error_msg, error_code = "SUCCESS", None, None
                 try:
-                    result = await func(*args, **kwargs)
+                    return await func(*args, **kwargs)
                 except Exception as e:
                     status = "ERROR"
                     error_msg = traceback.format_exc()
-
-                    try:
-                        if hasattr(e, 'error_code'):
-                            error_code = str(e.error_code)
-
-                        elif tracer.settings.failure_mapping:
-                            exception_class_name = type(e).__name__
-                            if exception_class_name in tracer.settings.failure_mapping:
-                                error_code = tracer.settings.failure_mapping[exception_class_name]
-
-                        if not error_code:
-                            error_code = type(e).__name__
-                    except Exception as e_code:
-                        logger.warning(f"Failed to determine error_code: {e_code}")
-                        error_code = "UNKNOWN_ERROR_CODE_FAILURE"
-                    raise e
+                    error_code = _resolve_error_code(e, tracer.settings)
+                    raise
                 finally:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
-
-                    span_properties = {
-                        "trace_id": tracer.trace_id,
-                        "span_id": str(uuid4()),
-                        "function_name": func.__name__,
-                        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-                        "duration_ms": duration_ms,
-                        "status": status,
-                        "error_message": error_msg,
-                        "error_code": error_code,
-                    }
-
-                    if tracer.settings.global_custom_values:
-                        span_properties.update(tracer.settings.global_custom_values)
-
-                    span_properties.update(captured_attributes)
-
-                    try:
-                        tracer.batch.add_object(
-                            collection=tracer.settings.EXECUTION_COLLECTION_NAME,
-                            properties=span_properties
-                        )
-                    except Exception as e:
-                        logger.error("Failed to log span for '%s' (trace_id: %s): %s", func.__name__, tracer.trace_id, e)
-
-                return result
+                    _record_span(tracer, base_properties, start_time, status, error_msg, error_code)
 
             return async_wrapper
 
         else:
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
+                if not switch.enabled:
+                    return func(*args, **kwargs)
                 tracer = current_tracer_var.get()
                 if not tracer:
                     return func(*args, **kwargs)
 
+                base_properties = span_base(tracer, kwargs)
                 start_time = time.perf_counter()
-                status = "SUCCESS"
-                error_msg = None
-                error_code = None
-                result = None
-
-                captured_attributes = {}
-                if attributes_to_capture:
-                    try:
-                        for attr_name in attributes_to_capture:
-                            if attr_name in kwargs:
-                                value = kwargs[attr_name]
-                                if not isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                                    value = str(value)
-                                captured_attributes[attr_name] = value
-                    except Exception as e:
-                        logger.warning("Failed to capture attributes for '%s': %s", func.__name__, e)
-
+                status, error_msg, error_code = "SUCCESS", None, None
                 try:
-                    result = func(*args, **kwargs)
+                    return func(*args, **kwargs)
                 except Exception as e:
                     status = "ERROR"
                     error_msg = traceback.format_exc()
-
-                    try:
-                        if hasattr(e, 'error_code'):
-                            error_code = str(e.error_code)
-
-                        elif tracer.settings.failure_mapping:
-                            exception_class_name = type(e).__name__
-                            if exception_class_name in tracer.settings.failure_mapping:
-                                error_code = tracer.settings.failure_mapping[exception_class_name]
-
-                        if not error_code:
-                            error_code = type(e).__name__
-                    except Exception as e_code:
-                        logger.warning(f"Failed to determine error_code: {e_code}")
-                        error_code = "UNKNOWN_ERROR_CODE_FAILURE"
-                    raise e
+                    error_code = _resolve_error_code(e, tracer.settings)
+                    raise
                 finally:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
-
-                    span_properties = {
-                        "trace_id": tracer.trace_id,
-                        "span_id": str(uuid4()),
-                        "function_name": func.__name__,
-                        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-                        "duration_ms": duration_ms,
-                        "status": status,
-                        "error_message": error_msg,
-                        "error_code": error_code,
-                    }
-
-                    if tracer.settings.global_custom_values:
-                        span_properties.update(tracer.settings.global_custom_values)
-
-                    span_properties.update(captured_attributes)
-
-                    try:
-                        tracer.batch.add_object(
-                            collection=tracer.settings.EXECUTION_COLLECTION_NAME,
-                            properties=span_properties
-                        )
-                    except Exception as e:
-                        logger.error("Failed to log span for '%s' (trace_id: %s): %s", func.__name__, tracer.trace_id, e)
-
-                return result
+                    _record_span(tracer, base_properties, start_time, status, error_msg, error_code)
 
             return sync_wrapper
 
     if _func is None:
         return decorator
     else:
-        return decorator(_func)
\ No newline at end of file
+        return decorator(_func)
+
+
+def trace_root_span(func: Callable, attributes: Optional[Dict[str, Any]] = None,
+                    sample_rate: Optional[float] = None,
+                    slow_threshold_ms: Optional[float] = None,
+                    attributes_to_capture: Optional[List[str]] = None) -> Callable:
+    """
+    trace_root and trace_span fused into a single wrapper (used by @vectorize).
+
+    Starts a trace when none is active (same sampling rules as trace_root)
+    and records the call as a span carrying the fixed attributes. The span's
+    base record (function_name, global custom values, attributes) is built
+    once here, so a call only pays for timing and the record itself.
+    attributes_to_capture names call keyword arguments copied into the span as
+    in trace_span; a fixed attribute of the same name takes precedence. The
+    wrapped function receives its arguments unchanged, minus a 'trace_id'
+    keyword used to start a trace. While tracing is switched off the wrapper
+    only checks the switch and calls the function.
+    """
+    switch = tracing_switch
+    switch.configure()
+    settings = get_weaviate_settings()
+    function_name = func.__name__
+    base_properties = {"function_name": function_name}
+    if settings.global_custom_values:
+        base_properties.update(settings.global_custom_values)
+    if attributes:
+        base_properties.update(attributes)
+    capture = [name for name in attributes_to_capture or [] if name not in (attributes or {})]
+
+    def span_properties(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if capture:
+            captured = _capture_attributes(function_name, capture, kwargs)
+            if captured:
+                return {**base_properties, **captured}
+        return base_properties
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not switch.enabled:
+                if 'trace_id' in kwargs:
+                    del kwargs['trace_id']
+                return await func(*args, **kwargs)
+
+            tracer = current_tracer_var.get()
+            token = None
+            if tracer is None:
+                tracer = _start_trace(kwargs, sample_rate, is_async=True, function_name=function_name)
+                token = current_tracer_var.set(tracer)
+            elif not tracer:
+                return await func(*args, **kwargs)
+
+            start_time = time.perf_counter()
+            status, error_msg, error_code = "SUCCESS", None, None
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if tracer:
+                    status = "ERROR"
+                    error_msg = traceback.format_exc()
+                    error_code = _resolve_error_code(e, tracer.settings)
+                raise
+            finally:
+                if tracer:
+                    _record_span(tracer, span_properties(kwargs), start_time, status, error_msg, error_code)
+                if token is not None:
+                    current_tracer_var.reset(token)
+                    _finish_trace(tracer, start_time, slow_threshold_ms)
+
+        return async_wrapper
+
+    @wraps(func)
+    def sync_wrapper(*args, **kwargs):
+        if not switch.enabled:
+            if 'trace_id' in kwargs:
+                del kwargs['trace_id']
+            return func(*args, **kwargs)
+
+        tracer = current_tracer_var.get()
+        token = None
+        if tracer is None:
+            tracer = _start_trace(kwargs, sample_rate, is_async=False, function_name=function_name)
+            token = current_tracer_var.set(tracer)
+        elif not tracer:
+            return func(*args, **kwargs)
+
+        start_time = time.perf_counter()
+        status, error_msg, error_code = "SUCCESS", None, None
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if tracer:
+                status = "ERROR"
+                error_msg = traceback.format_exc()
+                error_code = _resolve_error_code(e, tracer.settings)
+            raise
+        finally:
+            if tracer:
+                _record_span(tracer, span_properties(kwargs), start_time, status, error_msg, error_code)
+            if token is not None:
+                current_tracer_var.reset(token)
+                _finish_trace(tracer, start_time, slow_threshold_ms)
+
+    return sync_wrapper
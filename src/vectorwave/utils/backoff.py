@@ -0,0 +1,12 @@
+import random
+from typing import Callable
+
+
+def backoff_delay(attempt: int, base: float, maximum: float,
+                  rand: Callable[[], float] = random.random) -> float:
+    """
+    Exponential backoff with full jitter: a random delay in
+    [0, min(maximum, base * 2 ** attempt)). attempt starts at 0.
+    """
+    ceiling = min(maximum, base * (2 ** attempt))
+    return ceiling * rand()
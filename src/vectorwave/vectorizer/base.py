@@ -1,12 +1,68 @@
+import asyncio
+import importlib.util
 from abc import ABC, abstractmethod
-from typing import List
+from functools import lru_cache
+from typing import Any, List, Optional
+
+
+@lru_cache(None)
+def numpy_available() -> bool:
+    """True if numpy can be imported; the float32 array paths are used only then."""
+    return importlib.util.find_spec("numpy") is not None
+
+
+def vector_to_list(vector: Any) -> Optional[List[float]]:
+    """
+    Converts a vector (list, numpy array, array('f')) to a list of floats.
+    Only for layers that serialize vectors themselves (spool, collector);
+    the Weaviate client accepts numpy arrays as they are.
+    """
+    if vector is None or isinstance(vector, list):
+        return vector
+    if hasattr(vector, "tolist"):
+        return vector.tolist()
+    return list(vector)
+
 
 class BaseVectorizer(ABC):
 
+    # False when the instance holds connections (HTTP pools, sockets) that must
+    # not be shared with a forked child; get_vectorizer() rebuilds those after fork.
+    fork_safe: bool = True
+
+    # Identifies the embedding model (e.g. for cache keys); set by subclasses
+    model_name: str = ""
+
     @abstractmethod
     def embed(self, text: str) -> List[float]:
         pass
 
     @abstractmethod
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        pass
\ No newline at end of file
+        pass
+
+    def embed_numpy(self, text: str):
+        """Like embed(), as a 1-D float32 numpy array."""
+        return self.embed_batch_numpy([text])[0]
+
+    def embed_batch_numpy(self, texts: List[str]):
+        """
+        Like embed_batch(), as one 2-D float32 numpy array (one row per text).
+        Subclasses whose model produces arrays override this to skip the
+        per-element Python floats.
+        """
+        import numpy as np
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.asarray(self.embed_batch(texts), dtype=np.float32)
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the model can be used (see HuggingFaceVectorizer background loading)."""
+        return True
+
+    async def aembed(self, text: str) -> List[float]:
+        return (await self.aembed_batch([text]))[0]
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        # Runs the blocking call in the default executor; overridden where a native async path exists
+        return await asyncio.get_running_loop().run_in_executor(None, self.embed_batch, list(texts))
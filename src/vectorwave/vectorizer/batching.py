@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+from .base import BaseVectorizer
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+# How often a waiting caller checks that the dispatcher thread is still alive
+_LIVENESS_CHECK_SEC = 1.0
+
+
+class _Request:
+    """One embed call waiting in the dispatcher queue."""
+
+    __slots__ = ("texts", "as_numpy", "result", "error", "_on_done")
+
+    def __init__(self, texts: List[str], on_done: Callable[["_Request"], None], as_numpy: bool = False):
+        self.texts = texts
+        self.as_numpy = as_numpy
+        # List of vectors, or a 2-D float32 array when as_numpy is set
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self._on_done = on_done
+
+    def finish(self, result=None, error: Optional[BaseException] = None):
+        self.result = result
+        self.error = error
+        self._on_done(self)
+
+
+class MicroBatchingVectorizer(BaseVectorizer):
+    """
+    Coalesces concurrent embed()/embed_batch() calls into one embed_batch()
+    call of the wrapped vectorizer.
+
+    A daemon thread takes the first queued call, then keeps collecting calls
+    until max_batch_size texts are gathered or max_wait_ms has passed since
+    the first one, runs one batched call and hands every caller its own
+    vectors. With max_wait_ms=0 no latency is added: calls that queue up while
+    a batch is being embedded go out together in the next one.
+
+    embed_batch() calls with max_batch_size texts or more bypass the queue.
+    aembed()/aembed_batch() are the asyncio front ends; they await the same
+    queue without blocking the event loop.
+
+    A caller whose batch has not finished after timeout_sec seconds, or whose
+    dispatcher thread has died, embeds its texts itself instead of hanging.
+    """
+
+    def __init__(self, vectorizer: BaseVectorizer, max_batch_size: int = 64, max_wait_ms: float = 0.0,
+                 timeout_sec: float = 60.0):
+        self.vectorizer = vectorizer
+        self.model_name = getattr(vectorizer, "model_name", "") or type(vectorizer).__name__
+        self.fork_safe = vectorizer.fork_safe
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_sec = max(0.0, max_wait_ms) / 1000.0
+        self.timeout_sec = timeout_sec
+
+        # Number of embed_batch() calls made on the wrapped vectorizer
+        self.batches = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.SimpleQueue[_Request]" = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self.vectorizer.wait_until_ready(timeout)
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        if len(texts) >= self.max_batch_size:
+            return self._embed_direct(texts)
+        return self._wait_for(texts, as_numpy=False)
+
+    def embed_batch_numpy(self, texts: List[str]):
+        if not texts or len(texts) >= self.max_batch_size:
+            return self._embed_direct(texts, as_numpy=True)
+        return self._wait_for(texts, as_numpy=True)
+
+    def _wait_for(self, texts: List[str], as_numpy: bool):
+        done = threading.Event()
+        request = _Request(list(texts), lambda _: done.set(), as_numpy=as_numpy)
+        self._submit(request)
+        if not self._wait_done(done):
+            return self._embed_direct(texts, as_numpy=as_numpy)
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    async def aembed(self, text: str) -> List[float]:
+        return (await self.aembed_batch([text]))[0]
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        if len(texts) >= self.max_batch_size:
+            return await loop.run_in_executor(None, self._embed_direct, list(texts))
+
+        future = loop.create_future()
+
+        def resolve(request: _Request):
+            if future.done():
+                return
+            if request.error is not None:
+                future.set_exception(request.error)
+            else:
+                future.set_result(request.result)
+
+        def on_done(request: _Request):
+            try:
+                loop.call_soon_threadsafe(resolve, request)
+            except RuntimeError:
+                # The event loop was closed while the call was queued
+                pass
+
+        self._submit(_Request(list(texts), on_done))
+        timeout = self.timeout_sec if self.timeout_sec and self.timeout_sec > 0 else None
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Batched embedding did not finish within %.1fs, embedding without the dispatcher",
+                self.timeout_sec
+            )
+            return await loop.run_in_executor(None, self._embed_direct, list(texts))
+
+    def _embed_direct(self, texts: List[str], as_numpy: bool = False):
+        with self._lock:
+            self.batches += 1
+        if as_numpy:
+            return self.vectorizer.embed_batch_numpy(texts)
+        return self.vectorizer.embed_batch(texts)
+
+    def _wait_done(self, done: threading.Event) -> bool:
+        """
+        Waits for a queued request. Returns False if the dispatcher thread
+        died or the request took longer than timeout_sec.
+        """
+        deadline = time.monotonic() + self.timeout_sec if self.timeout_sec and self.timeout_sec > 0 else None
+        while True:
+            wait = _LIVENESS_CHECK_SEC
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+            if wait > 0 and done.wait(wait):
+                return True
+            worker = self._worker
+            if worker is None or not worker.is_alive():
+                logger.error("Embedding dispatcher thread is gone, embedding without it")
+                with self._lock:
+                    # The next call starts a new dispatcher
+                    if self._worker is worker:
+                        self._pid = None
+                return done.is_set()
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(
+                    "Batched embedding did not finish within %.1fs, embedding without the dispatcher",
+                    self.timeout_sec
+                )
+                return done.is_set()
+
+    def _submit(self, request: _Request):
+        if self._pid != os.getpid():
+            self._start_worker()
+        self._queue.put(request)
+
+    def _start_worker(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # After fork() the parent's worker thread is gone; start a fresh queue too
+            self._queue = queue.SimpleQueue()
+            self._worker = threading.Thread(
+                target=self._run, args=(self._queue,), name="vectorwave-embed-batcher", daemon=True
+            )
+            self._worker.start()
+            self._pid = os.getpid()
+
+    def _run(self, pending: "queue.SimpleQueue[_Request]"):
+        carry: Optional[_Request] = None
+        while True:
+            first = carry if carry is not None else pending.get()
+            carry = None
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self.max_wait_sec
+
+            while size < self.max_batch_size:
+                try:
+                    request = pending.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        request = pending.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if size + len(request.texts) > self.max_batch_size:
+                    carry = request
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_Request]):
+        texts = [text for request in batch for text in request.texts]
+        # One array call serves list callers too (rows converted below)
+        as_numpy = any(request.as_numpy for request in batch)
+        try:
+            vectors = self._embed_direct(texts, as_numpy=as_numpy)
+            if len(vectors) != len(texts):
+                raise ValueError(f"expected {len(texts)} vectors, got {len(vectors)}")
+        except Exception as e:
+            logger.debug("Batched embedding of %d texts failed: %s", len(texts), e)
+            for request in batch:
+                request.finish(error=e)
+            return
+
+        start = 0
+        for request in batch:
+            end = start + len(request.texts)
+            rows = vectors[start:end]
+            request.finish(result=rows.tolist() if as_numpy and not request.as_numpy else rows)
+            start = end
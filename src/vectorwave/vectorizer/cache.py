@@ -0,0 +1,233 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .base import BaseVectorizer
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _as_float32(vector) -> array:
+    if hasattr(vector, "dtype"):
+        # numpy row: copy the raw float32 buffer instead of element by element
+        packed = array("f")
+        packed.frombytes(vector.astype("float32", copy=False).tobytes())
+        return packed
+    return array("f", vector)
+
+
+class SqliteEmbeddingStore:
+    """
+    On-disk embedding store: one SQLite table keyed by (model, sha256(text)),
+    vectors stored as float32 blobs. Holds at most max_entries rows; the
+    least recently used rows are evicted past that.
+
+    Connections are opened per process, so the store can be shared by
+    forked workers and several processes on one host.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes_since_evict = 0
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, array]:
+        if not keys:
+            return {}
+        found: Dict[str, array] = {}
+        with self._lock:
+            conn = self._connection()
+            # SQLite caps the number of bound parameters per statement
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start:start + 500])
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[text_hash] = vector
+            if found:
+                conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash IN "
+                    f"({','.join('?' * len(found))})",
+                    [time.time(), model, *found.keys()]
+                )
+                conn.commit()
+        return found
+
+    def put_many(self, model: str, items: Dict[str, array]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(model, key, vector.tobytes(), now) for key, vector in items.items()]
+            )
+            self._writes_since_evict += len(items)
+            # Counting rows on every write would be wasteful; evict in steps
+            if self._writes_since_evict >= max(1, self.max_entries // 100):
+                self._evict_locked(conn)
+                self._writes_since_evict = 0
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def _evict_locked(self, conn: sqlite3.Connection):
+        count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+            logger.debug("Evicted %d embeddings from '%s'", excess, self.path)
+
+
+class CachingVectorizer(BaseVectorizer):
+    """
+    Wraps any BaseVectorizer with an in-memory LRU of up to max_entries
+    vectors and an optional SqliteEmbeddingStore behind it. Entries are keyed
+    by the wrapped vectorizer's model_name and the text, so switching models
+    never returns stale vectors. Vectors are held as float32 arrays.
+    """
+
+    def __init__(self, vectorizer: BaseVectorizer, max_entries: int = 4096,
+                 store: Optional[SqliteEmbeddingStore] = None):
+        self.vectorizer = vectorizer
+        self.model_name = getattr(vectorizer, "model_name", "") or type(vectorizer).__name__
+        self.fork_safe = vectorizer.fork_safe
+        self.max_entries = max(1, max_entries)
+        self.store = store
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self.vectorizer.wait_until_ready(timeout)
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        found, missing = self._lookup(texts)
+        if missing:
+            self._store(found, missing, self.vectorizer.embed_batch(missing))
+        return self._finish(texts, found, missing)
+
+    def embed_batch_numpy(self, texts: List[str]):
+        import numpy as np
+
+        found, missing = self._lookup(texts)
+        if missing:
+            self._store(found, missing, self.vectorizer.embed_batch_numpy(missing))
+        self._count(texts, missing)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        out = np.empty((len(texts), len(found[texts[0]])), dtype=np.float32)
+        for row, text in enumerate(texts):
+            out[row] = np.frombuffer(found[text], dtype=np.float32)
+        return out
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        found, missing = self._lookup(texts)
+        if missing:
+            self._store(found, missing, await self.vectorizer.aembed_batch(missing))
+        return self._finish(texts, found, missing)
+
+    def _lookup(self, texts: List[str]) -> Tuple[Dict[str, array], List[str]]:
+        found: Dict[str, array] = {}
+        with self._lock:
+            for text in texts:
+                vector = self._memory.get(text)
+                if vector is not None:
+                    self._memory.move_to_end(text)
+                    found[text] = vector
+
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+        if missing and self.store is not None:
+            keys = {_text_key(text): text for text in missing}
+            try:
+                stored = self.store.get_many(self.model_name, list(keys))
+            except sqlite3.Error as e:
+                logger.warning("Embedding cache lookup failed: %s", e)
+                stored = {}
+            for key, vector in stored.items():
+                found[keys[key]] = vector
+            self._remember({keys[key]: vector for key, vector in stored.items()})
+            missing = [text for text in missing if text not in found]
+        return found, missing
+
+    def _store(self, found: Dict[str, array], missing: List[str], vectors):
+        computed = {text: _as_float32(vector) for text, vector in zip(missing, vectors)}
+        found.update(computed)
+        self._remember(computed)
+        if self.store is not None:
+            try:
+                self.store.put_many(self.model_name, {_text_key(t): v for t, v in computed.items()})
+            except sqlite3.Error as e:
+                logger.warning("Embedding cache write failed: %s", e)
+
+    def _finish(self, texts: List[str], found: Dict[str, array], missing: List[str]) -> List[List[float]]:
+        self._count(texts, missing)
+        return [found[text].tolist() for text in texts]
+
+    def _count(self, texts: List[str], missing: List[str]):
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+
+    def _remember(self, vectors: Dict[str, array]):
+        if not vectors:
+            return
+        with self._lock:
+            for text, vector in vectors.items():
+                self._memory[text] = vector
+                self._memory.move_to_end(text)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
@@ -1,49 +1,160 @@
 # [NEW] File: src/vectorwave/vectorizer/factory.py
-from functools import lru_cache
+import logging
+import os
+from functools import lru_cache, partial
 from typing import Optional
 
 from ..models.db_config import get_weaviate_settings, WeaviateSettings
 from .base import BaseVectorizer
-from .huggingface_vectorizer import HuggingFaceVectorizer
-from .openai_vectorizer import OpenAIVectorizer
+from .batching import MicroBatchingVectorizer
+from .cache import CachingVectorizer, SqliteEmbeddingStore
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
 
 @lru_cache()
 def get_vectorizer() -> Optional[BaseVectorizer]:
     """
     Reads the configuration file (.env) and returns an appropriate Python Vectorizer instance.
     - "weaviate_module" or "none": Returns None as Weaviate handles processing.
-    - "huggingface", "openai_client": Returns the actual instance as Python handles processing.
+    - "huggingface", "openai_client", "embedding_server": Returns the actual instance as Python handles processing,
+      behind a MicroBatchingVectorizer (unless EMBED_BATCH_MAX_SIZE <= 1) and a
+      CachingVectorizer (unless EMBEDDING_CACHE_SIZE is 0), so cache hits never wait
+      for a batch.
+    """
+    settings: WeaviateSettings = get_weaviate_settings()
+    vectorizer = _create_vectorizer(settings)
+    if vectorizer is not None and settings.EMBED_BATCH_MAX_SIZE > 1:
+        vectorizer = MicroBatchingVectorizer(
+            vectorizer,
+            max_batch_size=settings.EMBED_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBED_BATCH_MAX_WAIT_MS,
+            timeout_sec=settings.EMBED_BATCH_TIMEOUT_SEC
+        )
+    if vectorizer is None or settings.EMBEDDING_CACHE_SIZE <= 0:
+        return vectorizer
+
+    store = None
+    if settings.EMBEDDING_CACHE_DB_PATH:
+        store = SqliteEmbeddingStore(settings.EMBEDDING_CACHE_DB_PATH, settings.EMBEDDING_CACHE_DB_MAX_ENTRIES)
+    return CachingVectorizer(vectorizer, max_entries=settings.EMBEDDING_CACHE_SIZE, store=store)
+
+
+def warm_up_vectorizer(wait: bool = False, timeout: Optional[float] = None) -> Optional[BaseVectorizer]:
+    """
+    Creates the configured vectorizer now instead of on the first decorated
+    or search call. A HuggingFace model loads in the background only with
+    HF_BACKGROUND_LOAD=true; otherwise this loads it. With wait=True, blocks until the model is ready (at most timeout
+    seconds).
+    """
+    vectorizer = get_vectorizer()
+    if vectorizer is not None and wait and not vectorizer.wait_until_ready(timeout):
+        logger.warning("Vectorizer '%s' is not ready after %ss", vectorizer.model_name, timeout)
+    return vectorizer
+
+
+def create_encode_pool(workers: Optional[int] = None, chunk_size: Optional[int] = None):
+    """
+    Returns a ProcessPoolVectorizer running the configured HuggingFace model
+    in workers processes (default HF_POOL_WORKERS), or None when fewer than
+    two workers are requested or the vectorizer is not a local model. The
+    caller owns the pool and must close() it.
     """
     settings: WeaviateSettings = get_weaviate_settings()
+    workers = settings.HF_POOL_WORKERS if workers is None else workers
+    if workers < 2 or settings.VECTORIZER.lower() != "huggingface":
+        return None
+
+    from .huggingface_vectorizer import HuggingFaceVectorizer
+    from .process_pool import ProcessPoolVectorizer
+    return ProcessPoolVectorizer(
+        partial(
+            HuggingFaceVectorizer, settings.HF_MODEL_NAME, background=False,
+            backend=settings.HF_BACKEND, onnx_file_name=settings.HF_ONNX_FILE_NAME
+        ),
+        workers=workers,
+        chunk_size=chunk_size or settings.HF_POOL_CHUNK_SIZE,
+        model_name=settings.HF_MODEL_NAME
+    )
+
+
+def _create_vectorizer(settings: WeaviateSettings) -> Optional[BaseVectorizer]:
     vectorizer_name = settings.VECTORIZER.lower()
 
-    print(f"[VectorWave] Initializing vectorizer based on setting: '{vectorizer_name}'")
+    logger.info("Initializing vectorizer based on setting: '%s'", vectorizer_name)
 
+    # Backends are imported only when selected; their libraries are heavy
     if vectorizer_name == "huggingface":
         try:
-            return HuggingFaceVectorizer(model_name=settings.HF_MODEL_NAME)
+            from .huggingface_vectorizer import HuggingFaceVectorizer
+            return HuggingFaceVectorizer(
+                model_name=settings.HF_MODEL_NAME,
+                background=settings.HF_BACKGROUND_LOAD,
+                backend=settings.HF_BACKEND,
+                onnx_file_name=settings.HF_ONNX_FILE_NAME
+            )
         except Exception as e:
-            print(f"Error: Failed to initialize HuggingFaceVectorizer: {e}")
+            logger.error("Failed to initialize HuggingFaceVectorizer: %s", e)
             return None
 
     elif vectorizer_name == "openai_client":
         if not settings.OPENAI_API_KEY:
-            print("Warning: VECTORIZER='openai_client' but OPENAI_API_KEY is not set. Vectorizer disabled.")
+            logger.warning("VECTORIZER='openai_client' but OPENAI_API_KEY is not set. Vectorizer disabled.")
             return None
         try:
-            return OpenAIVectorizer(api_key=settings.OPENAI_API_KEY)
+            from .openai_vectorizer import OpenAIVectorizer
+            return OpenAIVectorizer(
+                api_key=settings.OPENAI_API_KEY,
+                model=settings.OPENAI_EMBEDDING_MODEL,
+                base_url=settings.OPENAI_BASE_URL,
+                max_batch_size=settings.OPENAI_MAX_BATCH_SIZE,
+                max_batch_tokens=settings.OPENAI_MAX_BATCH_TOKENS,
+                max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+                max_retries=settings.OPENAI_MAX_RETRIES
+            )
         except Exception as e:
-            print(f"Error: Failed to initialize OpenAIVectorizer: {e}")
+            logger.error("Failed to initialize OpenAIVectorizer: %s", e)
             return None
 
+    elif vectorizer_name == "embedding_server":
+        if not settings.EMBEDDING_SERVER_SOCKET_PATH:
+            logger.warning(
+                "VECTORIZER='embedding_server' but EMBEDDING_SERVER_SOCKET_PATH is not set. Vectorizer disabled."
+            )
+            return None
+        from .remote_vectorizer import RemoteVectorizer
+        # The server runs the HuggingFace model; its name keys the embedding cache
+        return RemoteVectorizer(
+            settings.EMBEDDING_SERVER_SOCKET_PATH,
+            timeout=settings.EMBEDDING_SERVER_TIMEOUT_SEC,
+            model_name=settings.HF_MODEL_NAME
+        )
+
     elif vectorizer_name == "weaviate_module":
-        print("[VectorWave] Using Weaviate's internal module for vectorization.")
+        logger.info("Using Weaviate's internal module for vectorization.")
         return None
 
     elif vectorizer_name == "none":
-        print("[VectorWave] Vectorization is disabled ('none').")
+        logger.info("Vectorization is disabled ('none').")
         return None
 
     else:
-        print(f"Warning: Unknown VECTORIZER setting: '{vectorizer_name}'. Disabling vectorizer.")
-        return None
\ No newline at end of file
+        logger.warning("Unknown VECTORIZER setting: '%s'. Disabling vectorizer.", vectorizer_name)
+        return None
+
+
+def _reset_after_fork():
+    """
+    Runs in the child right after fork(). Vectorizers holding connections are
+    rebuilt lazily; fork-safe ones (e.g. a loaded local model) are kept so the
+    child shares the parent's memory instead of loading the model again.
+    """
+    if get_vectorizer.cache_info().currsize == 0:
+        return
+    vectorizer = get_vectorizer()
+    if vectorizer is not None and not vectorizer.fork_safe:
+        get_vectorizer.cache_clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
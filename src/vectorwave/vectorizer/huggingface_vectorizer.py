@@ -1,27 +1,116 @@
-from .base import BaseVectorizer
-from typing import List
+import importlib.util
+import logging
 import os
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from .base import BaseVectorizer
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+BACKENDS = ("torch", "torch_int8", "onnx")
 
-try:
-    from sentence_transformers import SentenceTransformer
-except ImportError:
-    # Warning: The 'sentence-transformers' library is not installed.
-    print("Warning: The 'sentence-transformers' library is not installed.")
-    # To use HuggingFaceVectorizer, run 'pip install sentence-transformers'.
-    print("To use HuggingFaceVectorizer, run 'pip install sentence-transformers'.")
-    SentenceTransformer = None
 
 class HuggingFaceVectorizer(BaseVectorizer):
-    """[NEW] HuggingFace SentenceTransformer (Python Client) implementation"""
+    """
+    [NEW] HuggingFace SentenceTransformer (Python Client) implementation
+
+    backend selects the CPU runtime: "torch" (fp32), "torch_int8" (torch
+    dynamic quantization of the Linear layers) or "onnx" (ONNX Runtime via
+    sentence-transformers; onnx_file_name picks a pre-quantized export such
+    as "onnx/model_qint8_avx2.onnx").
+
+    With background=True the library import, the model load and one warm-up
+    encode run in a daemon thread, and the constructor returns at once. Calls
+    that need the model before it is ready block until it is (see
+    wait_until_ready). load_time holds the seconds the load took.
+    """
+
+    def __init__(self, model_name: str, background: bool = False, backend: str = "torch",
+                 onnx_file_name: Optional[str] = None):
+        backend = backend.lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown HuggingFace backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        # Fail fast here rather than in the loader thread
+        if "sentence_transformers" not in sys.modules and importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError(
+                "Could not find the 'sentence-transformers' library. "
+                "To use HuggingFaceVectorizer, run 'pip install sentence-transformers'."
+            )
 
-    def __init__(self, model_name: str):
-        if SentenceTransformer is None:
-            # Could not find the 'sentence-transformers' library.
-            raise ImportError("Could not find the 'sentence-transformers' library.")
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_file_name = onnx_file_name
+        self.load_time: Optional[float] = None
+        self._model = None
+        self._load_error: Optional[BaseException] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._loader_pid = os.getpid()
+
+        if background:
+            threading.Thread(target=self._load, name="vectorwave-model-loader", daemon=True).start()
+        else:
+            self._load()
+            if self._load_error is not None:
+                raise self._load_error
+
+    @property
+    def model(self):
+        self.wait_until_ready()
+        if self._load_error is not None:
+            raise RuntimeError(f"Model '{self.model_name}' failed to load: {self._load_error}") from self._load_error
+        return self._model
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        if not self._ready.is_set() and self._loader_pid != os.getpid():
+            # Forked while the parent was still loading: the loader thread is gone
+            self._loader_pid = os.getpid()
+            self._ready = threading.Event()
+            self._lock = threading.Lock()
+            self._load()
+        return self._ready.wait(timeout)
+
+    def _load(self):
+        with self._lock:
+            if self._ready.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                model = self._build_model()
+                # The first encode initializes kernels and tokenizer caches
+                model.encode(["warm-up"], convert_to_numpy=True)
+                self._model = model
+                self.load_time = time.perf_counter() - start
+                logger.info(
+                    "HuggingFaceVectorizer loaded model '%s' (%s) on CPU in %.2fs",
+                    self.model_name, self.backend, self.load_time
+                )
+            except Exception as e:
+                self._load_error = e
+                logger.error("HuggingFaceVectorizer failed to load model '%s': %s", self.model_name, e)
+            finally:
+                self._ready.set()
+
+    def _build_model(self):
+        # Imported here: sentence-transformers pulls in torch, which takes seconds to load
+        from sentence_transformers import SentenceTransformer
+
+        if self.backend == "onnx":
+            # Exports the model to ONNX on first use unless the repo ships one
+            model_kwargs = {"file_name": self.onnx_file_name} if self.onnx_file_name else None
+            return SentenceTransformer(self.model_name, device='cpu', backend="onnx", model_kwargs=model_kwargs)
 
         # Force use of CPU (can be changed to 'cuda', etc., if needed)
-        self.model = SentenceTransformer(model_name, device='cpu')
-        print(f"[VectorWave] HuggingFaceVectorizer loaded model '{model_name}' on CPU.")
+        model = SentenceTransformer(self.model_name, device='cpu')
+        if self.backend == "torch_int8":
+            import torch
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
 
     def embed(self, text: str) -> List[float]:
         # convert_to_numpy=True is faster on CPU
@@ -30,4 +119,9 @@ class HuggingFaceVectorizer(BaseVectorizer):
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         vectors = self.model.encode(texts, convert_to_numpy=True)
-        return vectors.tolist()
\ No newline at end of file
+        return vectors.tolist()
+
+    def embed_batch_numpy(self, texts: List[str]):
+        # encode() already returns a 2-D numpy array; ONNX/int8 backends may not use float32
+        vectors = self.model.encode(texts, convert_to_numpy=True)
+        return vectors.astype("float32", copy=False)
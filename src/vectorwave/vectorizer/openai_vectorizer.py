@@ -1,35 +1,138 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from ..utils.backoff import backoff_delay
 from .base import BaseVectorizer
-from typing import List
 
-try:
-    from openai import OpenAI
-except ImportError:
-    # Warning: The 'openai' library is not installed.
-    print("Warning: The 'openai' library is not installed.")
-    # To use OpenAIVectorizer, run 'pip install openai'.
-    print("To use OpenAIVectorizer, run 'pip install openai'.")
-    OpenAI = None
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    # Conservative without a tokenizer: English BPE averages ~4 bytes per token
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def chunk_texts(texts: List[str], max_inputs: int, max_tokens: int) -> List[List[str]]:
+    """
+    Splits texts, in order, into chunks of at most max_inputs texts and about
+    max_tokens estimated tokens. A single text over the budget gets its own chunk.
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 class OpenAIVectorizer(BaseVectorizer):
+    """
+    OpenAI embeddings client. embed_batch() splits the input into requests of
+    at most max_batch_size texts and max_batch_tokens estimated tokens, sends
+    up to max_concurrency of them at once and returns the vectors in input
+    order. Rate-limit (429), server (5xx) and connection errors are retried
+    up to max_retries times with jittered exponential backoff, honoring
+    Retry-After when the API sends it.
+    """
 
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
-        if OpenAI is None:
-            # Could not find the 'openai' library.
-            raise ImportError("Could not find the 'openai' library.")
+    # The underlying httpx connection pool must not be shared with a forked child
+    fork_safe = False
+
+    def __init__(self, api_key: str, model: str = "text-embedding-3-small", base_url: Optional[str] = None,
+                 max_batch_size: int = 2048, max_batch_tokens: int = 300000, max_concurrency: int = 4,
+                 max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 timeout: float = 60.0):
+        # Imported here so 'import vectorwave' does not load the openai SDK
+        try:
+            import openai
+        except ImportError as e:
+            raise ImportError(
+                "Could not find the 'openai' library. To use OpenAIVectorizer, run 'pip install openai'."
+            ) from e
         if not api_key:
             raise ValueError("OpenAI API key is required for OpenAIVectorizer.")
 
-        self.client = OpenAI(api_key=api_key)
+        # Retries are done here, so the SDK's own retry loop is turned off
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
         self.model = model
-        print(f"[VectorWave] OpenAIVectorizer initialized with model '{self.model}'.")
+        self.model_name = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._retryable = (
+            openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError, openai.APITimeoutError
+        )
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        logger.info("OpenAIVectorizer initialized with model '%s'", self.model)
 
     def embed(self, text: str) -> List[float]:
-        text = text.replace("\n", " ")
-        response = self.client.embeddings.create(input=[text], model=self.model)
-        return response.data[0].embedding
+        return self.embed_batch([text])[0]
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
         texts = [t.replace("\n", " ") for t in texts]
-        response = self.client.embeddings.create(input=texts, model=self.model)
-        return [d.embedding for d in response.data]
\ No newline at end of file
+        chunks = chunk_texts(texts, self.max_batch_size, self.max_batch_tokens)
+        if len(chunks) == 1:
+            return self._embed_chunk(chunks[0])
+        results = self._pool().map(self._embed_chunk, chunks)
+        return [vector for chunk_vectors in results for vector in chunk_vectors]
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _embed_chunk(self, texts: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            try:
+                response = self.client.embeddings.create(input=texts, model=self.model)
+                # The API returns items with their input index; do not rely on list order
+                data = sorted(response.data, key=lambda d: d.index)
+                if len(data) != len(texts):
+                    raise ValueError(f"expected {len(texts)} embeddings, got {len(data)}")
+                return [d.embedding for d in data]
+            except self._retryable as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = max(self._retry_after(e), backoff_delay(attempt, self.backoff_base, self.backoff_max))
+                logger.warning(
+                    "OpenAI embeddings request failed (%s), retry %d/%d in %.2fs",
+                    type(e).__name__, attempt + 1, self.max_retries, delay
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    def _retry_after(self, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        if response is None:
+            return 0.0
+        try:
+            return min(float(response.headers.get("retry-after", 0)), self.backoff_max)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="vectorwave-openai"
+                )
+            return self._executor
@@ -0,0 +1,120 @@
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from .base import BaseVectorizer
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+# Set in each pool process by _init_worker
+_worker_vectorizer: Optional[BaseVectorizer] = None
+
+
+def _init_worker(vectorizer_factory: Callable[[], BaseVectorizer], threads: int):
+    global _worker_vectorizer
+    if threads > 0:
+        # Each process gets its share of the cores; must be set before torch is imported
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ[var] = str(threads)
+    _worker_vectorizer = vectorizer_factory()
+    torch = sys.modules.get("torch")
+    if threads > 0 and torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _encode_chunk(texts: List[str]) -> List[List[float]]:
+    return [list(vector) for vector in _worker_vectorizer.embed_batch(texts)]
+
+
+def _encode_chunk_numpy(texts: List[str]):
+    # An ndarray pickles as one buffer instead of a float object per element
+    return _worker_vectorizer.embed_batch_numpy(texts)
+
+
+class ProcessPoolVectorizer(BaseVectorizer):
+    """
+    Spreads large embed_batch() calls over worker processes, in the style of
+    sentence-transformers' multi-process pool: every worker builds its own
+    model with vectorizer_factory (a picklable callable), batches are split
+    into chunks of chunk_size texts, and the vectors come back in order.
+
+    Each worker is limited to threads_per_worker intra-op threads (default:
+    the CPU count divided by workers) so the processes do not fight over
+    cores. Workers are started with 'spawn' on first use; use the pool as a
+    context manager or call close() to stop them.
+
+    Meant for bulk jobs such as 'vectorwave register --workers N', not for
+    serving processes.
+    """
+
+    # Worker processes cannot be shared with a forked child
+    fork_safe = False
+
+    def __init__(self, vectorizer_factory: Callable[[], BaseVectorizer], workers: Optional[int] = None,
+                 chunk_size: int = 256, threads_per_worker: Optional[int] = None,
+                 start_method: str = "spawn", model_name: str = ""):
+        self.vectorizer_factory = vectorizer_factory
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers)
+        self.threads_per_worker = threads_per_worker
+        self.start_method = start_method
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        logger.debug("Encoding %d texts in %d chunks on %d processes", len(texts), len(chunks), self.workers)
+        vectors = [vector for chunk in self._pool().map(_encode_chunk, chunks) for vector in chunk]
+        if len(vectors) != len(texts):
+            raise ValueError(f"expected {len(texts)} vectors, got {len(vectors)}")
+        return vectors
+
+    def embed_batch_numpy(self, texts: List[str]):
+        import numpy as np
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        vectors = np.vstack(list(self._pool().map(_encode_chunk_numpy, chunks)))
+        if len(vectors) != len(texts):
+            raise ValueError(f"expected {len(texts)} vectors, got {len(vectors)}")
+        return vectors
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ProcessPoolVectorizer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(self.vectorizer_factory, self.threads_per_worker)
+                )
+                logger.info(
+                    "Started encode pool: %d processes x %d threads", self.workers, self.threads_per_worker
+                )
+            return self._executor
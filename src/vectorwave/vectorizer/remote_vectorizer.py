@@ -0,0 +1,138 @@
+import base64
+import logging
+import os
+import socket
+import threading
+from array import array
+from typing import List
+
+from ..ipc.framing import send_frame, recv_frame
+from .base import BaseVectorizer
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+def encode_vectors(vectors) -> dict:
+    """
+    Packs vectors (a list of lists or a 2-D numpy array) as one base64
+    float32 blob; far smaller than JSON floats.
+    """
+    if hasattr(vectors, "dtype"):
+        # 2-D numpy array: its buffer is the wire format already
+        count, dim = vectors.shape if vectors.ndim == 2 else (0, 0)
+        data = vectors.astype("float32", copy=False).tobytes()
+        return {"dim": dim, "count": count, "data": base64.b64encode(data).decode("ascii")}
+
+    dim = len(vectors[0]) if vectors else 0
+    flat = array("f")
+    for vector in vectors:
+        if len(vector) != dim:
+            raise ValueError("All vectors in a batch must have the same dimension")
+        flat.extend(vector)
+    return {"dim": dim, "count": len(vectors), "data": base64.b64encode(flat.tobytes()).decode("ascii")}
+
+
+def decode_vectors(message: dict) -> List[List[float]]:
+    flat = array("f")
+    flat.frombytes(base64.b64decode(message["data"]))
+    dim, count = message["dim"], message["count"]
+    if len(flat) != dim * count:
+        raise ValueError(f"expected {count} vectors of {dim} floats, got {len(flat)} floats")
+    return [flat[i * dim:(i + 1) * dim].tolist() for i in range(count)]
+
+
+def decode_vectors_numpy(message: dict):
+    import numpy as np
+
+    # bytearray keeps the array writable without another copy
+    flat = np.frombuffer(bytearray(base64.b64decode(message["data"])), dtype=np.float32)
+    dim, count = message["dim"], message["count"]
+    if flat.size != dim * count:
+        raise ValueError(f"expected {count} vectors of {dim} floats, got {flat.size} floats")
+    return flat.reshape(count, dim)
+
+
+class RemoteVectorizer(BaseVectorizer):
+    """
+    Client of a local embedding server ('vectorwave embedding-server').
+    Selected with VECTORIZER=embedding_server: worker processes send their
+    texts over a Unix domain socket instead of each loading the model.
+
+    Each thread keeps its own connection, so concurrent calls are not
+    serialized here; the server batches them across all clients.
+    """
+
+    # Sockets must not be shared with a forked child
+    fork_safe = False
+
+    def __init__(self, socket_path: str, timeout: float = 30.0, model_name: str = ""):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.model_name = model_name
+        self._local = threading.local()
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return decode_vectors(self._embed_message(texts))
+
+    def embed_batch_numpy(self, texts: List[str]):
+        if not texts:
+            return super().embed_batch_numpy(texts)
+        return decode_vectors_numpy(self._embed_message(texts))
+
+    def _embed_message(self, texts: List[str]) -> dict:
+        try:
+            response = self._request(texts)
+        except (OSError, ValueError):
+            # The server may have restarted since this connection was opened; retry once
+            self.close()
+            try:
+                response = self._request(texts)
+            except (OSError, ValueError) as e:
+                self.close()
+                raise ConnectionError(f"Embedding server at '{self.socket_path}' is unavailable: {e}") from e
+
+        if response.get("error"):
+            raise RuntimeError(f"Embedding server failed: {response['error']}")
+        if response.get("count") != len(texts):
+            raise ValueError(f"expected {len(texts)} vectors, got {response.get('count')}")
+        return response
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _request(self, texts: List[str]) -> dict:
+        sock = self._connection()
+        send_frame(sock, {"texts": texts})
+        response = recv_frame(sock)
+        if response is None:
+            raise ConnectionError("Embedding server closed the connection")
+        return response
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None and getattr(self._local, "pid", None) == os.getpid():
+            return sock
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._local.sock = sock
+        self._local.pid = os.getpid()
+        logger.debug("Connected to embedding server at '%s'", self.socket_path)
+        return sock
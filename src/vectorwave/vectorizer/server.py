@@ -0,0 +1,140 @@
+import logging
+import os
+import socket
+import socketserver
+import threading
+from typing import Optional
+
+from ..ipc.framing import send_frame, recv_frame
+from .base import BaseVectorizer, numpy_available
+from .remote_vectorizer import encode_vectors
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
+
+
+class _EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+
+    def setup(self):
+        with self.server.connections_lock:
+            self.server.connections.add(self.request)
+
+    def finish(self):
+        with self.server.connections_lock:
+            self.server.connections.discard(self.request)
+
+    def handle(self):
+        vectorizer = self.server.vectorizer
+        while True:
+            try:
+                message = recv_frame(self.request)
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping embedding client connection: %s", e)
+                return
+            if message is None:
+                return
+
+            try:
+                texts = message["texts"]
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("'texts' must be a list of strings")
+                if not texts:
+                    response = encode_vectors([])
+                elif numpy_available():
+                    # The model's float32 array goes on the wire as is
+                    response = encode_vectors(vectorizer.embed_batch_numpy(texts))
+                else:
+                    response = encode_vectors(vectorizer.embed_batch(texts))
+            except Exception as e:
+                logger.error("Embedding server failed to embed %s texts: %s", len(message.get("texts") or []), e)
+                response = {"error": str(e)}
+
+            try:
+                send_frame(self.request, response)
+            except OSError:
+                return
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Every worker thread holds its own connection; the default backlog of 5 refuses bursts
+    request_queue_size = 128
+
+
+class EmbeddingServer:
+    """
+    Per-host embedding server. One process owns the model; worker processes
+    (VECTORIZER=embedding_server) send embed_batch requests over a Unix
+    domain socket, so the host holds a single copy of the model in RAM.
+
+    vectorizer is normally get_vectorizer() for VECTORIZER=huggingface: its
+    MicroBatchingVectorizer makes concurrent clients share batched forward
+    passes, and its embedding cache is shared by all of them.
+    """
+
+    def __init__(self, socket_path: str, vectorizer: BaseVectorizer):
+        self.socket_path = socket_path
+        self.vectorizer = vectorizer
+        self._server: Optional[_ThreadingUnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "EmbeddingServer":
+        """Binds the socket and serves in a background thread."""
+        self._bind()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="vectorwave-embedding-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Binds the socket and serves on the calling thread until shutdown()."""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._cleanup()
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._cleanup()
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # Stale socket file left by a server that didn't exit cleanly
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"An embedding server is already listening on '{self.socket_path}'")
+            finally:
+                probe.close()
+
+        self._server = _ThreadingUnixServer(self.socket_path, _EmbeddingRequestHandler)
+        self._server.vectorizer = self.vectorizer
+        self._server.connections = set()
+        self._server.connections_lock = threading.Lock()
+        logger.info("VectorWave embedding server listening on '%s'", self.socket_path)
+
+    def _cleanup(self):
+        if self._server is not None:
+            # Handler threads would otherwise keep serving their open connections
+            with self._server.connections_lock:
+                connections = list(self._server.connections)
+            for connection in connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self._server.server_close()
+            self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass